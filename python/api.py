@@ -1,14 +1,31 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, StreamingResponse
 from creacionproyecto import convert_simple_config, ProjectService
-from style_generator import generate_css_variables, save_css_file
 import uvicorn
 from pydantic import BaseModel
+from typing import List, Optional
 from fastapi.middleware.cors import CORSMiddleware
 import os
 import json
-from login_generator import LoginGenerator
-from component_handler import ComponentHandler
-from page_handler import PageHandler
+import asyncio
+import logging
+from command_runner import cancel_on_disconnect
+from job_queue import JobQueue, QueueFull, TERMINAL_STATUSES, sse_format
+import project_paths
+from project_index import ProjectIndex
+from project_archive import ARCHIVE_FORMATS, ArchiveCache, ArchiveError, check_format, collect_files, content_disposition, fingerprint, stream_archive
+import generation_tasks
+from worker_pool import WorkerPool, PoolSaturated
+from io_executor import io_executor
+from request_coalescer import IdempotencyMismatch, RequestCoalescer
+import metrics
+import profiling
+from output_backend import ArchiveOutput, PreviewStore
+from pipeline import Pipeline, PipelineError
+from render_cache import config_key
+import time
+
+logging.basicConfig(level=logging.INFO)
 
 app = FastAPI(title="Project Generator API")
 
@@ -21,34 +38,491 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+profile_store = profiling.ProfileStore()
+
+class ProfileMiddleware:
+    """Profile one request with cProfile and tracemalloc when asked to by an admin.
+
+    A plain ASGI middleware, so requests that do not ask for a profile pass
+    straight through (SSE streams and archive downloads included). cProfile
+    records the whole event-loop thread: the profile also holds the loop time
+    of requests served meanwhile, and the report says how many started.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.session = None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        if self.session is not None:
+            self.session.overlapping += 1
+        request = Request(scope)
+        if not profiling.requested(request.headers, request.query_params):
+            return await self.app(scope, receive, send)
+        if not profiling.authorized(request.headers.get("x-admin-token")):
+            response = JSONResponse(status_code=403, content={"detail": "Profiling needs a valid X-Admin-Token"})
+            return await response(scope, receive, send)
+
+        async with profiling.exclusive():
+            session = profiling.ProfileSession(f"{request.method} {request.url.path}")
+            held = []
+
+            async def send_profiled(message):
+                if message["type"] == "http.response.start":
+                    message = {**message, "headers": [*message.get("headers", []), (b"x-profile-id", session.id.encode())]}
+                elif message["type"] == "http.response.body" and not message.get("more_body", False):
+                    # Complete the response once the profile is saved, so its id can be fetched right away
+                    held.append(message)
+                    return
+                await send(message)
+
+            self.session = session
+            try:
+                with session:
+                    await self.app(scope, receive, send_profiled)
+            finally:
+                self.session = None
+            await io_executor.run(profile_store.save, session)
+            for message in held:
+                await send(message)
+
+app.add_middleware(ProfileMiddleware)
+
+def require_admin(request: Request):
+    if not profiling.authorized(request.headers.get("x-admin-token")):
+        raise HTTPException(status_code=403, detail="Needs a valid X-Admin-Token")
+
+class StyleConfig(BaseModel):
+    colors: dict
+    spacing: dict
+    borderRadius: dict
+    animation: dict
+    shadow: dict
+    font: str
+    projectName: str  # Add this field to match what frontend is sending
+
+class StructureConfig(BaseModel):
+    projectName: str
+    loginConfig: dict
+    sidebarConfig: dict
+    projectConfig: dict
+    layoutType: str
+
 class ProjectRequest(BaseModel):
     projectName: str
     description: str
     framework: str
     language: str
     backend: str
+    # Optional later wizard steps, run in the same job once the project exists
+    styles: Optional[StyleConfig] = None
+    structure: Optional[StructureConfig] = None
+
+class BackendConfig(BaseModel):
+    routes: List[dict] = []
+    controllers: List[dict] = []
+    models: List[dict] = []
+
+class GenerateAllRequest(ProjectRequest):
+    backendConfig: Optional[BackendConfig] = None
+
+class GenerateBatchRequest(BaseModel):
+    projects: List[GenerateAllRequest]
+
+class PreviewRequest(BaseModel):
+    styles: Optional[StyleConfig] = None
+    structure: Optional[StructureConfig] = None
+
+job_queue = JobQueue()
+worker_pool = WorkerPool()
+BATCH_MAX_PROJECTS = int(os.environ.get('BATCH_MAX_PROJECTS', 100))
+request_coalescer = RequestCoalescer()
+
+@app.on_event("shutdown")
+def shutdown_executors():
+    worker_pool.shutdown()
+    io_executor.shutdown()
+
+def idempotency_key(request: Request, kind, body):
+    """(key, fingerprint) shared by duplicate requests.
+
+    With an Idempotency-Key header the key is the header and the fingerprint
+    the canonical body hash, so a reuse with another body is rejected;
+    without one the body hash is the key and there is no fingerprint.
+    """
+    header = request.headers.get("idempotency-key")
+    if header:
+        return config_key(kind, "header", header), config_key(kind, "body", body)
+    return config_key(kind, "body", body), None
+
+async def wait_for_job(request: Request, job):
+    """Legacy blocking mode: wait for the job, cancelling it once every waiting client went away."""
+    job.waiters += 1
+    try:
+        await cancel_on_disconnect(request, asyncio.shield(job.task))
+    except Exception:
+        pass
+    finally:
+        job.waiters -= 1
+        if job.waiters == 0 and job.status not in TERMINAL_STATUSES:
+            job.task.cancel()
+
+def job_failure(job, detail):
+    """HTTPException for a ?wait=true job that did not succeed: 504 for step timeouts, else 500."""
+    return HTTPException(status_code=504 if job.error_type == 'timeout' else 500, detail=detail)
+
+async def write_files(producer, task, config):
+    """Run a write_* generation task in a worker and record the files it wrote and its step timings."""
+    result = await worker_pool.run(task, config)
+    metrics.observe_writes({producer: result["files"]})
+    for step, seconds in result["timings"].items():
+        metrics.observe_stage(step, 'done', seconds)
+    return result
+
+async def run_project_job(job, project_request: ProjectRequest):
+    """Generate the project and any included wizard steps, reporting stage progress."""
+    # Convert the simple request to our internal project format
+    project_config = convert_simple_config(project_request.dict(exclude={'styles', 'structure'}))
+    project = await ProjectService.create_project(project_config, job.report)
+    result = {
+        "name": project.name,
+        "frontend_path": f"generated_{project.name}_frontend",
+        "backend_path": f"generated_{project.name}_backend"
+    }
+
+    if project_request.styles:
+        job.report('styles', 'running')
+        styles = await write_files('styles', generation_tasks.write_styles, project_request.styles.dict())
+        result["css_path"] = styles["css_path"]
+        result["style_files"] = styles["files"]
+        job.report('styles', 'done')
+
+    if project_request.structure:
+        job.report('structure', 'running')
+        result["structure"] = await write_files('structure', generation_tasks.write_structure, project_request.structure.dict())
+        job.report('structure', 'done')
+
+    return result
+
+@app.post("/generate-project", status_code=202)
+async def generate_project(project_request: ProjectRequest, request: Request, wait: bool = False):
+    stages = ['scaffold', 'install', 'configs']
+    if project_request.styles:
+        stages.append('styles')
+    if project_request.structure:
+        stages.append('structure')
+
+    key, fingerprint = idempotency_key(request, 'generate-project', project_request.dict())
+    try:
+        job = job_queue.submit(
+            'generate-project',
+            lambda job: run_project_job(job, project_request),
+            stages,
+            key=key,
+            fingerprint=fingerprint
+        )
+    except QueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    except IdempotencyMismatch as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    if wait:
+        await wait_for_job(request, job)
+        if job.status != 'succeeded':
+            raise job_failure(job, job.error or f"Job {job.status}")
+
+    return {
+        "status": job.status,
+        "message": f"Project {project_request.projectName} generation {job.status}",
+        "job_id": job.id,
+        "status_url": f"/jobs/{job.id}",
+        "events_url": f"/jobs/{job.id}/events",
+        "project": job.result
+    }
+
+def _without_project_name(value):
+    if isinstance(value, dict):
+        return {k: v for k, v in value.items() if k != 'projectName'}
+    return value
+
+def build_generate_all_pipeline(report, request: GenerateAllRequest, renders=None, worker_slots=None):
+    """Build the task graph of a full wizard generation.
+
+    Every file-producing node renders into memory in a worker, so all of them
+    can run alongside the scaffold; the commit nodes then write the frontend
+    and backend trees once the project exists. Pipelines that share a renders
+    dict render each distinct step input once: generated files do not depend
+    on the project name, only their root directory does.
+    """
+    name = request.projectName
+    pipeline = Pipeline()
+    renders = {} if renders is None else renders
+    # producer -> (side, nodes whose files it owns, config hash)
+    producers = {}
+    # Keep one pipeline (or batch) from filling the worker pool's queue on its own
+    worker_slots = worker_slots or asyncio.Semaphore(max(worker_pool.size, 1))
+
+    async def in_worker(func, *args):
+        async with worker_slots:
+            return await worker_pool.run(func, *args)
+
+    async def rendered(step, *args):
+        key = config_key(step, *[_without_project_name(arg) for arg in args])
+        if key not in renders:
+            renders[key] = asyncio.ensure_future(in_worker(generation_tasks.render_step, step, name, *args))
+        return await asyncio.shield(renders[key])
+
+    def render(step, *args):
+        return lambda deps: rendered(step, *args)
+
+    async def scaffold(_):
+        project_config = convert_simple_config(request.dict(exclude={'styles', 'structure', 'backendConfig'}))
+        def progress(stage, status, **detail):
+            # The pipeline reports the scaffold node itself; forward the install/configs stages
+            if stage != 'scaffold':
+                report(stage, status, **detail)
+
+        project = await ProjectService.create_project(project_config, progress)
+        return {"frontend_path": project.frontend_path, "backend_path": project.backend_path}
+
+    pipeline.add('scaffold', scaffold)
+
+    if request.styles:
+        styles = dict(request.styles.dict(), projectName=name)
+        pipeline.add('css', render('css', styles))
+        producers['styles'] = ('frontend', ['css'], config_key({k: v for k, v in styles.items() if k != 'projectName'}))
+
+    if request.structure:
+        structure = dict(request.structure.dict(), projectName=name)
+        pipeline.add('login', render('login', structure))
+        pipeline.add('sidebar', render('sidebar', structure))
+        pipeline.add('components', render('components', structure))
+        pipeline.add(
+            'pages',
+            lambda deps: rendered('pages', structure, deps['components']['result']),
+            deps=['components']
+        )
+        producers['structure'] = ('frontend', ['login', 'components', 'pages'], config_key(structure))
+        producers['sidebar'] = ('frontend', ['sidebar'], config_key(structure['sidebarConfig']))
+
+    if request.backendConfig:
+        backend = request.backendConfig.dict()
+        for step in ('routes', 'controllers', 'models'):
+            pipeline.add(step, render(step, backend))
+            producers[step] = ('backend', [step], config_key(backend))
+
+    for side in ('frontend', 'backend'):
+        owned = {producer: spec for producer, spec in producers.items() if spec[0] == side}
+        if not owned:
+            continue
+        nodes = [node for _, node_names, _ in owned.values() for node in node_names]
+
+        async def commit(deps, side=side, owned=owned):
+            trees = {}
+            for producer, (_, node_names, config_hash) in owned.items():
+                files = {}
+                for node in node_names:
+                    files.update(deps[node]['files'])
+                trees[producer] = {"config_hash": config_hash, "files": files}
+            files = await in_worker(generation_tasks.commit_trees, name, side, trees)
+            metrics.observe_writes(files)
+            return files
+
+        pipeline.add(f'commit_{side}', commit, deps=['scaffold'] + nodes)
+
+    return pipeline
+
+def pipeline_result(name, results, report):
+    return {
+        "name": name,
+        **results['scaffold'],
+        "files": {
+            side: results[f'commit_{side}']
+            for side in ('frontend', 'backend') if f'commit_{side}' in results
+        },
+        "nodes": report
+    }
+
+async def run_pipeline_job(job, request: GenerateAllRequest):
+    """Run the /generate-all task graph, returning write counts and per-node timings."""
+    pipeline = build_generate_all_pipeline(job.report, request)
+    try:
+        results, report = await pipeline.run(job.report)
+    except PipelineError as e:
+        job.result = {"nodes": e.report}
+        raise
+    return pipeline_result(request.projectName, results, report)
+
+@app.post("/generate-all", status_code=202)
+async def generate_all(generate_request: GenerateAllRequest, request: Request, wait: bool = False):
+    """Generate project, styles, structure and backend files in one pipeline run."""
+    try:
+        pipeline_nodes = build_generate_all_pipeline(None, generate_request).order()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    key, fingerprint = idempotency_key(request, 'generate-all', generate_request.dict())
+    try:
+        job = job_queue.submit(
+            'generate-all',
+            lambda job: run_pipeline_job(job, generate_request),
+            pipeline_nodes + ['install', 'configs'],
+            key=key,
+            fingerprint=fingerprint
+        )
+    except QueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    except IdempotencyMismatch as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    if wait:
+        await wait_for_job(request, job)
+        if job.status != 'succeeded':
+            raise job_failure(job, {"error": job.error or f"Job {job.status}", "result": job.result})
+
+    return {
+        "status": job.status,
+        "message": f"Project {generate_request.projectName} generation {job.status}",
+        "job_id": job.id,
+        "status_url": f"/jobs/{job.id}",
+        "events_url": f"/jobs/{job.id}/events",
+        "project": job.result
+    }
+
+async def run_batch_job(job, batch: GenerateBatchRequest):
+    """Run one pipeline per project, sharing scaffold installs and identical renders."""
+    renders = {}
+    worker_slots = asyncio.Semaphore(max(worker_pool.size, 1))
+    started = time.perf_counter()
+
+    async def run_project(name, pipeline, report):
+        try:
+            results, nodes = await pipeline.run(report)
+        except PipelineError as e:
+            return {"name": name, "status": "failed", "error": str(e), "nodes": e.report}
+        return {"status": "succeeded", **pipeline_result(name, results, nodes)}
+
+    def reporter(name):
+        return lambda stage, status, **detail: job.report(f'{name}:{stage}', status, **detail)
+
+    runs = []
+    for project_request in batch.projects:
+        name = project_request.projectName
+        report = reporter(name)
+        runs.append((name, build_generate_all_pipeline(report, project_request, renders, worker_slots), report))
+    requested_renders = sum(
+        1 for _, pipeline, _ in runs for node in pipeline.nodes if node in generation_tasks.PIPELINE_STEPS
+    )
+    projects = await asyncio.gather(*(run_project(*run) for run in runs))
+    total = time.perf_counter() - started
+
+    return {
+        "projects": projects,
+        "succeeded": sum(1 for project in projects if project["status"] == "succeeded"),
+        "failed": sum(1 for project in projects if project["status"] == "failed"),
+        # Skeleton installs are shared through the skeleton cache, renders here
+        "renders": {"requested": requested_renders, "distinct": len(renders)},
+        "total_ms": round(total * 1000, 2),
+        "projects_per_second": round(len(projects) / total, 2) if total else None
+    }
+
+@app.post("/generate-batch", status_code=202)
+async def generate_batch(batch: GenerateBatchRequest, request: Request, wait: bool = False):
+    """Generate many projects in one job, building each shared artifact once."""
+    names = [project_request.projectName for project_request in batch.projects]
+    if not names:
+        raise HTTPException(status_code=400, detail="No projects in batch")
+    if len(names) > BATCH_MAX_PROJECTS:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_MAX_PROJECTS} projects per batch")
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise HTTPException(status_code=400, detail=f"Duplicate project names in batch: {', '.join(duplicates)}")
+
+    stages = []
+    try:
+        for project_request in batch.projects:
+            nodes = build_generate_all_pipeline(None, project_request).order() + ['install', 'configs']
+            stages.extend(f'{project_request.projectName}:{node}' for node in nodes)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    key, fingerprint = idempotency_key(request, 'generate-batch', batch.dict())
+    try:
+        job = job_queue.submit(
+            'generate-batch',
+            lambda job: run_batch_job(job, batch),
+            stages,
+            key=key,
+            fingerprint=fingerprint
+        )
+    except QueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    except IdempotencyMismatch as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    if wait:
+        await wait_for_job(request, job)
+        if job.status != 'succeeded':
+            raise job_failure(job, job.error or f"Job {job.status}")
+
+    return {
+        "status": job.status,
+        "message": f"Batch of {len(names)} projects {job.status}",
+        "job_id": job.id,
+        "status_url": f"/jobs/{job.id}",
+        "events_url": f"/jobs/{job.id}/events",
+        "batch": job.result
+    }
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+@app.get("/jobs/{job_id}/events")
+async def job_events(job_id: str):
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def stream():
+        async for message in job.follow():
+            yield sse_format(message)
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
 
-@app.post("/generate-project")
-async def generate_project(project_request: ProjectRequest):
+@app.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    if job_queue.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {"cancelled": job_queue.cancel(job_id)}
+
+@app.post("/generate-styles")
+async def generate_styles(style_config: StyleConfig, request: Request):
     try:
-        # Convert the simple request to our internal project format
-        project_config = convert_simple_config(project_request.dict())
-        
-        # Create the project using our service
-        service = ProjectService()
-        project = await service.create_project(project_config)
-        
+        project_name = style_config.projectName
+        key, fingerprint = idempotency_key(request, 'generate-styles', style_config.dict())
+        styles = await request_coalescer.run(
+            key,
+            lambda: write_files('styles', generation_tasks.write_styles, style_config.dict()),
+            fingerprint
+        )
+
         return {
             "status": "success",
-            "message": f"Project {project_request.projectName} generated successfully",
-            "project": {
-                "name": project.name,
-                "frontend_path": f"generated_{project.name}_frontend",
-                "backend_path": f"generated_{project.name}_backend"
-            }
+            "message": f"Styles generated successfully for {project_name}",
+            "css_path": styles["css_path"],
+            "files": styles["files"]
         }
+    except PoolSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except IdempotencyMismatch as e:
+        raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
-        # Log the full error details
         import traceback
         error_details = traceback.format_exc()
         print(f"Error details: {error_details}")
@@ -57,139 +531,248 @@ async def generate_project(project_request: ProjectRequest):
             detail=f"Internal server error: {str(e)}\n{error_details}"
         )
 
-class StyleConfig(BaseModel):
-    colors: dict
-    spacing: dict
-    borderRadius: dict
-    animation: dict
-    shadow: dict
-    font: str
-    projectName: str  # Add this field to match what frontend is sending
-@app.post("/generate-styles")
-async def generate_styles(style_config: StyleConfig):
+
+@app.post("/generate-structure")
+async def generate_structure(structure_config: StructureConfig, request: Request):
     try:
-        # Extract project name from the request
-        project_name = style_config.projectName
-        style_dict = style_config.dict()
-        
-        # Remove projectName from the dict before passing to generate_css_variables
-        style_dict.pop('projectName', None)
-        
-        # Generate CSS content with project name
-        css_content = generate_css_variables(style_dict, project_name)
-        
-        # Define the output path using the project name
-        frontend_dir = os.path.join(os.getcwd(), f"generated_{project_name}_frontend")
-        output_path = os.path.join(frontend_dir, "src", "styles", "variables.css")
-        
-        # Ensure the styles directory exists
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        
-        # Save the CSS file
-        save_css_file(css_content, output_path)
-        from pydantic import BaseModel
-        
-        class StructureConfig(BaseModel):
-            projectName: str
-            loginConfig: dict
-            sidebarConfig: dict
-            projectConfig: dict
-            layoutType: str
-        
-        @app.post("/generate-structure")
-        async def generate_structure(structure_config: StructureConfig):
-            try:
-                project_name = structure_config.projectName
-                frontend_dir = os.path.join(os.getcwd(), f"generated_{project_name}_frontend")
-                        
-                # Generate login component if enabled
-                if structure_config.loginConfig["enabled"]:
-                    login_generator = LoginGenerator()
-                    login_path = login_generator.generate_login_component(
-                        structure_config.loginConfig,
-                        frontend_dir
-                    )
-                    print(f"Login component generated at: {login_path}")
-        
-                # Generate components
-                component_handler = ComponentHandler()
-                components_config = {
-                    "pages": {
-                        "main": {
-                            "components": [
-                                # Add your component configurations here based on the layout type
-                                {
-                                    "id": "main-layout",
-                                    "name": structure_config.layoutType,
-                                    "componentType": "reusable",
-                                    "features": {
-                                        "reusableComponents": ["navbar", "sidebar", "content"]
-                                    },
-                                    "layoutComponente": {
-                                        "lg": [
-                                            # Layout configuration will be based on the selected layout type
-                                        ]
-                                    }
-                                }
-                            ]
-                        }
-                    }
-                }
-                processed_components = component_handler.process_components_config(components_config)
-        
-                # Generate pages
-                page_handler = PageHandler()
-                pages_config = {
-                    "pages": {
-                        "main": {
-                            "name": "Main Layout",
-                            "path": "/",
-                            "layout": {
-                                "type": "single",
-                                "columns": 12,
-                                "gap": "4"
-                            },
-                            "components": processed_components
-                        }
-                    }
-                }
-                processed_pages = page_handler.process_pages_config(pages_config)
-        
-                return {
-                    "status": "success",
-                    "message": "Structure generated successfully",
-                    "project": {
-                        "name": project_name,
-                        "frontend_path": frontend_dir,
-                        "components": processed_components,
-                        "pages": processed_pages
-                    }
-                }
-            except Exception as e:
-                import traceback
-                error_details = traceback.format_exc()
-                print(f"Error details: {error_details}")
-                raise HTTPException(
-                    status_code=500, 
-                    detail=f"Internal server error: {str(e)}\n{error_details}"
-                )
+        key, fingerprint = idempotency_key(request, 'generate-structure', structure_config.dict())
+        structure = await request_coalescer.run(
+            key,
+            lambda: write_files('structure', generation_tasks.write_structure, structure_config.dict()),
+            fingerprint
+        )
+
+        return {
+            "status": "success",
+            "message": "Structure generated successfully",
+            "project": structure
+        }
+    except PoolSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except IdempotencyMismatch as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        import traceback
+        error_details = traceback.format_exc()
+        print(f"Error details: {error_details}")
+        raise HTTPException(
+            status_code=500, 
+            detail=f"Internal server error: {str(e)}\n{error_details}"
+        )
+
+preview_store = PreviewStore()
+
+@app.post("/preview")
+async def preview_generation(preview_request: PreviewRequest):
+    """Render styles and/or structure in memory and return the files without touching the disk."""
+    configs = [config for config in (preview_request.styles, preview_request.structure) if config]
+    if not configs:
+        raise HTTPException(status_code=400, detail="Nothing to preview: send styles and/or structure")
+    project_names = {config.projectName for config in configs}
+    if len(project_names) > 1:
+        raise HTTPException(status_code=400, detail="styles and structure must target the same project")
+
+    started = time.perf_counter()
+    try:
+        trees = await worker_pool.run(
+            generation_tasks.preview,
+            preview_request.styles.dict() if preview_request.styles else None,
+            preview_request.structure.dict() if preview_request.structure else None
+        )
+    except PoolSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return {
+        "preview_id": preview_store.add(project_names.pop(), trees),
+        "files": {producer: tree["files"] for producer, tree in trees.items()},
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2)
+    }
+
+@app.post("/previews/{preview_id}/commit")
+async def commit_preview(preview_id: str):
+    """Write an accepted preview into the project on disk."""
+    preview = preview_store.pop(preview_id)
+    if preview is None:
+        raise HTTPException(status_code=404, detail="Preview not found or expired")
+    try:
+        files = await worker_pool.run(generation_tasks.commit_preview, preview["project_name"], preview["trees"])
+        metrics.observe_writes(files)
+    except PoolSaturated as e:
+        preview_store.add(preview["project_name"], preview["trees"])
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    return {"status": "success", "files": files}
+
+@app.delete("/previews/{preview_id}")
+async def discard_preview(preview_id: str):
+    if preview_store.pop(preview_id) is None:
+        raise HTTPException(status_code=404, detail="Preview not found or expired")
+    return {"status": "discarded"}
+
+@app.get("/previews/{preview_id}/archive")
+async def download_preview_archive(preview_id: str, format: str = "zip"):
+    preview = preview_store.get(preview_id)
+    if preview is None:
+        raise HTTPException(status_code=404, detail="Preview not found or expired")
+    try:
+        check_format(format)
+    except ArchiveError as e:
+        raise HTTPException(status_code=400 if format not in ARCHIVE_FORMATS else 501, detail=str(e))
+
+    files = {}
+    for tree in preview["trees"].values():
+        files.update(tree["files"])
+    output = ArchiveOutput(project_paths.frontend_dir(preview["project_name"]), files)
+    return StreamingResponse(
+        output.stream(format),
+        media_type=ARCHIVE_FORMATS[format],
+        headers={"Content-Disposition": content_disposition(f'{preview["project_name"]}-preview.{format}')}
+    )
+
+@app.get("/workers")
+async def worker_metrics():
+    return worker_pool.metrics()
+
+@app.get("/io")
+async def io_metrics():
+    return io_executor.metrics()
+
+def _job_counts():
+    counts = {(status,): 0 for status in ('queued', 'running')}
+    for job in job_queue.jobs.values():
+        if job.status in ('queued', 'running'):
+            counts[(job.status,)] += 1
+    return counts
+
+def _cache_counter(index):
+    return lambda: {(name,): totals[index] for name, totals in worker_pool.cache_stats.items()}
+
+def _cache_hit_ratio():
+    return {
+        (name,): hits / (hits + misses)
+        for name, (hits, misses, _) in worker_pool.cache_stats.items() if hits + misses
+    }
+
+for gauge in (
+    metrics.GaugeFunction('generator_jobs', 'Generation jobs queued or running.', _job_counts, ('status',)),
+    metrics.GaugeFunction('generator_worker_tasks_in_flight', 'Tasks submitted to the worker pool and not finished.',
+                          lambda: worker_pool.in_flight),
+    metrics.GaugeFunction('generator_io_queue_depth', 'Blocking I/O calls waiting for an I/O thread.',
+                          lambda: io_executor.metrics()['queue_depth']),
+    metrics.GaugeFunction('generator_render_cache_hits_total', 'Render cache hits across workers.',
+                          _cache_counter(0), ('cache',), 'counter'),
+    metrics.GaugeFunction('generator_render_cache_misses_total', 'Render cache misses across workers.',
+                          _cache_counter(1), ('cache',), 'counter'),
+    metrics.GaugeFunction('generator_render_cache_hit_ratio', 'Share of render cache lookups that hit.',
+                          _cache_hit_ratio, ('cache',)),
+    metrics.GaugeFunction('generator_requests_deduplicated_total', 'Duplicate generation requests coalesced or replayed.',
+                          lambda: {
+                              ('coalesced',): job_queue.stats['coalesced'] + request_coalescer.stats['coalesced'],
+                              ('replayed',): job_queue.stats['replayed'] + request_coalescer.stats['replayed'],
+                          }, ('outcome',), 'counter'),
+):
+    metrics.registry.register(gauge)
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Prometheus text exposition of stage latencies, job and queue gauges, writes and cache counters."""
+    return PlainTextResponse(metrics.registry.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/profiles")
+async def list_profiles(request: Request):
+    require_admin(request)
+    return {"profiles": await io_executor.run(profile_store.list)}
+
+@app.get("/profiles/{profile_id}")
+async def download_profile(profile_id: str, request: Request, format: str = "prof"):
+    """Download a saved profile as a pstats dump (format=prof) or the text report (format=txt)."""
+    require_admin(request)
+    if format not in ("prof", "txt"):
+        raise HTTPException(status_code=400, detail="Unsupported format, use 'prof' or 'txt'")
+    path = profile_store.path(profile_id, format)
+    if path is None or not os.path.isfile(path):
+        raise HTTPException(status_code=404, detail="Profile not found")
+    if format == "txt":
+        return FileResponse(path, media_type="text/plain")
+    return FileResponse(path, media_type="application/octet-stream", filename=f"{profile_id}.prof")
+
+@app.get("/idempotency")
+async def idempotency_metrics():
+    """Duplicate generation requests attached to a running job/request or answered from a stored result."""
+    return {"jobs": job_queue.metrics(), "requests": request_coalescer.metrics()}
+
+project_index = ProjectIndex(project_paths.PROJECTS_ROOT)
+
+@app.on_event("startup")
+def build_project_index():
+    project_index.refresh()
+
 @app.get("/list-projects")
-async def list_projects():
+async def list_projects(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    prefix: str = ""
+):
     try:
-        # Get the path to the python directory
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        
-        # List all directories that start with "generated_" and end with "_frontend"
-        projects = [
-            d.replace("generated_", "").replace("_frontend", "")
-            for d in os.listdir(current_dir)
-            if os.path.isdir(os.path.join(current_dir, d))
-            and d.startswith("generated_")
-            and d.endswith("_frontend")
-        ]
-        
-        return {"projects": projects}
+        # Rebuilt only when a generated project directory was added or removed
+        project_index.refresh()
+        if request.headers.get("if-none-match") == project_index.etag:
+            return Response(status_code=304, headers={"ETag": project_index.etag})
+
+        projects, next_cursor = project_index.page(prefix, cursor, limit)
+        response.headers["ETag"] = project_index.etag
+        return {"projects": projects, "next_cursor": next_cursor}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+archive_cache = ArchiveCache()
+
+class ZeroCopyFileResponse(FileResponse):
+    """FileResponse that lets the server sendfile() the body when it supports
+    the ASGI zero-copy send extension; otherwise the file is read in chunks."""
+
+    async def __call__(self, scope, receive, send):
+        if self.send_header_only or "http.response.zerocopysend" not in scope.get("extensions", {}):
+            return await super().__call__(scope, receive, send)
+        self.set_stat_headers(os.stat(self.path))
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        with open(self.path, "rb") as f:
+            await send({"type": "http.response.zerocopysend", "file": f, "more_body": False})
+
+@app.get("/projects/{project_name}/archive")
+async def download_project_archive(project_name: str, format: str = "zip", include_node_modules: bool = False):
+    if format not in ARCHIVE_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format '{format}', use one of {list(ARCHIVE_FORMATS)}")
+    try:
+        check_format(format)
+    except ArchiveError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+
+    directories = [
+        path for path in (project_paths.frontend_dir(project_name), project_paths.backend_dir(project_name))
+        if os.path.isdir(path)
+    ]
+    if not directories:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    files = await io_executor.run(collect_files, directories, include_node_modules)
+    cache_path = archive_cache.path_for(
+        project_paths.sanitize_project_name(project_name), format, fingerprint(files, format)
+    )
+    headers = {"Content-Disposition": content_disposition(f"{project_name}.{format}")}
+
+    # Unchanged project: serve the stored archive straight from disk
+    if os.path.isfile(cache_path):
+        return ZeroCopyFileResponse(cache_path, media_type=ARCHIVE_FORMATS[format], headers=headers)
+
+    def body():
+        yield from stream_archive(files, format, cache_path)
+        archive_cache.prune(project_paths.sanitize_project_name(project_name), format, keep=cache_path)
+
+    return StreamingResponse(body(), media_type=ARCHIVE_FORMATS[format], headers=headers)
+
 if __name__ == "__main__":
     uvicorn.run("api:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
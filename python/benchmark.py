@@ -0,0 +1,266 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+import render_cache
+from component_handler import ComponentHandler
+from controller_generator import ControllerGenerator
+from layout_handler import LayoutHandler
+from login_generator import LoginGenerator
+from output_backend import MemoryOutput
+from page_handler import PageHandler
+from routes_generator import RouteGenerator
+from sidebar_generator import SidebarGenerator
+from style_generator import generate_css_variables
+
+# Micro-benchmarks of every generator against synthetic configs. Output goes
+# to a MemoryOutput, so only rendering is measured, and the render caches are
+# cleared before each run unless --warm is given.
+
+BENCHMARK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.benchmarks')
+PROJECT_ROOT = '/benchmark-project'
+
+# Scale of each synthetic config: grid items/components, pages, sidebar tabs,
+# login fields, routes, controllers and CSS tokens
+SIZES = {
+    'tiny': {'components': 10, 'pages': 1, 'tabs': 3, 'fields': 2, 'routes': 5, 'controllers': 1, 'tokens': 5},
+    'small': {'components': 100, 'pages': 10, 'tabs': 20, 'fields': 5, 'routes': 50, 'controllers': 10, 'tokens': 20},
+    'medium': {'components': 1000, 'pages': 100, 'tabs': 100, 'fields': 20, 'routes': 500, 'controllers': 100, 'tokens': 100},
+    'large': {'components': 10000, 'pages': 1000, 'tabs': 500, 'fields': 50, 'routes': 5000, 'controllers': 1000, 'tokens': 500},
+}
+
+ICONS = ['Home', 'Users', 'Settings', 'FileText', 'BarChart', 'Mail', 'Calendar', 'Folder', 'Star', 'Lock']
+REUSABLE = ['basic-table', 'sortable-table', 'primary-button', 'text-input', 'navbar', 'alert', 'card']
+ACTIONS = list(ControllerGenerator.supported_actions)
+METHODS = ['GET', 'POST', 'PUT', 'DELETE']
+LAYOUT_TYPE = 'Dashboard Layout'
+
+
+def grid_items(count):
+    return [
+        {'i': f'item-{REUSABLE[n % len(REUSABLE)]}-{n}', 'x': (n * 3) % 12, 'y': n // 4, 'w': 3, 'h': 2}
+        for n in range(count)
+    ]
+
+
+def components_config(size):
+    """size['components'] reusable components spread over size['pages'] pages."""
+    pages = {}
+    for n in range(size['components']):
+        page = pages.setdefault(f'page{n % size["pages"]}', {'components': []})
+        page['components'].append({
+            'id': f'component-{n}',
+            'name': f'Component {n}',
+            'componentType': 'reusable',
+            'layout': {'columns': 12, 'maxWidth': '1200px'},
+            'features': {'reusableComponents': REUSABLE[:1 + n % len(REUSABLE)]},
+            'layoutComponente': {'lg': grid_items(4)},
+        })
+    return {'pages': pages}
+
+
+def pages_config(size):
+    """size['pages'] pages whose layouts hold size['components'] grid items in total."""
+    per_page = max(1, size['components'] // size['pages'])
+    return {'pages': {
+        f'page{n}': {
+            'name': f'Page {n}',
+            'path': f'/page-{n}',
+            'layout': {'type': 'single', 'columns': 12, 'gap': '4'},
+            'components': [{
+                'id': f'main-{n}',
+                'name': f'page{n}',
+                'componentType': 'reusable',
+                'features': {'reusableComponents': REUSABLE},
+                'layout': {'padding': '4', 'maxWidth': '1200px'},
+                'layoutComponente': {'lg': grid_items(per_page), 'md': grid_items(per_page // 2)},
+            }],
+        }
+        for n in range(size['pages'])
+    }}
+
+
+def layout_config(size):
+    config = pages_config(size)
+    config['layoutType'] = LAYOUT_TYPE
+    return config
+
+
+def sidebar_config(size):
+    return {'enabled': True, 'tabs': [
+        {'name': f'Tab {n}', 'icon': ICONS[n % len(ICONS)], 'path': f'/tab-{n}'} for n in range(size['tabs'])
+    ]}
+
+
+def login_config(size):
+    return {
+        'fields': [{'name': f'field{n}', 'icon': ICONS[n % len(ICONS)]} for n in range(size['fields'])],
+        'socialProviders': [{'enabled': n % 2 == 0, 'icon': ICONS[-1 - n % 3]} for n in range(size['fields'])],
+    }
+
+
+def routes_config(size):
+    controllers = max(1, size['routes'] // 5)
+    return {'routes': [
+        {
+            'path': f'/resource{n % controllers}/{n}',
+            'method': METHODS[n % len(METHODS)],
+            'controller': f'Resource{n % controllers}Controller',
+            'action': ACTIONS[n % len(ACTIONS)],
+        }
+        for n in range(size['routes'])
+    ]}
+
+
+def controllers_config(size):
+    return {'controllers': [
+        {'name': f'Resource{n}Controller', 'actions': ACTIONS, 'options': {'caching': n % 2 == 0}}
+        for n in range(size['controllers'])
+    ]}
+
+
+def style_config(size):
+    tokens = size['tokens']
+    return {
+        'colors': {f'color{n}': f'#{n * 2654435761 % 0xFFFFFF:06x}' for n in range(tokens)},
+        'spacing': {f'space{n}': f'{n * 4}px' for n in range(tokens)},
+        'borderRadius': {f'radius{n}': f'{n}px' for n in range(tokens)},
+        'animation': {'duration': '200ms', 'easing': 'ease-in-out'},
+        'shadow': {f'shadow{n}': f'0 {n}px {n * 2}px rgba(0,0,0,0.1)' for n in range(tokens)},
+        'font': 'Inter',
+    }
+
+
+# name -> (config builder, run(config))
+BENCHMARKS = {
+    'components': (components_config,
+                   lambda config: ComponentHandler().process_components_config(config, PROJECT_ROOT, MemoryOutput(PROJECT_ROOT))),
+    'pages': (pages_config,
+              lambda config: PageHandler().process_pages_config(config, PROJECT_ROOT, MemoryOutput(PROJECT_ROOT))),
+    'layout': (layout_config, lambda config: LayoutHandler().process_layout_config(config)),
+    'layout_components': (layout_config,
+                          lambda config: LayoutHandler().generate_layout_components(config, PROJECT_ROOT, MemoryOutput(PROJECT_ROOT))),
+    'sidebar': (sidebar_config, lambda config: SidebarGenerator().generate_sidebar_component(config)),
+    'login': (login_config,
+              lambda config: LoginGenerator().generate_login_component(config, PROJECT_ROOT, MemoryOutput(PROJECT_ROOT))),
+    'routes': (routes_config, lambda config: RouteGenerator().generate_routes(config)),
+    'controllers': (controllers_config, lambda config: ControllerGenerator().generate_controllers(config)),
+    'css': (style_config, lambda config: generate_css_variables(config, 'benchmark')),
+}
+
+
+def clear_caches():
+    for cache in render_cache._caches:
+        cache.clear()
+
+
+def time_benchmark(run, config, repeat, warm=False, min_time=0.2):
+    """Time run(config) at least repeat times (and for at least min_time seconds); return seconds per run."""
+    times = []
+    started = time.perf_counter()
+    while len(times) < repeat or (time.perf_counter() - started < min_time and len(times) < repeat * 20):
+        if not warm:
+            clear_caches()
+        run_started = time.perf_counter()
+        run(config)
+        times.append(time.perf_counter() - run_started)
+    return times
+
+
+def run_benchmarks(names, sizes, repeat, warm=False):
+    results = {}
+    for name in names:
+        build_config, run = BENCHMARKS[name]
+        for size_name in sizes:
+            config = build_config(SIZES[size_name])
+            if warm:
+                run(config)
+            times = time_benchmark(run, config, repeat, warm)
+            results[f'{name}/{size_name}'] = {
+                'runs': len(times),
+                'median_s': statistics.median(times),
+                'min_s': min(times),
+                'mean_s': statistics.fmean(times),
+                'stdev_s': statistics.stdev(times) if len(times) > 1 else 0.0,
+            }
+            print(f"{name + '/' + size_name:<28} median {results[f'{name}/{size_name}']['median_s'] * 1000:10.3f} ms"
+                  f"  ({len(times)} runs)")
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Return benchmarks whose median grew by more than threshold (0.2 = 20%) over the baseline."""
+    regressions = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        if not base or not base['median_s']:
+            continue
+        ratio = result['median_s'] / base['median_s']
+        if ratio > 1 + threshold:
+            regressions.append({
+                'benchmark': key,
+                'baseline_s': base['median_s'],
+                'median_s': result['median_s'],
+                'ratio': round(ratio, 3),
+            })
+    return regressions
+
+
+def main(argv=None):
+    """Run the generator benchmarks, save the results and compare them against a baseline."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--benchmarks', default=','.join(BENCHMARKS), help='comma-separated benchmark names')
+    parser.add_argument('--sizes', default='tiny,small,medium', help=f"comma-separated sizes from {', '.join(SIZES)}")
+    parser.add_argument('--repeat', type=int, default=5, help='minimum runs per benchmark')
+    parser.add_argument('--warm', action='store_true', help='keep render caches between runs')
+    parser.add_argument('--output', default=os.path.join(BENCHMARK_DIR, 'results.json'))
+    parser.add_argument('--baseline', default=os.path.join(BENCHMARK_DIR, 'baseline.json'))
+    parser.add_argument('--save-baseline', action='store_true', help='store these results as the new baseline')
+    parser.add_argument('--threshold', type=float, default=0.2, help='flag medians slower than baseline by this fraction')
+    args = parser.parse_args(argv)
+
+    names = args.benchmarks.split(',')
+    sizes = args.sizes.split(',')
+    unknown = [name for name in names if name not in BENCHMARKS] + [size for size in sizes if size not in SIZES]
+    if unknown:
+        parser.error(f"Unknown benchmark or size: {', '.join(unknown)}")
+
+    results = run_benchmarks(names, sizes, args.repeat, args.warm)
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'created_at': time.time(),
+            'repeat': args.repeat,
+            'warm': args.warm,
+        },
+        'results': results,
+    }
+
+    regressions = []
+    if os.path.isfile(args.baseline) and not args.save_baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f)['results'], args.threshold)
+        report['regressions'] = regressions
+        for regression in regressions:
+            print(f"REGRESSION {regression['benchmark']}: {regression['baseline_s'] * 1000:.3f} ms -> "
+                  f"{regression['median_s'] * 1000:.3f} ms (x{regression['ratio']})")
+        if not regressions:
+            print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}")
+
+    paths = [args.output] + ([args.baseline] if args.save_baseline else [])
+    for path in paths:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results saved to: {path}")
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,119 @@
+import asyncio
+import logging
+import os
+import signal
+import time
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+# Per-step timeouts in seconds for external commands run during generation.
+STEP_TIMEOUTS = {
+    'scaffold': 300,
+    'install': 900,
+}
+DEFAULT_TIMEOUT = 300
+
+
+class CommandError(Exception):
+    def __init__(self, message, returncode=None, output=''):
+        super().__init__(message)
+        self.returncode = returncode
+        self.output = output
+
+
+class CommandTimeout(CommandError):
+    pass
+
+
+async def _stream(stream, step, level, lines):
+    async for raw in stream:
+        line = raw.decode('utf-8', errors='replace').rstrip()
+        lines.append(line)
+        logger.log(level, '[%s] %s', step, line)
+
+
+def _kill(process):
+    """Kill the command and everything it spawned (npm forks node children)."""
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+async def run_command(args, cwd, step='command', timeout=None, env=None):
+    """Run an external command without blocking the event loop.
+
+    stdout/stderr are streamed to the log line by line. A non-zero exit raises
+    CommandError, exceeding the step timeout raises CommandTimeout, and
+    cancelling the awaiting task kills the child process group.
+    """
+    if timeout is None:
+        timeout = STEP_TIMEOUTS.get(step, DEFAULT_TIMEOUT)
+
+    logger.info('[%s] $ %s (cwd=%s)', step, ' '.join(args), cwd)
+    started = time.perf_counter()
+    process = await asyncio.create_subprocess_exec(
+        *args,
+        cwd=cwd,
+        env=env,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        start_new_session=True,
+    )
+
+    lines = []
+    gathered = asyncio.gather(
+        _stream(process.stdout, step, logging.INFO, lines),
+        _stream(process.stderr, step, logging.WARNING, lines),
+        process.wait(),
+    )
+    try:
+        await asyncio.wait_for(gathered, timeout)
+    except asyncio.TimeoutError:
+        _kill(process)
+        await process.wait()
+        raise CommandTimeout(
+            f"'{' '.join(args)}' timed out after {timeout}s in step {step}",
+            output='\n'.join(lines),
+        )
+    except asyncio.CancelledError:
+        _kill(process)
+        await process.wait()
+        if gathered.done() and not gathered.cancelled():
+            gathered.exception()
+        raise
+
+    # e.g. 'npm create' or 'npm ci', so the install step's variants stay apart
+    metrics.command_seconds.observe(time.perf_counter() - started, step=step, command=' '.join(args[:2]))
+    output = '\n'.join(lines)
+    if process.returncode != 0:
+        raise CommandError(
+            f"'{' '.join(args)}' exited with status {process.returncode} in step {step}",
+            returncode=process.returncode,
+            output=output,
+        )
+    return output
+
+
+async def cancel_on_disconnect(request, coro, poll_interval=0.5):
+    """Await coro, cancelling it (and any running command) if the HTTP client goes away."""
+    task = asyncio.ensure_future(coro)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=poll_interval)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                task.cancel()
+                logger.warning('Client disconnected, cancelled %s %s', request.method, request.url.path)
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+                raise asyncio.CancelledError()
+    finally:
+        if not task.done():
+            task.cancel()
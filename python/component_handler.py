@@ -1,31 +1,36 @@
 import json
 import os
+import project_paths
+from template_engine import templates
+from render_cache import RenderCache, config_key
+from output_backend import write_output
 
-class ComponentHandler:
-    def __init__(self):
-        self.component_defaults = {
-            'layout': {
-                'type': 'single',
-                'columns': 12,
-                'gap': '4',
-                'padding': '4',
-                'margin': '4',
-                'maxWidth': '1200px'
-            }
+def _component_defaults():
+    return {
+        'layout': {
+            'type': 'single',
+            'columns': 12,
+            'gap': '4',
+            'padding': '4',
+            'margin': '4',
+            'maxWidth': '1200px'
         }
-        
-        self.reusable_components = [
-            'basic-table',
-            'sortable-table',
-            'primary-button',
-            'text-input',
-            'navbar',
-            'alert',
-            'card'
-        ]
-
-        self.component_templates = {
-            'reusable': '''
+    }
+
+def _reusable_components():
+    return (
+        'basic-table',
+        'sortable-table',
+        'primary-button',
+        'text-input',
+        'navbar',
+        'alert',
+        'card'
+    )
+
+templates.register_catalog('component.defaults', _component_defaults)
+templates.register_catalog('component.reusable_names', _reusable_components)
+templates.register('component.reusable', '''
 import React from 'react';
 import { {imports} } from '../components/reusable';
 
@@ -42,60 +47,102 @@ const {name}: React.FC<{name}Props> = () => {{
 }};
 
 export default {name};
-'''
-        }
+''')
+
+render_cache = RenderCache('component')
+
+class ComponentHandler:
+    def __init__(self):
+        self.component_defaults = templates.catalog('component.defaults')
+        self.reusable_components = templates.catalog('component.reusable_names')
 
     def generate_component_code(self, component):
         """Generate React component code."""
         if component['componentType'] == 'reusable':
-            template = self.component_templates['reusable']
-            layout = component.get('layout', {})
-            features = component.get('features', {})
-            
-            # Generate imports
-            imports = ', '.join(
-                comp.replace('-', '').capitalize() 
-                for comp in features.get('reusableComponents', [])
+            template = templates.get('component.reusable')
+            key = config_key(
+                template.version,
+                component['name'],
+                component.get('layout', {}),
+                component.get('features', {}).get('reusableComponents', []),
+                component.get('layoutComponente', {}).get('lg', [])
             )
-            
-            # Generate component instances
-            layout_items = component.get('layoutComponente', {}).get('lg', [])
-            components = []
-            for item in layout_items:
-                comp_name = item['i'].split('-')[-1].replace('-', '').capitalize()
-                components.append(
-                    f'<{comp_name} className="col-span-{item["w"]} row-span-{item["h"]}" />'
-                )
-            
-            # Replace placeholders
-            code = template.replace('{name}', component['name'].capitalize())
-            code = code.replace('{imports}', imports)
-            code = code.replace('{columns}', str(layout.get('columns', 12)))
-            code = code.replace('{gap}', str(layout.get('gap', 4)))
-            code = code.replace('{padding}', str(layout.get('padding', 4)))
-            code = code.replace('{margin}', str(layout.get('margin', 4)))
-            code = code.replace('{maxWidth}', layout.get('maxWidth', '1200px').replace('px', ''))
-            code = code.replace('{components}', '\n            '.join(components))
-            
-            return code
+            return render_cache.get_or_render(key, lambda: self.render_reusable(template, component))
         return None
 
-    def save_component(self, project_path, component):
+    def render_reusable(self, template, component):
+        """Render a reusable component from its layout and features."""
+        layout = component.get('layout', {})
+        features = component.get('features', {})
+        
+        # Generate imports
+        imports = ', '.join(
+            comp.replace('-', '').capitalize() 
+            for comp in features.get('reusableComponents', [])
+        )
+        
+        # Generate component instances
+        layout_items = component.get('layoutComponente', {}).get('lg', [])
+        components = []
+        for item in layout_items:
+            comp_name = item['i'].split('-')[-1].replace('-', '').capitalize()
+            components.append(
+                f'<{comp_name} className="col-span-{item["w"]} row-span-{item["h"]}" />'
+            )
+        
+        # Fill placeholders in a single pass
+        return template.render(
+            name=component['name'].capitalize(),
+            imports=imports,
+            columns=layout.get('columns', 12),
+            gap=layout.get('gap', 4),
+            padding=layout.get('padding', 4),
+            margin=layout.get('margin', 4),
+            maxWidth=layout.get('maxWidth', '1200px').replace('px', ''),
+            components='\n            '.join(components)
+        )
+
+    def save_component(self, project_path, component, output=None):
         """Save the component to a file."""
         components_dir = os.path.join(project_path, 'src', 'components', 'generated')
-        os.makedirs(components_dir, exist_ok=True)
         
         file_name = f"{component['name'].lower().replace(' ', '-')}.tsx"
         file_path = os.path.join(components_dir, file_name)
         
         code = self.generate_component_code(component)
         if code:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(code)
+            write_output(file_path, code, output)
             return file_path
         return None
 
-    def process_component_config(self, component):
+    def validate_component_type(self, component_type):
+        """Check the component type, defaulting to reusable."""
+        component_type = component_type or 'reusable'
+        if component_type != 'reusable':
+            raise ValueError(f"Unsupported component type: {component_type}")
+        return component_type
+
+    def validate_reusable_components(self, reusable_components):
+        """Keep the reusable components the generator knows how to import."""
+        valid = []
+        for name in reusable_components:
+            if name in self.reusable_components:
+                valid.append(name)
+            else:
+                print(f"Skipping unknown reusable component: {name}")
+        return valid
+
+    def process_component_layout(self, layout):
+        """Fill in missing layout settings from the component defaults."""
+        return {**self.component_defaults['layout'], **(layout or {})}
+
+    def process_layout_component(self, layout_componente):
+        """Normalize the grid items of a component."""
+        layout_componente = dict(layout_componente or {})
+        layout_componente.setdefault('lg', [])
+        return layout_componente
+
+    def process_component_config(self, component, project_path, output=None):
         """Process individual component configuration."""
         try:
             component_type = self.validate_component_type(component.get('componentType'))
@@ -116,10 +163,7 @@ export default {name};
                 }
             
             # Generate and save component
-            component_path = self.save_component(
-                'c:/Users/usuario/Downloads/project-bolt-sb1-rqbh4gta/project',
-                processed_component
-            )
+            component_path = self.save_component(project_path, processed_component, output)
             if component_path:
                 processed_component['component_path'] = component_path
             
@@ -128,24 +172,24 @@ export default {name};
             print(f"Error processing component: {str(e)}")
             return None
     
-    def process_components_config(self, config):
+    def process_components_config(self, config, project_path, output=None):
         """Process all components from the project configuration."""
         processed_components = []
         
         for page_data in config.get('pages', {}).values():
             for component in page_data.get('components', []):
-                processed_component = self.process_component_config(component)
+                processed_component = self.process_component_config(component, project_path, output)
                 if processed_component:
                     processed_components.append(processed_component)
         
         return processed_components
 
-def main(config_json):
+def main(config_json, project_path):
     """Main function to handle component processing."""
     try:
         config = json.loads(config_json) if isinstance(config_json, str) else config_json
         handler = ComponentHandler()
-        processed_components = handler.process_components_config(config)
+        processed_components = handler.process_components_config(config, project_path)
         return processed_components
     except Exception as e:
         print(f"Error processing component configuration: {str(e)}")
@@ -180,5 +224,5 @@ if __name__ == '__main__':
             }
         }
     }
-    result = main(example_config)
+    result = main(example_config, project_paths.frontend_dir('example'))
     print(json.dumps(result, indent=2))
\ No newline at end of file
@@ -1,9 +1,10 @@
 import json
 import os
+import project_paths
+from template_engine import templates
+from output_backend import write_output
 
-class ControllerGenerator:
-    def __init__(self):
-        self.template = '''
+templates.register('controllers.module', '''
 // Generated Types
 interface PaginationOptions {{
     page?: number;
@@ -76,9 +77,8 @@ class BaseController {{
 export {{
     {exports}
 }};
-'''
-
-        self.controller_template = '''
+''')
+templates.register('controllers.class', '''
 class {name} extends BaseController {{
     constructor() {{
         super({model_name}, {{ caching: {caching} }});
@@ -86,10 +86,8 @@ class {name} extends BaseController {{
 
     {actions}
 }}
-'''
-
-        self.action_templates = {{
-            'index': '''
+''')
+templates.register('controllers.action.index', '''
     async index(options: QueryOptions = {{}}): Promise<ServiceResponse<any[]>> {{
         try {{
             const query = this.model.find(options.filter || {{}});
@@ -105,8 +103,8 @@ class {name} extends BaseController {{
             return this.handleError(error);
         }}
     }}
-''',
-            'show': '''
+''')
+templates.register('controllers.action.show', '''
     async show(id: string): Promise<ServiceResponse<any>> {{
         try {{
             const data = await this.model.findById(id);
@@ -118,8 +116,8 @@ class {name} extends BaseController {{
             return this.handleError(error);
         }}
     }}
-''',
-            'create': '''
+''')
+templates.register('controllers.action.create', '''
     async create(data: any): Promise<ServiceResponse<any>> {{
         try {{
             const newItem = await this.model.create(data);
@@ -128,8 +126,8 @@ class {name} extends BaseController {{
             return this.handleError(error);
         }}
     }}
-''',
-            'update': '''
+''')
+templates.register('controllers.action.update', '''
     async update(id: string, data: any): Promise<ServiceResponse<any>> {{
         try {{
             const updated = await this.model.findByIdAndUpdate(
@@ -145,8 +143,8 @@ class {name} extends BaseController {{
             return this.handleError(error);
         }}
     }}
-''',
-            'delete': '''
+''')
+templates.register('controllers.action.delete', '''
     async delete(id: string): Promise<ServiceResponse<any>> {{
         try {{
             const deleted = await this.model.findByIdAndDelete(id);
@@ -158,8 +156,8 @@ class {name} extends BaseController {{
             return this.handleError(error);
         }}
     }}
-''',
-            'search': '''
+''')
+templates.register('controllers.action.search', '''
     async search(query: string): Promise<ServiceResponse<any[]>> {{
         try {{
             const data = await this.model.find({{
@@ -170,8 +168,8 @@ class {name} extends BaseController {{
             return this.handleError(error);
         }}
     }}
-''',
-            'export': '''
+''')
+templates.register('controllers.action.export', '''
     async export(): Promise<ServiceResponse<any[]>> {{
         try {{
             const data = await this.model.find({{}});
@@ -181,8 +179,8 @@ class {name} extends BaseController {{
             return this.handleError(error);
         }}
     }}
-''',
-            'login': '''
+''')
+templates.register('controllers.action.login', '''
     async login(credentials: {{ email: string; password: string }}): Promise<ServiceResponse<any>> {{
         try {{
             const user = await this.model.findOne({{ email: credentials.email }});
@@ -195,8 +193,8 @@ class {name} extends BaseController {{
             return this.handleError(error);
         }}
     }}
-''',
-            'logout': '''
+''')
+templates.register('controllers.action.logout', '''
     async logout(token: string): Promise<ServiceResponse<void>> {{
         try {{
             // Implement token invalidation logic
@@ -205,19 +203,21 @@ class {name} extends BaseController {{
             return this.handleError(error);
         }}
     }}
-'''
-        }}
+''')
+
+class ControllerGenerator:
+    supported_actions = ('index', 'show', 'create', 'update', 'delete', 'search', 'export', 'login', 'logout')
 
     def generate_controller(self, controller_config):
         """Generate a controller based on the configuration."""
         actions = []
         for action in controller_config['actions']:
-            if action in self.action_templates:
-                actions.append(self.action_templates[action])
+            if action in self.supported_actions:
+                actions.append(templates.get(f'controllers.action.{action}').render())
 
         model_name = controller_config['name'].replace('Controller', '')
         
-        controller = self.controller_template.format(
+        controller = templates.get('controllers.class').render(
             name=controller_config['name'],
             model_name=model_name,
             caching=str(controller_config['options'].get('caching', False)).lower(),
@@ -235,25 +235,23 @@ class {name} extends BaseController {{
             implementations.append(self.generate_controller(controller))
             exports.append(controller['name'])
         
-        code = self.template.format(
+        code = templates.get('controllers.module').render(
             controller_implementations='\n'.join(implementations),
             exports=', '.join(exports)
         )
         
         return code
 
-    def save_controllers(self, project_path, code):
+    def save_controllers(self, project_path, code, output=None):
         """Save the generated controllers."""
         controllers_dir = os.path.join(project_path, 'src', 'controllers')
-        os.makedirs(controllers_dir, exist_ok=True)
 
         file_path = os.path.join(controllers_dir, 'controllers.ts')
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(code)
+        write_output(file_path, code, output)
 
         return file_path
 
-def main(config_json):
+def main(config_json, project_path):
     """Main function to generate the controllers."""
     try:
         config = json.loads(config_json) if isinstance(config_json, str) else config_json
@@ -261,10 +259,7 @@ def main(config_json):
         code = generator.generate_controllers(config)
         
         # Save the controllers
-        file_path = generator.save_controllers(
-            'c:/Users/usuario/Downloads/project-bolt-sb1-rqbh4gta/project',
-            code
-        )
+        file_path = generator.save_controllers(project_path, code)
         
         return {
             'status': 'success',
@@ -293,5 +288,5 @@ if __name__ == '__main__':
         ]
     }
     
-    result = main(example_config)
+    result = main(example_config, project_paths.backend_dir('example'))
     print(json.dumps(result, indent=2))
\ No newline at end of file
@@ -1,9 +1,21 @@
 from pydantic import BaseModel
 from typing import List, Optional, Dict
 from datetime import datetime
+import hashlib
 import os
+import time
 import shutil
 import json  # Add this at the top of the file with other imports
+from command_runner import run_command
+import project_paths
+from skeleton_cache import SkeletonCache
+from project_registry import get_registry
+from project_lock import ProjectLock
+from io_executor import io_executor
+from staged_writes import publish_directory, replace_file, stage_directory
+
+# create-vite's react-ts template (the version the pinned frontend lockfile was made with)
+FRONTEND_TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates', 'vite-react-ts')
 
 class ProjectFeatures(BaseModel):
     components: bool
@@ -132,51 +144,75 @@ class ProjectCreate(ProjectBase):
 
 class Project(ProjectBase):
     id: int
+    frontend_path: Optional[str] = None
+    backend_path: Optional[str] = None
+    template_version: Optional[str] = None
+    config_hash: Optional[str] = None
+    generation_timings: Optional[Dict[str, float]] = None
     created_at: datetime
     updated_at: datetime
 
     class Config:
         from_attributes = True
 
+def make_directories(root, names):
+    for name in names:
+        os.makedirs(os.path.join(root, name), exist_ok=True)
+
+def copy_frontend_template(tree_dir):
+    shutil.copytree(FRONTEND_TEMPLATE_DIR, tree_dir)
+    # Stored as _gitignore so it does not apply to the template inside this repo
+    os.rename(os.path.join(tree_dir, '_gitignore'), os.path.join(tree_dir, '.gitignore'))
+
 class ProjectGenerator:
-    def __init__(self, project: ProjectCreate):
+    def __init__(self, project: ProjectCreate, progress=None):
         self.project = project
-        self.frontend_dir = f"generated_{project.name}_frontend"
-        self.backend_dir = f"generated_{project.name}_backend"
+        self.progress = progress or (lambda stage, status, **detail: None)
+        self.timings = {}
+        self.frontend_dir = project_paths.frontend_dir(project.name)
+        self.backend_dir = project_paths.backend_dir(project.name)
+        self.skeleton_cache = SkeletonCache()
 
-    def create_frontend_structure(self):
-        # Create Vite + React project
-        os.system(f'npm create vite@latest {self.frontend_dir} -- --template react-ts')
-        
-        # Navigate to frontend directory and install dependencies
-        os.chdir(self.frontend_dir)
-        os.system('npm install')
-        os.system('npm install react-router-dom @tanstack/react-query')
+    async def scaffold_frontend(self, tree_dir):
+        if self.skeleton_cache.installer.offline:
+            # npm create has to fetch create-vite; offline builds copy its committed output instead
+            await io_executor.run(copy_frontend_template, tree_dir)
+            return
+        # Create Vite + React project sources for the skeleton
+        await run_command(
+            ['npm', 'create', '--yes', *self.skeleton_cache.installer.npm_flags(),
+             'vite@latest', os.path.basename(tree_dir), '--', '--template', 'react-ts'],
+            cwd=os.path.dirname(tree_dir),
+            step='scaffold'
+        )
+
+    async def create_frontend_structure(self, tree_dir):
+        # Materialize Vite + React project with installed dependencies from the skeleton cache
+        await self.skeleton_cache.materialize(
+            'frontend',
+            self.frontend_package_json(),
+            tree_dir,
+            scaffold=self.scaffold_frontend,
+            progress=self.progress
+        )
         
         # Create additional directories in src
-        src_dir = 'src'
+        src_dir = os.path.join(tree_dir, 'src')
         directories = [
             "components", "pages", "layouts", "hooks", 
             "utils", "services", "assets", "types",
             "constants", "contexts", "styles", "tests"
         ]
-        for dir_name in directories:
-            os.makedirs(os.path.join(src_dir, dir_name), exist_ok=True)
-        
-        # Return to original directory
-        os.chdir('..')
+        await io_executor.run(make_directories, src_dir, directories)
 
-    def create_backend_structure(self):
-        # Create backend directory and initialize npm
-        os.makedirs(self.backend_dir, exist_ok=True)
-        os.chdir(self.backend_dir)
-        
-        # Initialize npm project
-        os.system('npm init -y')
-        
-        # Install dependencies
-        os.system('npm install express cors dotenv')
-        os.system('npm install --save-dev nodemon @types/express @types/node typescript')
+    async def create_backend_structure(self, tree_dir):
+        # Create backend directory with installed dependencies from the skeleton cache
+        await self.skeleton_cache.materialize(
+            'backend',
+            self.backend_package_json(),
+            tree_dir,
+            progress=self.progress
+        )
         
         # Create backend directories
         directories = [
@@ -189,12 +225,12 @@ class ProjectGenerator:
             "src/services",
             "tests"
         ]
-        for dir_name in directories:
-            os.makedirs(dir_name, exist_ok=True)
-        
+        await io_executor.run(make_directories, tree_dir, directories)
+        await io_executor.run(self.create_backend_entrypoint, tree_dir)
+
+    def create_backend_entrypoint(self, tree_dir):
         # Create basic Express server file
-        with open('src/index.js', 'w') as f:
-            f.write('''const express = require('express');
+        replace_file(os.path.join(tree_dir, 'src', 'index.js'), b'''const express = require('express');
 const cors = require('cors');
 const dotenv = require('dotenv');
 
@@ -210,40 +246,47 @@ app.listen(PORT, () => {
     console.log(`Server is running on port ${PORT}`);
 });
 ''')
-        
-        # Return to original directory
-        os.chdir('..')
 
-    def create_frontend_config(self):
-        package_json = {
+    def frontend_package_json(self):
+        # Dependency ranges match the pinned lockfiles in lockfiles/frontend
+        return {
             "name": f"{self.project.name}-frontend",
             "version": "0.1.0",
             "private": True,
+            "type": "module",
             "scripts": {
                 "dev": "vite",
-                "build": "tsc && vite build",
+                "build": "tsc -b && vite build",
+                "lint": "eslint .",
                 "preview": "vite preview"
             },
             "dependencies": {
-                "react": "^18.2.0",
-                "react-dom": "^18.2.0",
-                "react-router-dom": "^6.15.0",
-                "@tanstack/react-query": "^4.32.6"
+                "@tanstack/react-query": "^5.66.9",
+                "react": "^19.0.0",
+                "react-dom": "^19.0.0",
+                "react-router-dom": "^7.2.0"
             },
             "devDependencies": {
-                "@types/react": "^18.2.15",
-                "@types/react-dom": "^18.2.7",
-                "@vitejs/plugin-react": "^4.0.3",
-                "typescript": "^5.0.2",
-                "vite": "^4.4.5"
+                "@eslint/js": "^9.19.0",
+                "@types/react": "^19.0.8",
+                "@types/react-dom": "^19.0.3",
+                "@vitejs/plugin-react": "^4.3.4",
+                "eslint": "^9.19.0",
+                "eslint-plugin-react-hooks": "^5.0.0",
+                "eslint-plugin-react-refresh": "^0.4.18",
+                "globals": "^15.14.0",
+                "typescript": "~5.7.2",
+                "typescript-eslint": "^8.22.0",
+                "vite": "^6.1.0"
             }
         }
-        
-        with open(os.path.join(self.frontend_dir, "package.json"), "w") as f:
-            json.dump(package_json, f, indent=2)
 
-    def create_backend_config(self):
-        package_json = {
+    def create_frontend_config(self, tree_dir):
+        replace_file(os.path.join(tree_dir, "package.json"), json.dumps(self.frontend_package_json(), indent=2).encode())
+
+    def backend_package_json(self):
+        # Dependency ranges match the pinned lockfiles in lockfiles/backend
+        return {
             "name": f"{self.project.name}-backend",
             "version": "1.0.0",
             "main": "src/index.js",
@@ -252,69 +295,108 @@ app.listen(PORT, () => {
                 "dev": "nodemon src/index.js"
             },
             "dependencies": {
-                "express": "^4.18.2",
                 "cors": "^2.8.5",
-                "dotenv": "^16.3.1"
+                "dotenv": "^16.4.7",
+                "express": "^4.21.2"
             },
             "devDependencies": {
-                "nodemon": "^3.0.1",
-                "@types/express": "^4.17.17",
-                "@types/node": "^20.5.0",
-                "typescript": "^5.1.6"
+                "@types/express": "^5.0.0",
+                "@types/node": "^22.13.5",
+                "nodemon": "^3.1.9",
+                "typescript": "^5.7.3"
             }
         }
-        
-        with open(os.path.join(self.backend_dir, "package.json"), "w") as f:
-            json.dump(package_json, f, indent=2)
 
-    def generate_project(self):
-        # Generate frontend
-        self.create_frontend_structure()
-        self.create_frontend_config()
-        
-        # Generate backend
-        self.create_backend_structure()
-        self.create_backend_config()
-        
+    def create_backend_config(self, tree_dir):
+        replace_file(os.path.join(tree_dir, "package.json"), json.dumps(self.backend_package_json(), indent=2).encode())
+
+    def template_version(self):
+        frontend_version = self.skeleton_cache.template_version('frontend', self.frontend_package_json())
+        backend_version = self.skeleton_cache.template_version('backend', self.backend_package_json())
+        return f"{frontend_version}-{backend_version}"
+
+    async def generate_project(self):
+        # Runs against the same project name wait for each other
+        async with ProjectLock(self.project.name):
+            return await self._generate_project()
+
+    async def _generate_project(self):
+        # Both trees are built in staging copies and swapped in once complete,
+        # so a run that fails or crashes midway leaves the previous project intact
+        frontend_tree = await io_executor.run(stage_directory, self.frontend_dir)
+        backend_tree = None
+        try:
+            backend_tree = await io_executor.run(stage_directory, self.backend_dir)
+
+            # Generate frontend and backend trees
+            started = time.perf_counter()
+            self.progress('scaffold', 'running')
+            await self.create_frontend_structure(frontend_tree)
+            await self.create_backend_structure(backend_tree)
+            self.progress('scaffold', 'done')
+            self.timings['scaffold'] = time.perf_counter() - started
+
+            # Write project package.json files
+            started = time.perf_counter()
+            self.progress('configs', 'running')
+            await io_executor.run(self.create_frontend_config, frontend_tree)
+            await io_executor.run(self.create_backend_config, backend_tree)
+            await io_executor.run(publish_directory, frontend_tree, self.frontend_dir)
+            await io_executor.run(publish_directory, backend_tree, self.backend_dir)
+            self.progress('configs', 'done')
+            self.timings['configs'] = time.perf_counter() - started
+        finally:
+            for tree_dir in (frontend_tree, backend_tree):
+                if tree_dir is not None:
+                    await io_executor.run(shutil.rmtree, tree_dir, ignore_errors=True)
+
         return {
             "message": f"Project {self.project.name} generated successfully",
             "frontend_dir": self.frontend_dir,
             "backend_dir": self.backend_dir
         }
 
+def project_config_hash(project: ProjectBase) -> str:
+    """Stable hash of a project's configuration, independent of key order."""
+    canonical = json.dumps(project.model_dump(), sort_keys=True)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
 class ProjectService:
     @staticmethod
-    async def create_project(project: ProjectCreate) -> Project:
+    async def create_project(project: ProjectCreate, progress=None) -> Project:
         # Generate project files
-        generator = ProjectGenerator(project)
-        generator.generate_project()
-
-        # Create project record
-        return Project(
-            id=1,
-            name=project.name,
-            description=project.description,
-            framework=project.framework,
-            language=project.language,
-            backend_type=project.backend_type,
-            layout_type=project.layout_type,
-            structure=project.structure,
-            created_at=datetime.now(),
-            updated_at=datetime.now()
-        )
+        generator = ProjectGenerator(project, progress)
+        await generator.generate_project()
+
+        # Create or refresh the project record
+        record = await io_executor.run(get_registry().upsert, {
+            **project.model_dump(),
+            "frontend_path": generator.frontend_dir,
+            "backend_path": generator.backend_dir,
+            "template_version": generator.template_version(),
+            "config_hash": project_config_hash(project),
+            "generation_timings": generator.timings
+        })
+        return Project.model_validate(record)
 
     @staticmethod
     async def get_project(project_id: int) -> Optional[Project]:
-        return None
+        record = await io_executor.run(get_registry().get, project_id)
+        return Project.model_validate(record) if record else None
 
     @staticmethod
-    async def list_projects() -> List[Project]:
-        return []
+    async def list_projects(skip: int = 0, limit: int = 100) -> List[Project]:
+        records = await io_executor.run(get_registry().list, skip, limit)
+        return [Project.model_validate(record) for record in records]
 
     @staticmethod
     async def update_project(project_id: int, project_data: ProjectBase) -> Optional[Project]:
-        return None
+        record = await io_executor.run(get_registry().update, project_id, {
+            **project_data.model_dump(),
+            "config_hash": project_config_hash(project_data)
+        })
+        return Project.model_validate(record) if record else None
 
     @staticmethod
     async def delete_project(project_id: int) -> bool:
-        return True
\ No newline at end of file
+        return await io_executor.run(get_registry().delete, project_id)
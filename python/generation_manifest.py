@@ -0,0 +1,106 @@
+import hashlib
+import json
+import os
+
+from staged_writes import StagedTree
+
+MANIFEST_NAME = '.generator-manifest.json'
+
+
+class GenerationManifest:
+    """Record of the files one producer (styles, structure, ...) generated in a project.
+
+    The manifest maps each output path, relative to the project root, to the
+    hash of its content and of the config that produced it. write() stages
+    only files whose content changed; finish() applies them together with the
+    removal of files an earlier run of the same producer generated that this
+    run did not, as one atomic StagedTree commit. Callers hold the project's
+    ProjectLock from construction to finish().
+    """
+
+    def __init__(self, root, producer, config_hash=None):
+        self.root = os.path.abspath(root)
+        self.producer = producer
+        self.config_hash = config_hash
+        self.path = os.path.join(self.root, MANIFEST_NAME)
+        self.entries = self._load()
+        self.produced = set()
+        self.staged = StagedTree(self.root)
+        self.counts = {'written': 0, 'unchanged': 0, 'removed': 0, 'bytes': 0}
+
+    def _load(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f).get('files', {})
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def write(self, path, content, config_hash=None):
+        """Write content to path unless it is unchanged; return the path."""
+        path = os.path.abspath(path)
+        rel = os.path.relpath(path, self.root)
+        data = content.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+
+        entry = self.entries.get(rel)
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            st = None
+
+        if entry and st is not None and entry.get('size') == st.st_size and entry.get('mtime_ns') == st.st_mtime_ns:
+            unchanged = entry['sha256'] == digest
+        else:
+            unchanged = st is not None and st.st_size == len(data) and _file_digest(path) == digest
+
+        if unchanged:
+            self.counts['unchanged'] += 1
+        else:
+            self.counts['written'] += 1
+            self.counts['bytes'] += len(data)
+            self.staged.write(rel, data)
+
+        self.entries[rel] = {
+            'producer': self.producer,
+            'sha256': digest,
+            'config': config_hash or self.config_hash,
+            'size': st.st_size if unchanged else None,
+            'mtime_ns': st.st_mtime_ns if unchanged else None,
+        }
+        self.produced.add(rel)
+        return path
+
+    def finish(self):
+        """Remove this producer's orphaned files, save the manifest and return the counts."""
+        for rel, entry in list(self.entries.items()):
+            if entry['producer'] != self.producer or rel in self.produced:
+                continue
+            path = os.path.join(self.root, rel)
+            if os.path.exists(path) and _file_digest(path) == entry['sha256']:
+                # Only delete what we generated; a file edited by hand is left alone
+                self.staged.remove(rel)
+                self.counts['removed'] += 1
+            del self.entries[rel]
+
+        for rel in self.staged.commit():
+            st = os.stat(os.path.join(self.root, rel))
+            self.entries[rel].update(size=st.st_size, mtime_ns=st.st_mtime_ns)
+
+        # Keep entries of other producers saved since we loaded, replace our own
+        self.entries = {
+            **{rel: entry for rel, entry in self._load().items() if entry['producer'] != self.producer},
+            **{rel: entry for rel, entry in self.entries.items() if entry['producer'] == self.producer},
+        }
+        tmp_path = f'{self.path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'files': self.entries}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+        return dict(self.counts)
+
+
+def _file_digest(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(64 * 1024), b''):
+            h.update(chunk)
+    return h.hexdigest()
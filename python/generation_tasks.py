@@ -0,0 +1,261 @@
+import time
+
+from style_generator import generate_css_variables, save_css_file
+import project_paths
+from login_generator import LoginGenerator
+from component_handler import ComponentHandler
+from page_handler import PageHandler
+from sidebar_generator import SidebarGenerator
+from routes_generator import RouteGenerator
+from controller_generator import ControllerGenerator
+from output_backend import DiskOutput, MemoryOutput
+from project_lock import ProjectLock
+from render_cache import config_key
+
+# Generation work run inside worker processes. Every task takes and returns
+# plain JSON-like data so it pickles across the process boundary; request
+# validation stays in the API process.
+
+
+def _timed(timings, step, func, *args):
+    """Run func(*args), recording its duration in seconds as timings[step] when timings is given."""
+    if timings is None:
+        return func(*args)
+    started = time.perf_counter()
+    try:
+        return func(*args)
+    finally:
+        timings[step] = time.perf_counter() - started
+
+
+def _split_style_config(style_config):
+    style_dict = dict(style_config)
+    project_name = style_dict.pop('projectName')
+    return project_name, style_dict
+
+
+def generate_styles(style_config, output):
+    """Generate the CSS variables file into output, returning its path."""
+    # Extract project name from the request
+    project_name, style_dict = _split_style_config(style_config)
+
+    # Generate CSS content with project name
+    css_content = generate_css_variables(style_dict, project_name)
+
+    # Save the CSS file into the project's frontend
+    return save_css_file(css_content, project_name, output)
+
+
+def write_styles(style_config):
+    """Generate and save the CSS variables file, returning its path, write counts and step timings."""
+    project_name, style_dict = _split_style_config(style_config)
+    with ProjectLock(project_name):
+        output = DiskOutput(project_paths.frontend_dir(project_name), 'styles', config_key(style_dict))
+        timings = {}
+        css_path = _timed(timings, 'css', generate_styles, style_config, output)
+        return {"css_path": css_path, "files": output.finish(), "timings": timings}
+
+
+def write_structure(structure_config):
+    """Generate and save login, component and page files for the project structure."""
+    project_name = structure_config['projectName']
+    with ProjectLock(project_name):
+        output = DiskOutput(project_paths.frontend_dir(project_name), 'structure', config_key(structure_config))
+        timings = {}
+        structure = generate_structure(structure_config, output, timings)
+        structure["files"] = output.finish()
+        structure["timings"] = timings
+        return structure
+
+
+def preview(style_config=None, structure_config=None):
+    """Generate styles and/or structure into memory and return the file contents.
+
+    Nothing touches the disk. The result holds one tree per producer together
+    with the config hash, so commit_preview() can write it later as is.
+    """
+    trees = {}
+    if style_config:
+        project_name, style_dict = _split_style_config(style_config)
+        output = MemoryOutput(project_paths.frontend_dir(project_name))
+        generate_styles(style_config, output)
+        trees['styles'] = {"config_hash": config_key(style_dict), "files": output.files}
+    if structure_config:
+        output = MemoryOutput(project_paths.frontend_dir(structure_config['projectName']))
+        generate_structure(structure_config, output)
+        trees['structure'] = {"config_hash": config_key(structure_config), "files": output.files}
+    return trees
+
+
+def commit_preview(project_name, trees):
+    """Write previewed trees into the project's frontend, returning write counts per producer."""
+    return commit_trees(project_name, 'frontend', trees)
+
+
+def generate_structure(structure_config, output, timings=None):
+    """Generate login, component and page files for the project structure into output.
+
+    When given, timings receives the seconds each step took, keyed like the pipeline nodes.
+    """
+    project_name = structure_config['projectName']
+    _timed(timings, 'login', generate_login, structure_config, output)
+    processed_components = _timed(timings, 'components', generate_components, structure_config, output)
+    processed_pages = _timed(timings, 'pages', generate_pages, structure_config, processed_components, output)
+
+    return {
+        "name": project_name,
+        "frontend_path": project_paths.frontend_dir(project_name),
+        "components": processed_components,
+        "pages": processed_pages
+    }
+
+
+def generate_login(structure_config, output):
+    """Generate the login component if enabled, returning its path."""
+    if not structure_config['loginConfig']["enabled"]:
+        return None
+    login_generator = LoginGenerator()
+    login_path = login_generator.generate_login_component(
+        structure_config['loginConfig'],
+        project_paths.frontend_dir(structure_config['projectName']),
+        output
+    )
+    print(f"Login component generated at: {login_path}")
+    return login_path
+
+
+def generate_sidebar(structure_config, output):
+    """Generate the sidebar component if it is enabled and has tabs, returning its path."""
+    sidebar_config = structure_config.get('sidebarConfig') or {}
+    if not sidebar_config.get('enabled', True) or not sidebar_config.get('tabs'):
+        return None
+    sidebar_generator = SidebarGenerator()
+    code = sidebar_generator.generate_sidebar_component(sidebar_config)
+    return sidebar_generator.save_component(
+        project_paths.frontend_dir(structure_config['projectName']), code, output
+    )
+
+
+def generate_components(structure_config, output):
+    """Generate the layout components, returning their processed configs."""
+    component_handler = ComponentHandler()
+    components_config = {
+        "pages": {
+            "main": {
+                "components": [
+                    # Add your component configurations here based on the layout type
+                    {
+                        "id": "main-layout",
+                        "name": structure_config['layoutType'],
+                        "componentType": "reusable",
+                        "features": {
+                            "reusableComponents": ["navbar", "sidebar", "content"]
+                        },
+                        "layoutComponente": {
+                            "lg": [
+                                # Layout configuration will be based on the selected layout type
+                            ]
+                        }
+                    }
+                ]
+            }
+        }
+    }
+    return component_handler.process_components_config(
+        components_config, project_paths.frontend_dir(structure_config['projectName']), output
+    )
+
+
+def generate_pages(structure_config, processed_components, output):
+    """Generate the pages that lay out the processed components."""
+    page_handler = PageHandler()
+    pages_config = {
+        "pages": {
+            "main": {
+                "name": "Main Layout",
+                "path": "/",
+                "layout": {
+                    "type": "single",
+                    "columns": 12,
+                    "gap": "4"
+                },
+                "components": processed_components
+            }
+        }
+    }
+    return page_handler.process_pages_config(
+        pages_config, project_paths.frontend_dir(structure_config['projectName']), output
+    )
+
+
+def _backend_routes(backend_config):
+    return RouteGenerator().generate_routes({"routes": backend_config.get('routes', [])})
+
+
+def _model_controller_names(backend_config, controller_names):
+    # Models named on the backend page get a model file like the routed controllers' models
+    names = set(controller_names)
+    names.update(f"{model['name']}Controller" for model in backend_config.get('models', []))
+    return sorted(names)
+
+
+def generate_routes(project_name, backend_config, output):
+    """Generate the express router and its middleware, returning the routes file path."""
+    routes_code, _ = _backend_routes(backend_config)
+    return RouteGenerator().save_routes(project_paths.backend_dir(project_name), routes_code, output)
+
+
+def generate_controllers(project_name, backend_config, output):
+    """Generate the routed controllers and, when configured, the typed controller classes."""
+    backend_dir = project_paths.backend_dir(project_name)
+    _, controller_names = _backend_routes(backend_config)
+    RouteGenerator().save_controllers(backend_dir, controller_names, output)
+    if backend_config.get('controllers'):
+        controller_generator = ControllerGenerator()
+        code = controller_generator.generate_controllers({"controllers": backend_config['controllers']})
+        controller_generator.save_controllers(backend_dir, code, output)
+    return controller_names
+
+
+def generate_models(project_name, backend_config, output):
+    """Generate a model for every routed controller and every configured model."""
+    _, controller_names = _backend_routes(backend_config)
+    names = _model_controller_names(backend_config, controller_names)
+    RouteGenerator().save_models(project_paths.backend_dir(project_name), names, output)
+    return names
+
+
+# Steps of the /generate-all pipeline, each taking its inputs and an output backend
+PIPELINE_STEPS = {
+    'css': generate_styles,
+    'login': generate_login,
+    'sidebar': generate_sidebar,
+    'components': generate_components,
+    'pages': generate_pages,
+    'routes': generate_routes,
+    'controllers': generate_controllers,
+    'models': generate_models,
+}
+BACKEND_STEPS = {'routes', 'controllers', 'models'}
+
+
+def render_step(step, project_name, *args):
+    """Run one pipeline step into memory, returning its result and the files it produced."""
+    if step in BACKEND_STEPS:
+        root = project_paths.backend_dir(project_name)
+        args = (project_name,) + args
+    else:
+        root = project_paths.frontend_dir(project_name)
+    output = MemoryOutput(root)
+    result = PIPELINE_STEPS[step](*args, output)
+    return {"result": result, "files": output.files}
+
+
+def commit_trees(project_name, side, trees):
+    """Write rendered trees into the project's frontend or backend, returning write counts per producer."""
+    root = project_paths.backend_dir(project_name) if side == 'backend' else project_paths.frontend_dir(project_name)
+    with ProjectLock(project_name):
+        return {
+            producer: DiskOutput(root, producer, tree["config_hash"]).commit(tree["files"])
+            for producer, tree in trees.items()
+        }
@@ -0,0 +1,106 @@
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class IOExecutor:
+    """Bounded thread pool for the blocking file I/O issued from async code.
+
+    Directory creation, file writes, tree copies and registry queries run here
+    instead of on the event loop, so a heavy generation cannot stall cheap
+    requests such as /list-projects. At most max_workers calls run at once;
+    the rest wait in the queue, and the pool tracks queue depth and queue wait
+    time separately from run time.
+    """
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or int(os.environ.get('IO_THREADS', min(32, (os.cpu_count() or 1) + 4)))
+        self.queued = 0
+        self.running = 0
+        self.stats = {
+            'completed': 0,
+            'failed': 0,
+            'queue_depth_max': 0,
+            'queue_wait_total': 0.0,
+            'queue_wait_max': 0.0,
+            'execution_total': 0.0,
+            'execution_max': 0.0,
+        }
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='io')
+        return self._executor
+
+    def _call(self, submitted_at, started, func):
+        started_at = time.perf_counter()
+        with self._lock:
+            if not started.is_set():
+                started.set()
+                self.queued -= 1
+            self.running += 1
+        try:
+            return func()
+        finally:
+            finished_at = time.perf_counter()
+            with self._lock:
+                self.running -= 1
+                self._record(started_at - submitted_at, finished_at - started_at)
+
+    async def run(self, func, *args, **kwargs):
+        """Run func(*args, **kwargs) in an I/O thread and return its result."""
+        loop = asyncio.get_running_loop()
+        # Like asyncio.to_thread, keep context variables visible to func
+        call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+        with self._lock:
+            self.queued += 1
+            self.stats['queue_depth_max'] = max(self.stats['queue_depth_max'], self.queued)
+        started = threading.Event()
+        try:
+            return await loop.run_in_executor(self._get_executor(), self._call, time.perf_counter(), started, call)
+        except Exception:
+            with self._lock:
+                self.stats['failed'] += 1
+            raise
+        finally:
+            with self._lock:
+                if not started.is_set():
+                    # Cancelled while still queued
+                    started.set()
+                    self.queued -= 1
+
+    def _record(self, queue_wait, execution):
+        stats = self.stats
+        stats['completed'] += 1
+        stats['queue_wait_total'] += queue_wait
+        stats['queue_wait_max'] = max(stats['queue_wait_max'], queue_wait)
+        stats['execution_total'] += execution
+        stats['execution_max'] = max(stats['execution_max'], execution)
+
+    def metrics(self):
+        with self._lock:
+            stats = dict(self.stats)
+            queued, running = self.queued, self.running
+        completed = stats['completed'] or 1
+        return {
+            'max_workers': self.max_workers,
+            'queue_depth': queued,
+            'running': running,
+            **stats,
+            'queue_wait_avg': stats['queue_wait_total'] / completed,
+            'execution_avg': stats['execution_total'] / completed,
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+io_executor = IOExecutor()
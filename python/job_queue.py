@@ -0,0 +1,225 @@
+import asyncio
+import json
+import os
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+
+import metrics
+from command_runner import CommandTimeout
+from request_coalescer import check_fingerprint
+
+TERMINAL_STATUSES = ('succeeded', 'failed', 'cancelled')
+
+
+class QueueFull(Exception):
+    pass
+
+
+class Job:
+    """A queued generation with per-stage progress that listeners can follow."""
+
+    def __init__(self, kind, stages):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = 'queued'
+        self.stages = OrderedDict((stage, {'status': 'pending'}) for stage in stages)
+        self.result = None
+        self.error = None
+        # 'timeout' when a generation command ran past its step timeout, else 'error'
+        self.error_type = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.events = []
+        self.task = None
+        # Blocking (?wait=true) requests attached to this job
+        self.waiters = 0
+        self._listeners = set()
+        # (stage, kind) -> start time; the install stage runs once per kind
+        self._started = {}
+
+    def report(self, stage, status, **detail):
+        """Record progress for a stage and notify SSE listeners."""
+        now = time.time()
+        entry = self.stages.setdefault(stage, {'status': 'pending'})
+        timer = (stage, detail.get('kind'))
+        if status == 'running':
+            entry.setdefault('started_at', now)
+            self._started.setdefault(timer, now)
+        if status in ('done', 'cached', 'failed'):
+            entry['finished_at'] = now
+        if status in ('done', 'cached', 'failed', 'skipped'):
+            started = self._started.get(timer)
+            metrics.observe_stage(
+                f"{stage}_{detail['kind']}" if 'kind' in detail else stage,
+                status,
+                now - started if started is not None else None
+            )
+        entry['status'] = status
+        self._publish('stage', {'stage': stage, 'status': status, **detail})
+
+    def set_status(self, status):
+        self.status = status
+        if status == 'running':
+            self.started_at = time.time()
+        elif status in TERMINAL_STATUSES:
+            self.finished_at = time.time()
+        self._publish('status', {'status': status, 'error': self.error, 'error_type': self.error_type})
+
+    def _publish(self, event, data):
+        message = {'event': event, 'data': dict(data, job_id=self.id, time=time.time())}
+        self.events.append(message)
+        for listener in self._listeners:
+            listener.put_nowait(message)
+
+    async def follow(self):
+        """Yield past and future events until the job reaches a terminal status."""
+        listener = asyncio.Queue()
+        self._listeners.add(listener)
+        try:
+            for message in list(self.events):
+                yield message
+            while self.status not in TERMINAL_STATUSES:
+                yield await listener.get()
+            while not listener.empty():
+                yield listener.get_nowait()
+        finally:
+            self._listeners.discard(listener)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'stages': self.stages,
+            'result': self.result,
+            'error': self.error,
+            'error_type': self.error_type,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+        }
+
+
+class JobQueue:
+    """Bounded background queue for long generations.
+
+    At most max_concurrent jobs run at once; submit() raises QueueFull once
+    max_pending jobs are waiting so a burst cannot pile up unbounded work.
+    Jobs submitted with an idempotency key are shared: a duplicate submit
+    attaches to the running job. Only a client Idempotency-Key (submitted
+    with the body's fingerprint) also gets a job that succeeded less than
+    idempotency_ttl seconds ago back; an identical body runs again once the
+    first job finished, as the project may have been changed or deleted.
+    """
+
+    def __init__(self, max_concurrent=None, max_pending=None, retention=500, idempotency_ttl=None):
+        self.max_concurrent = max_concurrent or int(os.environ.get('GENERATION_CONCURRENCY', 2))
+        self.max_pending = max_pending or int(os.environ.get('GENERATION_MAX_PENDING', 32))
+        self.retention = retention
+        self.idempotency_ttl = idempotency_ttl or float(os.environ.get('IDEMPOTENCY_TTL', 300))
+        self.jobs = OrderedDict()
+        self.keys = {}
+        self.stats = {'submitted': 0, 'coalesced': 0, 'replayed': 0}
+        self._semaphore = None
+
+    def pending_count(self):
+        return sum(1 for job in self.jobs.values() if job.status == 'queued')
+
+    def submit(self, kind, run, stages=(), key=None, fingerprint=None):
+        """Enqueue run(job), an async callable, and return the Job immediately.
+
+        With a key, an identical job that is still running (or, for a key
+        with a fingerprint, recently succeeded) is returned instead of
+        starting a new one. Raises IdempotencyMismatch when the key was
+        submitted with a different fingerprint.
+        """
+        if key is not None:
+            job = self._find(key, fingerprint)
+            if job is not None:
+                return job
+        if self.pending_count() >= self.max_pending:
+            raise QueueFull(f"{self.max_pending} generation jobs already waiting")
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+
+        job = Job(kind, stages)
+        self.jobs[job.id] = job
+        job.task = asyncio.ensure_future(self._run(job, run))
+        self.stats['submitted'] += 1
+        if key is not None:
+            self.keys[key] = (job.id, fingerprint)
+        self._evict()
+        return job
+
+    def _find(self, key, fingerprint):
+        job_id, job_fingerprint = self.keys.get(key, (None, None))
+        job = self.jobs.get(job_id)
+        if job is None:
+            return None
+        if job.status not in TERMINAL_STATUSES:
+            check_fingerprint(job_fingerprint, fingerprint)
+            self.stats['coalesced'] += 1
+            return job
+        if (job_fingerprint is not None and job.status == 'succeeded'
+                and time.time() - job.finished_at < self.idempotency_ttl):
+            check_fingerprint(job_fingerprint, fingerprint)
+            self.stats['replayed'] += 1
+            return job
+        # Finished body-keyed job, failed, cancelled or stale: run it again
+        return None
+
+    def get(self, job_id):
+        return self.jobs.get(job_id)
+
+    def cancel(self, job_id):
+        job = self.jobs.get(job_id)
+        if job is None or job.status in TERMINAL_STATUSES:
+            return False
+        job.task.cancel()
+        return True
+
+    async def _run(self, job, run):
+        try:
+            async with self._semaphore:
+                job.set_status('running')
+                job.result = await run(job)
+            job.set_status('succeeded')
+        except asyncio.CancelledError:
+            job.set_status('cancelled')
+        except Exception as e:
+            job.error = str(e)
+            job.error_type = 'timeout' if timed_out(e) else 'error'
+            print(f"Job {job.id} failed: {traceback.format_exc()}")
+            for stage, entry in job.stages.items():
+                if entry['status'] == 'running':
+                    job.report(stage, 'failed')
+            job.set_status('failed')
+
+    def _evict(self):
+        """Drop the oldest finished jobs beyond the retention cap."""
+        finished = [job_id for job_id, job in self.jobs.items() if job.status in TERMINAL_STATUSES]
+        for job_id in finished[:max(0, len(self.jobs) - self.retention)]:
+            del self.jobs[job_id]
+        for key in [key for key, (job_id, _) in self.keys.items() if job_id not in self.jobs]:
+            del self.keys[key]
+
+    def metrics(self):
+        return {
+            'running': sum(1 for job in self.jobs.values() if job.status == 'running'),
+            'pending': self.pending_count(),
+            'idempotency_ttl': self.idempotency_ttl,
+            **self.stats,
+        }
+
+
+def timed_out(error):
+    """Whether error is, or is a pipeline failure caused by, a command step timeout."""
+    causes = [error] + list(getattr(error, 'errors', {}).values())
+    return any(isinstance(cause, CommandTimeout) for cause in causes)
+
+
+def sse_format(message):
+    return f"event: {message['event']}\ndata: {json.dumps(message['data'])}\n\n"
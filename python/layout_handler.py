@@ -1,117 +1,118 @@
 import json
 import os
+from template_engine import templates
+from output_backend import write_output
 
-class LayoutHandler:
-    def __init__(self):
-        self.layout_templates = {
-            'Landing Page Plus (Hero + Features + Testimonials)': {
-                'sections': [
-                    {
-                        'name': 'hero',
-                        'type': 'hero',
-                        'defaultHeight': 600,
-                        'components': ['heading', 'subheading', 'cta-button']
-                    },
-                    {
-                        'name': 'features',
-                        'type': 'features',
-                        'defaultColumns': 3,
-                        'components': ['feature-card']
-                    },
-                    {
-                        'name': 'testimonials',
-                        'type': 'testimonials',
-                        'defaultColumns': 2,
-                        'components': ['testimonial-card']
-                    }
-                ]
-            },
-            'Dashboard Layout': {
-                'sections': [
-                    {
-                        'name': 'sidebar',
-                        'type': 'navigation',
-                        'defaultWidth': 250,
-                        'components': ['nav-menu', 'user-profile']
-                    },
-                    {
-                        'name': 'main',
-                        'type': 'content',
-                        'defaultColumns': 12,
-                        'components': ['data-grid', 'charts', 'stats-cards']
-                    }
-                ]
-            },
-            'Admin Panel': {
-                'sections': [
-                    {
-                        'name': 'header',
-                        'type': 'header',
-                        'defaultHeight': 64,
-                        'components': ['logo', 'nav-menu', 'user-menu']
-                    },
-                    {
-                        'name': 'sidebar',
-                        'type': 'navigation',
-                        'defaultWidth': 240,
-                        'components': ['nav-tree', 'quick-actions']
-                    },
-                    {
-                        'name': 'content',
-                        'type': 'main',
-                        'defaultColumns': 12,
-                        'components': ['data-table', 'forms', 'cards']
-                    }
-                ]
-            },
-            'E-commerce Layout': {
-                'sections': [
-                    {
-                        'name': 'header',
-                        'type': 'header',
-                        'defaultHeight': 80,
-                        'components': ['logo', 'search-bar', 'cart', 'user-menu']
-                    },
-                    {
-                        'name': 'categories',
-                        'type': 'navigation',
-                        'defaultHeight': 50,
-                        'components': ['category-menu']
-                    },
-                    {
-                        'name': 'products',
-                        'type': 'grid',
-                        'defaultColumns': 4,
-                        'components': ['product-card']
-                    }
-                ]
-            },
-            'Blog Layout': {
-                'sections': [
-                    {
-                        'name': 'header',
-                        'type': 'header',
-                        'defaultHeight': 60,
-                        'components': ['logo', 'nav-menu']
-                    },
-                    {
-                        'name': 'content',
-                        'type': 'main',
-                        'defaultColumns': 2,
-                        'components': ['blog-post', 'sidebar-widgets']
-                    },
-                    {
-                        'name': 'footer',
-                        'type': 'footer',
-                        'defaultHeight': 200,
-                        'components': ['footer-widgets', 'social-links']
-                    }
-                ]
-            }
+def _layout_sections():
+    return {
+        'Landing Page Plus (Hero + Features + Testimonials)': {
+            'sections': [
+                {
+                    'name': 'hero',
+                    'type': 'hero',
+                    'defaultHeight': 600,
+                    'components': ['heading', 'subheading', 'cta-button']
+                },
+                {
+                    'name': 'features',
+                    'type': 'features',
+                    'defaultColumns': 3,
+                    'components': ['feature-card']
+                },
+                {
+                    'name': 'testimonials',
+                    'type': 'testimonials',
+                    'defaultColumns': 2,
+                    'components': ['testimonial-card']
+                }
+            ]
+        },
+        'Dashboard Layout': {
+            'sections': [
+                {
+                    'name': 'sidebar',
+                    'type': 'navigation',
+                    'defaultWidth': 250,
+                    'components': ['nav-menu', 'user-profile']
+                },
+                {
+                    'name': 'main',
+                    'type': 'content',
+                    'defaultColumns': 12,
+                    'components': ['data-grid', 'charts', 'stats-cards']
+                }
+            ]
+        },
+        'Admin Panel': {
+            'sections': [
+                {
+                    'name': 'header',
+                    'type': 'header',
+                    'defaultHeight': 64,
+                    'components': ['logo', 'nav-menu', 'user-menu']
+                },
+                {
+                    'name': 'sidebar',
+                    'type': 'navigation',
+                    'defaultWidth': 240,
+                    'components': ['nav-tree', 'quick-actions']
+                },
+                {
+                    'name': 'content',
+                    'type': 'main',
+                    'defaultColumns': 12,
+                    'components': ['data-table', 'forms', 'cards']
+                }
+            ]
+        },
+        'E-commerce Layout': {
+            'sections': [
+                {
+                    'name': 'header',
+                    'type': 'header',
+                    'defaultHeight': 80,
+                    'components': ['logo', 'search-bar', 'cart', 'user-menu']
+                },
+                {
+                    'name': 'categories',
+                    'type': 'navigation',
+                    'defaultHeight': 50,
+                    'components': ['category-menu']
+                },
+                {
+                    'name': 'products',
+                    'type': 'grid',
+                    'defaultColumns': 4,
+                    'components': ['product-card']
+                }
+            ]
+        },
+        'Blog Layout': {
+            'sections': [
+                {
+                    'name': 'header',
+                    'type': 'header',
+                    'defaultHeight': 60,
+                    'components': ['logo', 'nav-menu']
+                },
+                {
+                    'name': 'content',
+                    'type': 'main',
+                    'defaultColumns': 2,
+                    'components': ['blog-post', 'sidebar-widgets']
+                },
+                {
+                    'name': 'footer',
+                    'type': 'footer',
+                    'defaultHeight': 200,
+                    'components': ['footer-widgets', 'social-links']
+                }
+            ]
         }
-        
-        self.react_templates = {
-            'Landing Page Plus (Hero + Features + Testimonials)': '''
+    }
+
+templates.register_catalog('layout.sections', _layout_sections)
+templates.register('layout.landing', '''
 import React from 'react';
 
 const {name} = () => {
@@ -137,8 +138,8 @@ const {name} = () => {
 };
 
 export default {name};
-''',
-            'Dashboard Layout': '''
+''')
+templates.register('layout.dashboard', '''
 import React from 'react';
 
 const {name} = () => {
@@ -158,34 +159,41 @@ const {name} = () => {
 };
 
 export default {name};
-''',
-            # Add more React templates for other layouts...
-        }
+''')
+
+class LayoutHandler:
+    react_templates = {
+        'Landing Page Plus (Hero + Features + Testimonials)': 'layout.landing',
+        'Dashboard Layout': 'layout.dashboard',
+        # Add more React templates for other layouts...
+    }
+
+    def __init__(self):
+        self.layout_templates = templates.catalog('layout.sections')
 
     def generate_react_code(self, page_name, layout_type):
         """Generate React component code for the specified layout type."""
-        template = self.react_templates.get(layout_type)
-        if not template:
+        template_name = self.react_templates.get(layout_type)
+        if not template_name:
             raise ValueError(f"React template for layout type '{layout_type}' not found")
+        template = templates.get(template_name)
         
-        # Replace placeholders
+        # Fill placeholders
         component_name = ''.join(word.capitalize() for word in page_name.split())
-        return template.replace('{name}', component_name)
+        return template.render(name=component_name)
 
-    def save_react_component(self, project_path, page_name, code):
+    def save_react_component(self, project_path, page_name, code, output=None):
         """Save the React component to a file."""
         components_dir = os.path.join(project_path, 'src', 'pages')
-        os.makedirs(components_dir, exist_ok=True)
         
         file_name = f"{page_name}.tsx"
         file_path = os.path.join(components_dir, file_name)
         
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(code)
+        write_output(file_path, code, output)
         
         return file_path
 
-    def process_layout_config(self, config):
+    def generate_layout_components(self, config, project_path, output=None):
         """Process the layout configuration and generate React components."""
         layout_type = config.get('layoutType')
         if not layout_type:
@@ -200,11 +208,7 @@ export default {name};
             react_code = self.generate_react_code(page_data.get('name', page_id), layout_type)
             
             # Save the component
-            component_path = self.save_react_component(
-                'c:/Users/usuario/Downloads/project-bolt-sb1-rqbh4gta/project',
-                page_id,
-                react_code
-            )
+            component_path = self.save_react_component(project_path, page_id, react_code, output)
             
             processed_layouts[page_id] = {
                 'layout': page_data.get('layout', {}),
@@ -0,0 +1,367 @@
+"""End-to-end load test of the API without npm or a registry.
+
+A fake npm on PATH sleeps like the real scaffold/install would and writes a
+minimal tree, and every state directory (projects, database, caches,
+lockfiles) lives in a throwaway temp dir. Each run starts with an empty
+skeleton cache, so the simulated npm latency hits the first generation per
+dependency set and the rest measure materializing projects from the cache,
+as in production.
+
+Needs the development requirements (httpx): pip install -r requirements-dev.txt
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import math
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+
+import httpx
+
+PYTHON_DIR = os.path.dirname(os.path.abspath(__file__))
+
+FAKE_NPM = '''#!{python}
+"""npm stand-in for load_test.py: sleeps like npm would and writes a minimal tree."""
+import json
+import os
+import random
+import sys
+import time
+
+args = sys.argv[1:]
+command = args[0] if args else ''
+with open(os.environ['FAKE_NPM_LOG'], 'a') as f:
+    f.write(command + '\\n')
+
+if random.random() < float(os.environ.get('FAKE_NPM_FAIL_RATE', 0)):
+    sys.stderr.write('npm ERR! simulated failure\\n')
+    sys.exit(1)
+
+if command == 'create':
+    # npm create --yes <flags> vite@latest <dir> -- --template react-ts
+    template = next(i for i, arg in enumerate(args) if arg.startswith('vite'))
+    tree = args[template + 1]
+    time.sleep(float(os.environ.get('FAKE_NPM_SCAFFOLD_MS', 0)) / 1000)
+    os.makedirs(os.path.join(tree, 'src'), exist_ok=True)
+    sources = {{
+        'index.html': '<div id="root"></div><script type="module" src="/src/main.tsx"></script>\\n',
+        'src/main.tsx': "import App from './App'\\n",
+        'src/App.tsx': 'export default function App() {{ return null }}\\n',
+    }}
+    for name, content in sources.items():
+        with open(os.path.join(tree, name), 'w') as f:
+            f.write(content)
+elif command in ('install', 'ci'):
+    time.sleep(float(os.environ.get('FAKE_NPM_INSTALL_MS', 0)) / 1000)
+    with open('package.json') as f:
+        package = json.load(f)
+    dependencies = {{**package.get('dependencies', {{}}), **package.get('devDependencies', {{}})}}
+    for name, version in dependencies.items():
+        module = os.path.join('node_modules', name)
+        os.makedirs(module, exist_ok=True)
+        with open(os.path.join(module, 'package.json'), 'w') as f:
+            json.dump({{'name': name, 'version': version}}, f)
+        with open(os.path.join(module, 'index.js'), 'w') as f:
+            f.write('module.exports = {{}}\\n')
+    if command == 'install':
+        with open('package-lock.json', 'w') as f:
+            json.dump({{'name': package.get('name'), 'lockfileVersion': 3, 'packages': {{}}}}, f)
+else:
+    sys.stderr.write('fake npm: unsupported command ' + command + '\\n')
+    sys.exit(1)
+'''
+
+DEFAULT_MIX = 'generate=1,styles=4,structure=4,list=1'
+ICONS = ['Home', 'Users', 'Settings', 'FileText', 'BarChart', 'Mail']
+
+
+def prepare_environment(root, args):
+    """Create the fake npm and state directories under root; return the app's environment."""
+    bin_dir = os.path.join(root, 'bin')
+    os.makedirs(bin_dir)
+    npm = os.path.join(bin_dir, 'npm')
+    with open(npm, 'w') as f:
+        f.write(FAKE_NPM.format(python=sys.executable))
+    os.chmod(npm, 0o755)
+
+    projects = os.path.join(root, 'projects')
+    os.makedirs(projects)
+    env = {
+        'PATH': bin_dir + os.pathsep + os.environ.get('PATH', ''),
+        'FAKE_NPM_LOG': os.path.join(root, 'npm.log'),
+        'FAKE_NPM_SCAFFOLD_MS': str(args.scaffold_ms),
+        'FAKE_NPM_INSTALL_MS': str(args.install_ms),
+        'FAKE_NPM_FAIL_RATE': str(args.npm_fail_rate),
+        'PROJECTS_ROOT': projects,
+        'DATABASE_URL': 'sqlite:///' + os.path.join(root, 'projects.db'),
+        'SKELETON_CACHE_DIR': os.path.join(root, 'skeleton_cache'),
+        'PACKAGE_STORE_DIR': os.path.join(root, 'package_store'),
+        'NPM_OFFLINE_CACHE': os.path.join(root, 'npm_cache'),
+        'LOCKFILES_DIR': os.path.join(root, 'lockfiles'),
+        'PROFILES_DIR': os.path.join(root, 'profiles'),
+    }
+    if args.worker_pool_size is not None:
+        env['WORKER_POOL_SIZE'] = str(args.worker_pool_size)
+    if args.io_threads is not None:
+        env['IO_THREADS'] = str(args.io_threads)
+    return env
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        if name not in REQUESTS:
+            raise ValueError(f"Unknown request type '{name}', use one of {', '.join(REQUESTS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def style_body(n, variant):
+    return {
+        'projectName': f'load-styles-{n}',
+        'colors': {'primary': f'#{variant * 40503 % 0xFFFFFF:06x}', 'secondary': '#64748b'},
+        'spacing': {'sm': '4px', 'md': f'{8 + variant}px'},
+        'borderRadius': {'sm': '2px', 'md': '6px'},
+        'animation': {'duration': f'{100 + variant}ms', 'easing': 'ease'},
+        'shadow': {'sm': '0 1px 2px rgba(0,0,0,0.1)'},
+        'font': 'Inter',
+    }
+
+
+def structure_body(n, variant):
+    return {
+        'projectName': f'load-structure-{n}',
+        'loginConfig': {
+            'enabled': True,
+            'fields': [{'name': 'email', 'icon': ICONS[variant % len(ICONS)]}],
+            'socialProviders': [{'enabled': True, 'icon': 'Github'}],
+        },
+        'sidebarConfig': {
+            'enabled': True,
+            'tabs': [{'name': f'Tab {i}', 'icon': ICONS[i % len(ICONS)], 'path': f'/tab-{i}'}
+                     for i in range(1 + variant % 5)],
+        },
+        'projectConfig': {},
+        'layoutType': 'Dashboard Layout',
+    }
+
+
+def generate_body(n, variant):
+    return {
+        'projectName': f'load-project-{n}',
+        'description': 'Load test project',
+        'framework': 'Vite + React',
+        'language': 'TypeScript',
+        'backend': 'Node + Express',
+    }
+
+
+# request type -> (method, path, body(n, variant) or None)
+REQUESTS = {
+    'generate': ('POST', '/generate-project?wait=true', generate_body),
+    'styles': ('POST', '/generate-styles', style_body),
+    'structure': ('POST', '/generate-structure', structure_body),
+    'list': ('GET', '/list-projects?limit=100', None),
+}
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(samples, elapsed):
+    """samples: [(request type, status code or None, seconds)] -> report dict."""
+    by_type = {}
+    for kind, status, seconds in samples:
+        by_type.setdefault(kind, []).append((status, seconds))
+    report = {}
+    for kind, results in sorted(by_type.items()) + [('all', [(s, t) for _, s, t in samples])]:
+        latencies = sorted(seconds for _, seconds in results)
+        errors = sum(1 for status, _ in results if status is None or status >= 400)
+        report[kind] = {
+            'requests': len(results),
+            'errors': errors,
+            'error_rate': errors / len(results) if results else 0.0,
+            'throughput_rps': len(results) / elapsed if elapsed else 0.0,
+            'p50_ms': percentile(latencies, 0.50) * 1000 if latencies else None,
+            'p95_ms': percentile(latencies, 0.95) * 1000 if latencies else None,
+            'p99_ms': percentile(latencies, 0.99) * 1000 if latencies else None,
+            'max_ms': latencies[-1] * 1000 if latencies else None,
+            'status_codes': dict(Counter(str(status or 'error') for status, _ in results)),
+        }
+    return report
+
+
+async def send(client, kind, n, variants):
+    method, path, body = REQUESTS[kind]
+    started = time.perf_counter()
+    try:
+        response = await client.request(method, path, json=body(n, n % variants) if body else None)
+        status = response.status_code
+    except httpx.HTTPError as e:
+        print(f"{kind} #{n} failed: {e!r}")
+        status = None
+    return kind, status, time.perf_counter() - started
+
+
+async def drive(client, mix, args):
+    """Send the request mix at fixed concurrency; return (samples, elapsed seconds)."""
+    rng = random.Random(args.seed)
+    kinds, weights = list(mix), list(mix.values())
+    schedule = iter(range(args.warmup + args.requests))
+    samples = []
+    deadline = None
+
+    for n in range(args.warmup):
+        await send(client, rng.choices(kinds, weights)[0], next(schedule), args.variants)
+
+    async def user():
+        for n in schedule:
+            if deadline is not None and time.perf_counter() > deadline:
+                return
+            samples.append(await send(client, rng.choices(kinds, weights)[0], n, args.variants))
+
+    started = time.perf_counter()
+    if args.duration:
+        deadline = started + args.duration
+    await asyncio.gather(*(user() for _ in range(args.concurrency)))
+    return samples, time.perf_counter() - started
+
+
+async def run_in_process(env, mix, args, log_path):
+    # The app reads its settings at import time, so the environment comes first
+    os.environ.update(env)
+    sys.path.insert(0, PYTHON_DIR)
+    with open(log_path, 'a') as log, contextlib.redirect_stdout(log):
+        import api
+        logging.getLogger().handlers = [logging.StreamHandler(log)]
+        await api.app.router.startup()
+        try:
+            transport = httpx.ASGITransport(app=api.app)
+            async with httpx.AsyncClient(transport=transport, base_url='http://load-test', timeout=args.timeout) as client:
+                return await drive(client, mix, args)
+        finally:
+            await api.app.router.shutdown()
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+async def run_uvicorn(env, mix, args, log_path):
+    port = free_port()
+    base_url = f'http://127.0.0.1:{port}'
+    with open(log_path, 'a') as log:
+        server = subprocess.Popen(
+            [sys.executable, '-m', 'uvicorn', 'api:app', '--host', '127.0.0.1', '--port', str(port), '--log-level', 'warning'],
+            cwd=PYTHON_DIR, env={**os.environ, **env}, stdout=log, stderr=subprocess.STDOUT,
+        )
+    try:
+        async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout) as client:
+            deadline = time.monotonic() + 30
+            while True:
+                if server.poll() is not None:
+                    raise RuntimeError(f"uvicorn exited with code {server.returncode}, see {log_path}")
+                try:
+                    await client.get('/list-projects?limit=1')
+                    break
+                except httpx.TransportError:
+                    if time.monotonic() > deadline:
+                        raise RuntimeError(f"uvicorn did not start within 30s, see {log_path}")
+                    await asyncio.sleep(0.2)
+            return await drive(client, mix, args)
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+
+def print_report(report, elapsed, npm_calls):
+    print(f"\n{'request':<11}{'count':>7}{'errors':>8}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for kind, row in report.items():
+        if not row['requests']:
+            continue
+        latencies = ''.join(f"{row[key]:10.1f}" for key in ('p50_ms', 'p95_ms', 'p99_ms', 'max_ms'))
+        print(f"{kind:<11}{row['requests']:>7}{row['error_rate']:>8.1%}{row['throughput_rps']:>9.1f}{latencies}")
+    print(f"\nElapsed {elapsed:.2f}s, npm calls: {dict(npm_calls) or 'none'}")
+
+
+def main(argv=None):
+    """Load-test the generator API against a fake npm and report throughput, latency percentiles and error rates."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--mode', choices=('inprocess', 'uvicorn'), default='inprocess',
+                        help='call the app through ASGI in this process or over HTTP in a uvicorn subprocess')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help=f'request type weights (default {DEFAULT_MIX})')
+    parser.add_argument('--requests', type=int, default=200, help='requests to send after the warmup')
+    parser.add_argument('--duration', type=float, help='stop sending after this many seconds')
+    parser.add_argument('--concurrency', type=int, default=10, help='requests in flight at any time')
+    parser.add_argument('--warmup', type=int, default=0, help='sequential requests sent before measuring')
+    parser.add_argument('--variants', type=int, default=10, help='distinct style/structure configs to cycle through')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--timeout', type=float, default=300, help='per-request timeout in seconds')
+    parser.add_argument('--scaffold-ms', type=float, default=500, help='simulated npm create latency')
+    parser.add_argument('--install-ms', type=float, default=2000, help='simulated npm install/ci latency')
+    parser.add_argument('--npm-fail-rate', type=float, default=0.0, help='fraction of npm calls that fail')
+    parser.add_argument('--worker-pool-size', type=int, help='WORKER_POOL_SIZE for the app (0 renders inline)')
+    parser.add_argument('--io-threads', type=int, help='IO_THREADS for the app')
+    parser.add_argument('--output', help='also write the report as JSON to this file')
+    parser.add_argument('--keep', action='store_true', help='keep the temp dir with the projects and server log')
+    args = parser.parse_args(argv)
+
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+
+    root = tempfile.mkdtemp(prefix='load-test-')
+    log_path = os.path.join(root, 'server.log')
+    try:
+        env = prepare_environment(root, args)
+        print(f"Load test: {args.mode}, mix {args.mix}, concurrency {args.concurrency}, state in {root}")
+        run = run_in_process if args.mode == 'inprocess' else run_uvicorn
+        samples, elapsed = asyncio.run(run(env, mix, args, log_path))
+
+        npm_calls = Counter()
+        if os.path.exists(env['FAKE_NPM_LOG']):
+            with open(env['FAKE_NPM_LOG']) as f:
+                npm_calls.update(line.strip() for line in f)
+        report = summarize(samples, elapsed)
+        print_report(report, elapsed, npm_calls)
+
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'settings': {key: value for key, value in vars(args).items() if key not in ('output', 'keep')},
+                    'elapsed_s': elapsed,
+                    'npm_calls': dict(npm_calls),
+                    'results': report,
+                }, f, indent=2)
+            print(f"Report saved to: {args.output}")
+        return 1 if report.get('all', {}).get('errors') else 0
+    finally:
+        if args.keep:
+            print(f"Kept {root} (server log: {log_path})")
+        else:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
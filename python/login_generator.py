@@ -1,10 +1,12 @@
 import json
 import os
+import project_paths
 from typing import Dict, Any
+from template_engine import templates
+from render_cache import RenderCache, config_key
+from output_backend import write_output
 
-class LoginGenerator:
-    def __init__(self):
-        self.template = '''
+templates.register('login.form', '''
 import React, { useState } from 'react';
 import { useForm } from 'react-hook-form';
 import { {icons} } from 'lucide-react';
@@ -291,13 +293,15 @@ const LoginForm: React.FC<{{ config: LoginConfig }}> = ({ config }) => {{
 }};
 
 export default LoginForm;
-'''
+''')
+
+render_cache = RenderCache('login')
 
-    def generate_login_component(self, config: Dict[str, Any], output_dir: str) -> str:
+class LoginGenerator:
+    def generate_login_component(self, config: Dict[str, Any], output_dir: str, output=None) -> str:
         """Generate the React login component based on the configuration."""
-        # Create the components directory if it doesn't exist
+        # The component lives in src/components/login
         components_dir = os.path.join(output_dir, 'src', 'components', 'login')
-        os.makedirs(components_dir, exist_ok=True)
 
         # Get all unique icons used in the configuration
         icons = set()
@@ -308,13 +312,17 @@ export default LoginForm;
             if provider['enabled'] and 'icon' in provider:
                 icons.add(provider['icon'])
 
-        # Replace the icons placeholder in the template
-        code = self.template.replace('{icons}', ', '.join(sorted(icons)))
+        # The icons are the only part of the config the template renders
+        template = templates.get('login.form')
+        icons_import = ', '.join(sorted(icons))
+        code = render_cache.get_or_render(
+            config_key(template.version, icons_import),
+            lambda: template.render(icons=icons_import)
+        )
 
-        # Save the component
+        # Save the component, skipping the write when the file already matches
         output_path = os.path.join(components_dir, 'LoginForm.tsx')
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(code)
+        write_output(output_path, code, output)
 
         return output_path
 
@@ -355,5 +363,5 @@ if __name__ == '__main__':
             }
         ]
     }
-    result = main(example_config, 'c:/Users/usuario/Downloads/project-bolt-sb1-rqbh4gta/project')
+    result = main(example_config, project_paths.frontend_dir('example'))
     print(f"Login component generated at: {result}")
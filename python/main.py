@@ -41,8 +41,8 @@ async def create_project(project: ProjectCreate):
     return await ProjectService.create_project(project)
 
 @app.get("/projects/", response_model=List[Project])
-async def list_projects():
-    return await ProjectService.list_projects()
+async def list_projects(skip: int = 0, limit: int = 100):
+    return await ProjectService.list_projects(skip, limit)
 
 @app.get("/projects/{project_id}", response_model=Project)
 async def get_project(project_id: int):
@@ -0,0 +1,154 @@
+import bisect
+import threading
+
+# Prometheus text exposition without the client library. Recording a sample
+# is a dict update under a lock; the text is only built when /metrics is
+# scraped, so instrumentation costs next to nothing while nobody reads it.
+
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _label_text(names, values):
+    if not names:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + '}'
+
+
+def _number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels[name] for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def collect(self):
+        with self._lock:
+            values = dict(self._values)
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} counter']
+        for key, value in sorted(values.items()):
+            lines.append(f'{self.name}{_label_text(self.labels, key)} {_number(value)}')
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help_text, labels=(), buckets=STAGE_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        # label values -> [per-bucket counts (last one is +Inf), sum]
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(labels[name] for name in self.labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def collect(self):
+        with self._lock:
+            series = {key: (list(counts), total) for key, (counts, total) in self._series.items()}
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} histogram']
+        for key, (counts, total) in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                labels = _label_text(self.labels + ('le',), key + (_number(bound),))
+                lines.append(f'{self.name}_bucket{labels} {cumulative}')
+            labels = _label_text(self.labels, key)
+            lines.append(f'{self.name}_sum{labels} {_number(total)}')
+            lines.append(f'{self.name}_count{labels} {cumulative}')
+        return lines
+
+
+class GaugeFunction:
+    """Gauge read from read() at scrape time; read() returns a number or {label values: number}."""
+
+    def __init__(self, name, help_text, read, labels=(), metric_type='gauge'):
+        self.name = name
+        self.help = help_text
+        self.read = read
+        self.labels = tuple(labels)
+        self.metric_type = metric_type
+
+    def collect(self):
+        values = self.read()
+        if not isinstance(values, dict):
+            values = {(): values}
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} {self.metric_type}']
+        for key, value in sorted(values.items()):
+            lines.append(f'{self.name}{_label_text(self.labels, key)} {_number(value)}')
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.collect())
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+stage_seconds = registry.register(Histogram(
+    'generator_stage_duration_seconds', 'Duration of generation job stages, pipeline nodes and generation steps.', ('stage',)
+))
+stage_total = registry.register(Counter(
+    'generator_stage_total', 'Finished generation stages by outcome (cached means a reused skeleton).', ('stage', 'status')
+))
+command_seconds = registry.register(Histogram(
+    'generator_command_duration_seconds', 'Duration of external commands such as npm create and npm install.', ('step', 'command')
+))
+files_total = registry.register(Counter(
+    'generator_files_total', 'Generated files by producer and outcome (written, unchanged, removed).', ('producer', 'result')
+))
+bytes_written = registry.register(Counter(
+    'generator_bytes_written_total', 'Bytes of generated files written to projects.', ('producer',)
+))
+
+
+def observe_stage(stage, status, seconds=None):
+    """Count a finished stage; batch stages named '<project>:<stage>' are recorded as <stage>."""
+    stage = stage.rpartition(':')[2]
+    stage_total.inc(stage=stage, status=status)
+    if seconds is not None:
+        stage_seconds.observe(seconds, stage=stage)
+
+
+def observe_writes(files):
+    """Record {producer: write counts} as returned by DiskOutput/GenerationManifest.finish()."""
+    for producer, counts in files.items():
+        for result in ('written', 'unchanged', 'removed'):
+            if counts.get(result):
+                files_total.inc(counts[result], producer=producer, result=result)
+        if counts.get('bytes'):
+            bytes_written.inc(counts['bytes'], producer=producer)
@@ -0,0 +1,84 @@
+import os
+import re
+import shutil
+from urllib.parse import unquote
+
+from command_runner import CommandError, CommandTimeout, run_command
+from io_executor import io_executor
+
+LOCKFILES_DIR = os.environ.get('LOCKFILES_DIR') or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'lockfiles')
+
+
+class OfflineInstallError(Exception):
+    pass
+
+
+class LockfileInstaller:
+    """Installs skeleton dependencies from lockfiles pinned per template version.
+
+    With a pinned lockfile the install is a deterministic `npm ci` against a
+    local cache directory; in offline mode (GENERATOR_OFFLINE=1) it never
+    touches the network and fails with the missing package name instead.
+    """
+
+    def __init__(self, offline=None, cache_dir=None, lockfiles_dir=None):
+        if offline is None:
+            offline = os.environ.get('GENERATOR_OFFLINE', '').lower() in ('1', 'true', 'yes')
+        self.offline = offline
+        self.cache_dir = cache_dir or os.environ.get('NPM_OFFLINE_CACHE') or os.path.join(
+            os.path.dirname(os.path.abspath(__file__)), '.npm_cache'
+        )
+        self.lockfiles_dir = lockfiles_dir or LOCKFILES_DIR
+
+    def npm_flags(self):
+        """Flags that point npm at the local cache (and forbid the network offline)."""
+        flags = ['--cache', self.cache_dir, '--no-audit', '--no-fund']
+        if self.offline:
+            flags.append('--offline')
+        return flags
+
+    def lockfile_path(self, kind, version):
+        return os.path.join(self.lockfiles_dir, kind, version, 'package-lock.json')
+
+    async def install(self, kind, version, tree):
+        """Install dependencies into tree, pinning the lockfile on first online install."""
+        pinned = self.lockfile_path(kind, version)
+        if os.path.isfile(pinned):
+            await io_executor.run(shutil.copyfile, pinned, os.path.join(tree, 'package-lock.json'))
+            await self._run(['npm', 'ci', *self.npm_flags()], tree)
+            return
+
+        if self.offline:
+            raise OfflineInstallError(
+                f"No pinned lockfile for {kind} template {version} at {pinned}; "
+                "run one online generation to pin it"
+            )
+
+        await self._run(['npm', 'install', *self.npm_flags()], tree)
+        await io_executor.run(self.pin, kind, version, tree)
+
+    def pin(self, kind, version, tree):
+        """Store the lockfile npm produced in tree as the pinned one for this version."""
+        pinned = self.lockfile_path(kind, version)
+        os.makedirs(os.path.dirname(pinned), exist_ok=True)
+        shutil.copyfile(os.path.join(tree, 'package-lock.json'), pinned)
+        print(f"Pinned {kind} lockfile for template {version} at: {pinned}")
+        return pinned
+
+    async def _run(self, command, cwd):
+        try:
+            return await run_command(command, cwd, step='install')
+        except CommandTimeout:
+            raise
+        except CommandError as e:
+            if 'ENOTCACHED' not in e.output:
+                raise
+            # Packument and tarball URLs both start with the package name
+            missing = sorted({
+                unquote(url.split('/-/')[0].split('/', 3)[-1])
+                for url in re.findall(r'request to (\S+) failed', e.output)
+            })
+            raise OfflineInstallError(
+                f"Offline npm cache at {self.cache_dir} is missing "
+                f"{', '.join(missing) or 'packages'}; warm it with an online install"
+            ) from e
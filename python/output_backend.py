@@ -0,0 +1,98 @@
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from generation_manifest import GenerationManifest
+from project_archive import stream_tree
+from render_cache import write_if_changed
+
+# Generators write every file through an output backend instead of calling
+# open() themselves, so one generation run can be previewed from memory,
+# committed to disk or streamed as an archive.
+
+
+class MemoryOutput:
+    """Virtual filesystem that keeps generated files in memory, keyed by path relative to root."""
+
+    def __init__(self, root, files=None):
+        self.root = os.path.abspath(root)
+        self.files = dict(files or {})
+
+    def write(self, path, content):
+        rel = os.path.relpath(os.path.abspath(path), self.root)
+        if rel.startswith('..'):
+            raise ValueError(f"Output path {path} is outside {self.root}")
+        self.files[rel.replace(os.sep, '/')] = content
+        return path
+
+    def finish(self):
+        size = sum(len(content.encode('utf-8')) for content in self.files.values())
+        return {'written': len(self.files), 'unchanged': 0, 'removed': 0, 'bytes': size}
+
+
+class ArchiveOutput(MemoryOutput):
+    """In-memory tree that is delivered as a zip or tar stream instead of files."""
+
+    def stream(self, archive_format):
+        """Yield the tree as an archive whose entries sit under the project directory name."""
+        base = os.path.basename(self.root)
+        return stream_tree({f'{base}/{rel}': content for rel, content in self.files.items()}, archive_format)
+
+
+class DiskOutput(GenerationManifest):
+    """Writes generated files into the project on disk, tracked by the generation manifest."""
+
+    def commit(self, files):
+        """Write a previewed {relative path: content} tree and return the write counts."""
+        for rel, content in files.items():
+            self.write(os.path.join(self.root, rel), content)
+        return self.finish()
+
+
+class PreviewStore:
+    """Previewed trees held in the API process until committed, dropped or expired."""
+
+    def __init__(self, max_previews=None, ttl=None):
+        self.max_previews = max_previews or int(os.environ.get('PREVIEW_MAX', 64))
+        self.ttl = ttl or float(os.environ.get('PREVIEW_TTL', 900))
+        self._previews = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, project_name, trees):
+        preview_id = uuid.uuid4().hex
+        with self._lock:
+            self._expire()
+            self._previews[preview_id] = {
+                'project_name': project_name,
+                'trees': trees,
+                'expires_at': time.monotonic() + self.ttl,
+            }
+            while len(self._previews) > self.max_previews:
+                self._previews.popitem(last=False)
+        return preview_id
+
+    def get(self, preview_id):
+        with self._lock:
+            self._expire()
+            return self._previews.get(preview_id)
+
+    def pop(self, preview_id):
+        with self._lock:
+            self._expire()
+            return self._previews.pop(preview_id, None)
+
+    def _expire(self):
+        now = time.monotonic()
+        for preview_id in [pid for pid, preview in self._previews.items() if preview['expires_at'] <= now]:
+            del self._previews[preview_id]
+
+
+def write_output(path, content, output=None):
+    """Write a generated file through output when given, else straight to disk; return the path."""
+    if output is not None:
+        return output.write(path, content)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    write_if_changed(path, content)
+    return path
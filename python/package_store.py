@@ -0,0 +1,131 @@
+import errno
+import hashlib
+import json
+import os
+import stat
+import sys
+
+import project_paths
+
+
+class PackageStore:
+    """Content-addressed store shared by every generated project's node_modules.
+
+    Each installed file is kept once under its content hash and projects hold
+    hardlinks to it, so identical packages across projects and skeleton
+    versions cost one inode. A blob whose link count drops to 1 is referenced
+    by no project and is removed by gc().
+    """
+
+    def __init__(self, root=None):
+        self.root = root or os.environ.get('PACKAGE_STORE_DIR') or os.path.join(
+            os.path.dirname(os.path.abspath(__file__)), '.package_store'
+        )
+
+    def blob_path(self, digest):
+        return os.path.join(self.root, digest[:2], digest[2:])
+
+    def file_digest(self, path, mode):
+        """Hash file contents; the exec bit is part of the key since links share it."""
+        h = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                h.update(chunk)
+        suffix = '-x' if mode & stat.S_IXUSR else ''
+        return h.hexdigest() + suffix
+
+    def import_file(self, path):
+        """Replace path with a hardlink to its store blob. Returns True if deduplicated.
+
+        A file on another filesystem than the store cannot be linked and is
+        left as it is.
+        """
+        st = os.lstat(path)
+        if not stat.S_ISREG(st.st_mode):
+            return False
+
+        blob = self.blob_path(self.file_digest(path, st.st_mode))
+        try:
+            try:
+                blob_st = os.stat(blob)
+            except FileNotFoundError:
+                os.makedirs(os.path.dirname(blob), exist_ok=True)
+                try:
+                    os.link(path, blob)
+                    return False
+                except FileExistsError:
+                    blob_st = os.stat(blob)
+
+            if blob_st.st_ino == st.st_ino and blob_st.st_dev == st.st_dev:
+                return False
+
+            tmp_path = f'{path}.store-tmp'
+            os.link(blob, tmp_path)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            return False
+        os.replace(tmp_path, path)
+        return True
+
+    def same_filesystem(self, path):
+        os.makedirs(self.root, exist_ok=True)
+        return os.stat(path).st_dev == os.stat(self.root).st_dev
+
+    def import_tree(self, node_modules_dir):
+        """Link every regular file under node_modules_dir into the store."""
+        stats = {'files': 0, 'deduplicated': 0}
+        if not os.path.isdir(node_modules_dir):
+            return stats
+        if not self.same_filesystem(node_modules_dir):
+            # Hardlinks cannot cross filesystems (EXDEV): keep the tree's own copies
+            print(f"Not deduplicating {node_modules_dir}: package store {self.root} is on another filesystem")
+            stats['skipped'] = True
+            return stats
+
+        for dirpath, _, filenames in os.walk(node_modules_dir):
+            for name in filenames:
+                stats['files'] += 1
+                if self.import_file(os.path.join(dirpath, name)):
+                    stats['deduplicated'] += 1
+        return stats
+
+    def link_project(self, project_dir):
+        """Move an existing project's node_modules onto the store."""
+        return self.import_tree(os.path.join(project_dir, 'node_modules'))
+
+    def gc(self):
+        """Remove blobs no project or skeleton links to any more."""
+        stats = {'removed': 0, 'freed_bytes': 0, 'kept': 0}
+        if not os.path.isdir(self.root):
+            return stats
+
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                blob = os.path.join(dirpath, name)
+                st = os.lstat(blob)
+                if st.st_nlink > 1:
+                    stats['kept'] += 1
+                    continue
+                os.unlink(blob)
+                stats['removed'] += 1
+                stats['freed_bytes'] += st.st_size
+        return stats
+
+
+def main(args):
+    """Link generated projects into the store (`link`) and/or collect garbage (`gc`)."""
+    store = PackageStore()
+    result = {}
+    if not args or 'link' in args:
+        projects_root = project_paths.PROJECTS_ROOT
+        for d in sorted(os.listdir(projects_root)):
+            project_dir = os.path.join(projects_root, d)
+            if os.path.isdir(project_dir) and d.startswith('generated_'):
+                result[d] = store.link_project(project_dir)
+    if not args or 'gc' in args:
+        result['gc'] = store.gc()
+    return result
+
+if __name__ == '__main__':
+    print(json.dumps(main(sys.argv[1:]), indent=2))
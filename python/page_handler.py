@@ -1,51 +1,56 @@
 import json
 import os
+import project_paths
+from template_engine import templates
+from output_backend import write_output
 
-class PageHandler:
-    def __init__(self):
-        self.page_defaults = {
-            'layout': {
-                'type': 'single',
-                'columns': 12,
-                'gap': '4',
-                'padding': '4',
-                'margin': '4',
-                'maxWidth': '1200px'
-            }
+def _page_defaults():
+    return {
+        'layout': {
+            'type': 'single',
+            'columns': 12,
+            'gap': '4',
+            'padding': '4',
+            'margin': '4',
+            'maxWidth': '1200px'
         }
-        
-        self.component_templates = {
-            'reusable': '''
+    }
+
+templates.register_catalog('page.defaults', _page_defaults)
+templates.register('page.reusable', '''
 import React from 'react';
 import { {components} } from '../components';
 import GridLayout from 'react-grid-layout';
 
-const {name} = () => {
+const {name} = () => {{
     const layout = {layoutConfig};
 
     return (
-        <div style={{
+        <div style={{{{
             padding: '{padding}px',
             margin: '{margin}px',
             maxWidth: '{maxWidth}',
-        }}>
+        }}}}>
             <GridLayout
                 className="layout"
                 layout={layout.lg}
-                cols={columns}
+                cols={{{columns}}}
                 rowHeight={30}
                 width={1200}
-                margin={[parseInt({gap}), parseInt({gap})]}
+                margin={{[parseInt({gap}), parseInt({gap})]}}
             >
                 {components_jsx}
             </GridLayout>
         </div>
     );
-};
+}};
 
 export default {name};
-'''
-        }
+''')
+
+class PageHandler:
+    def __init__(self):
+        self.page_defaults = templates.catalog('page.defaults')
 
     def generate_component_imports(self, components):
         """Generate import statements for reusable components."""
@@ -67,39 +72,48 @@ export default {name};
         """Generate React component code for a page."""
         for component in page_data.get('components', []):
             if component['componentType'] == 'reusable':
-                template = self.component_templates['reusable']
+                template = templates.get('page.reusable')
                 
                 # Get component features and layout
                 features = component.get('features', {})
                 layout = component.get('layout', {})
                 layout_component = component.get('layoutComponente', {})
                 
-                # Replace placeholders
-                code = template.replace('{name}', component['name'].capitalize())
-                code = code.replace('{components}', self.generate_component_imports(features['reusableComponents']))
-                code = code.replace('{layoutConfig}', json.dumps(layout_component))
-                code = code.replace('{padding}', str(layout.get('padding', '4')))
-                code = code.replace('{margin}', str(layout.get('margin', '4')))
-                code = code.replace('{maxWidth}', layout.get('maxWidth', '1200px'))
-                code = code.replace('{columns}', str(layout.get('columns', 12)))
-                code = code.replace('{gap}', str(layout.get('gap', '4')))
-                code = code.replace('{components_jsx}', self.generate_components_jsx(layout_component))
+                # Fill placeholders in a single pass
+                code = template.render(
+                    name=component['name'].capitalize(),
+                    components=self.generate_component_imports(features['reusableComponents']),
+                    layoutConfig=json.dumps(layout_component),
+                    padding=layout.get('padding', '4'),
+                    margin=layout.get('margin', '4'),
+                    maxWidth=layout.get('maxWidth', '1200px'),
+                    columns=layout.get('columns', 12),
+                    gap=layout.get('gap', '4'),
+                    components_jsx=self.generate_components_jsx(layout_component)
+                )
                 
                 return code
         return None
 
-    def save_component(self, project_path, page_id, code):
+    def save_component(self, project_path, page_id, code, output=None):
         """Save the generated component to a file."""
         components_dir = os.path.join(project_path, 'src', 'pages')
-        os.makedirs(components_dir, exist_ok=True)
         
         file_path = os.path.join(components_dir, f"{page_id}.tsx")
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(code)
+        write_output(file_path, code, output)
         
         return file_path
 
-    def process_page_config(self, page_id, page_data):
+    def validate_page_path(self, path):
+        """Make sure the route path is absolute."""
+        path = (path or '').strip()
+        return path if path.startswith('/') else f'/{path}'
+
+    def process_page_layout(self, layout):
+        """Fill in missing layout settings from the page defaults."""
+        return {**self.page_defaults['layout'], **(layout or {})}
+
+    def process_page_config(self, page_id, page_data, project_path, output=None):
         """Process individual page configuration and generate component."""
         processed_page = {
             'id': page_id,
@@ -112,31 +126,27 @@ export default {name};
         # Generate React component
         react_code = self.generate_react_component(page_data)
         if react_code:
-            component_path = self.save_component(
-                'c:/Users/usuario/Downloads/project-bolt-sb1-rqbh4gta/project',
-                page_id,
-                react_code
-            )
+            component_path = self.save_component(project_path, page_id, react_code, output)
             processed_page['component_path'] = component_path
         
         return processed_page
     
-    def process_pages_config(self, config):
+    def process_pages_config(self, config, project_path, output=None):
         """Process all pages from the project configuration."""
         pages = config.get('pages', {})
         processed_pages = {}
         
         for page_id, page_data in pages.items():
-            processed_pages[page_id] = self.process_page_config(page_id, page_data)
+            processed_pages[page_id] = self.process_page_config(page_id, page_data, project_path, output)
         
         return processed_pages
 
-def main(config_json):
+def main(config_json, project_path):
     """Main function to handle page processing."""
     try:
         config = json.loads(config_json) if isinstance(config_json, str) else config_json
         handler = PageHandler()
-        processed_pages = handler.process_pages_config(config)
+        processed_pages = handler.process_pages_config(config, project_path)
         return processed_pages
     except Exception as e:
         print(f"Error processing page configuration: {str(e)}")
@@ -158,5 +168,5 @@ if __name__ == '__main__':
             }
         }
     }
-    result = main(example_config)
+    result = main(example_config, project_paths.frontend_dir('example'))
     print(json.dumps(result, indent=2))
\ No newline at end of file
@@ -0,0 +1,102 @@
+import asyncio
+import time
+
+
+class PipelineError(Exception):
+    def __init__(self, message, report, errors=None):
+        super().__init__(message)
+        self.report = report
+        # node name -> the exception it failed with
+        self.errors = errors or {}
+
+
+class Pipeline:
+    """Dependency graph of async generation steps.
+
+    Every node starts as soon as all of its dependencies finished, so
+    independent branches (the frontend files and the backend files, say) run
+    concurrently. A failed node skips the nodes that depend on it while the
+    other branches run to completion.
+    """
+
+    def __init__(self):
+        self.nodes = {}
+
+    def add(self, name, run, deps=()):
+        """Add a node; run(results) gets a dict with the results of its dependencies."""
+        if name in self.nodes:
+            raise ValueError(f"Duplicate pipeline node '{name}'")
+        self.nodes[name] = (run, tuple(deps))
+
+    def order(self):
+        """Return node names in a dependency-respecting order, rejecting unknown deps and cycles."""
+        ordered = []
+        state = {}
+
+        def visit(name, path):
+            if state.get(name) == 'done':
+                return
+            if state.get(name) == 'visiting':
+                raise ValueError(f"Pipeline cycle: {' -> '.join(path + [name])}")
+            if name not in self.nodes:
+                raise ValueError(f"Unknown pipeline node '{name}' required by '{path[-1]}'")
+            state[name] = 'visiting'
+            for dep in self.nodes[name][1]:
+                visit(dep, path + [name])
+            state[name] = 'done'
+            ordered.append(name)
+
+        for name in self.nodes:
+            visit(name, [])
+        return ordered
+
+    async def run(self, progress=None):
+        """Run every node; return (results, report) or raise PipelineError if any node failed.
+
+        report maps node names to status, start offset and duration in ms.
+        """
+        progress = progress or (lambda stage, status, **detail: None)
+        self.order()
+        started = time.perf_counter()
+        results = {}
+        report = {name: {'status': 'pending'} for name in self.nodes}
+        errors = {}
+        tasks = {}
+
+        async def run_node(name):
+            run, deps = self.nodes[name]
+            for dep in deps:
+                await asyncio.shield(tasks[dep])
+            if any(report[dep]['status'] != 'done' for dep in deps):
+                report[name] = {'status': 'skipped'}
+                progress(name, 'skipped')
+                return
+
+            node_started = time.perf_counter()
+            report[name] = {'status': 'running', 'started_ms': round((node_started - started) * 1000, 2)}
+            progress(name, 'running')
+            try:
+                results[name] = await run({dep: results[dep] for dep in deps})
+            except Exception as e:
+                errors[name] = e
+                report[name].update(status='failed', error=str(e))
+                progress(name, 'failed', error=str(e))
+            else:
+                report[name]['status'] = 'done'
+                progress(name, 'done')
+            report[name]['duration_ms'] = round((time.perf_counter() - node_started) * 1000, 2)
+
+        for name in self.nodes:
+            tasks[name] = asyncio.ensure_future(run_node(name))
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            raise
+
+        report['total_ms'] = round((time.perf_counter() - started) * 1000, 2)
+        failed = [name for name in self.nodes if report[name]['status'] == 'failed']
+        if failed:
+            raise PipelineError(f"Pipeline nodes failed: {', '.join(failed)}", report, errors)
+        return results, report
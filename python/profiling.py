@@ -0,0 +1,215 @@
+import asyncio
+import contextvars
+import cProfile
+import hmac
+import io
+import marshal
+import os
+import pstats
+import re
+import tempfile
+import time
+import tracemalloc
+import uuid
+
+# Opt-in profiling of single requests: the API process is profiled for the
+# whole request and every worker task the request starts is profiled inside
+# its worker, so generator time spent in other processes is not lost.
+
+ADMIN_TOKEN = os.environ.get('PROFILE_ADMIN_TOKEN', '')
+TOP_N = int(os.environ.get('PROFILE_TOP_N', 30))
+PROFILE_ID = re.compile(r'^[0-9a-f]{32}$')
+
+_session = contextvars.ContextVar('profile_session', default=None)
+# cProfile and tracemalloc are process-wide: one profiled request at a time
+_exclusive = None
+
+
+def requested(headers, query_params):
+    """True when the request asks to be profiled (X-Profile header or ?profile=1)."""
+    flag = headers.get('x-profile') or query_params.get('profile') or ''
+    return flag.lower() in ('1', 'true', 'yes')
+
+
+def authorized(token):
+    """Profiling is disabled unless PROFILE_ADMIN_TOKEN is set, and then needs that token."""
+    return bool(ADMIN_TOKEN) and token is not None and hmac.compare_digest(token, ADMIN_TOKEN)
+
+
+def current_session():
+    """The open session of the running request; None once it closed (e.g. in a 202 job it started)."""
+    session = _session.get()
+    return session if session is not None and not session.closed else None
+
+
+def exclusive():
+    global _exclusive
+    if _exclusive is None:
+        _exclusive = asyncio.Lock()
+    return _exclusive
+
+
+def _top_allocations(snapshot, top_n):
+    snapshot = snapshot.filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap*>'),
+    ))
+    return [str(stat) for stat in snapshot.statistics('lineno')[:top_n]]
+
+
+def profile_call(func, args, kwargs, top_n):
+    """Run func in a worker under cProfile and tracemalloc.
+
+    Returns (result, marshalled stats, peak traced bytes, top allocations).
+    """
+    # In inline mode the API process is already tracing; leave it running then
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    profile = cProfile.Profile()
+    try:
+        result = profile.runcall(func, *args, **kwargs)
+        peak = tracemalloc.get_traced_memory()[1]
+        allocations = _top_allocations(tracemalloc.take_snapshot(), top_n)
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+    profile.create_stats()
+    return result, marshal.dumps(profile.stats), peak, allocations
+
+
+class ProfileSession:
+    """cProfile and tracemalloc capture of one request plus the worker tasks it ran."""
+
+    def __init__(self, description, top_n=TOP_N):
+        self.id = uuid.uuid4().hex
+        self.description = description
+        self.top_n = top_n
+        self.worker_stats = []
+        self.worker_peaks = []
+        self.worker_allocations = []
+        self._profile = cProfile.Profile()
+        self._token = None
+        self._started = None
+        self._started_tracing = False
+        self.duration = None
+        self.peak = None
+        self.allocations = []
+        # Other requests that started on the event loop while this one was profiled
+        self.overlapping = 0
+        self.closed = False
+
+    def add_worker_profile(self, outcome):
+        """Keep the worker's stats from a profile_call outcome and return the task's own result."""
+        result, stats, peak, allocations = outcome
+        if not self.closed:
+            self.worker_stats.append(stats)
+            self.worker_peaks.append(peak)
+            self.worker_allocations.extend(allocations)
+        return result
+
+    def __enter__(self):
+        self._token = _session.set(self)
+        self._started_tracing = not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+        self._started = time.perf_counter()
+        self._profile.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._profile.disable()
+        self.duration = time.perf_counter() - self._started
+        self.peak = tracemalloc.get_traced_memory()[1]
+        self.allocations = _top_allocations(tracemalloc.take_snapshot(), self.top_n)
+        if self._started_tracing:
+            tracemalloc.stop()
+        _session.reset(self._token)
+        # Tasks the request left running (202 jobs) stop being profiled from here on
+        self.closed = True
+
+    def stats(self):
+        """Merged pstats of the API process and all worker tasks."""
+        stats = pstats.Stats(self._profile)
+        for data in self.worker_stats:
+            with tempfile.NamedTemporaryFile(suffix='.prof', delete=False) as f:
+                f.write(data)
+            try:
+                stats.add(f.name)
+            finally:
+                os.unlink(f.name)
+        # Drop the temporary file names pstats would print as the profile's sources
+        stats.files = []
+        return stats
+
+    def report(self, stats):
+        out = io.StringIO()
+        out.write(f"Profile {self.id}: {self.description} in {self.duration:.3f}s, "
+                  f"{len(self.worker_stats)} worker task(s)\n")
+        if self.overlapping:
+            out.write(f"Note: {self.overlapping} other request(s) started on the event loop meanwhile; "
+                      "their time in the API process is included below\n")
+        out.write('\n')
+        out.write(f"== Top {self.top_n} functions by cumulative time ==\n")
+        stats.stream = out
+        stats.sort_stats('cumulative').print_stats(self.top_n)
+        out.write(f"== Top {self.top_n} allocations in the API process (peak {self.peak / 1024:.1f} KiB) ==\n")
+        out.write('\n'.join(self.allocations) + '\n\n')
+        peaks = ', '.join(f'{peak / 1024:.1f} KiB' for peak in self.worker_peaks)
+        out.write(f"== Top {self.top_n} allocations in workers (peak per task: {peaks or 'none'}) ==\n")
+        out.write('\n'.join(self.worker_allocations) + '\n')
+        return out.getvalue()
+
+
+class ProfileStore:
+    """Saved profiles on disk, capped by count and total size (oldest go first)."""
+
+    def __init__(self, root=None, max_profiles=None, max_bytes=None):
+        self.root = root or os.environ.get('PROFILES_DIR') or os.path.join(
+            os.path.dirname(os.path.abspath(__file__)), '.profiles'
+        )
+        self.max_profiles = max_profiles or int(os.environ.get('PROFILE_MAX_COUNT', 20))
+        self.max_bytes = max_bytes or int(os.environ.get('PROFILE_MAX_MB', 100)) * 1024 * 1024
+
+    def path(self, profile_id, kind):
+        """Path of a profile's 'prof' (pstats dump) or 'txt' (report) file, None for an invalid id."""
+        if not PROFILE_ID.match(profile_id):
+            return None
+        return os.path.join(self.root, f'{profile_id}.{kind}')
+
+    def save(self, session):
+        """Write the session's merged .prof and text report, then apply the retention caps."""
+        os.makedirs(self.root, exist_ok=True)
+        stats = session.stats()
+        stats.dump_stats(self.path(session.id, 'prof'))
+        with open(self.path(session.id, 'txt'), 'w', encoding='utf-8') as f:
+            f.write(session.report(stats))
+        self.prune()
+        return session.id
+
+    def list(self):
+        """Saved profiles, newest first."""
+        if not os.path.isdir(self.root):
+            return []
+        profiles = {}
+        for entry in os.scandir(self.root):
+            profile_id, _, kind = entry.name.partition('.')
+            if PROFILE_ID.match(profile_id) and kind in ('prof', 'txt'):
+                st = entry.stat()
+                info = profiles.setdefault(profile_id, {'id': profile_id, 'created_at': st.st_mtime, 'bytes': 0})
+                info['created_at'] = min(info['created_at'], st.st_mtime)
+                info['bytes'] += st.st_size
+        return sorted(profiles.values(), key=lambda info: info['created_at'], reverse=True)
+
+    def prune(self):
+        profiles = self.list()
+        total = sum(info['bytes'] for info in profiles)
+        # The newest profile is always kept, even when it alone exceeds max_bytes
+        while len(profiles) > 1 and (len(profiles) > self.max_profiles or total > self.max_bytes):
+            oldest = profiles.pop()
+            total -= oldest['bytes']
+            for kind in ('prof', 'txt'):
+                try:
+                    os.unlink(self.path(oldest['id'], kind))
+                except FileNotFoundError:
+                    pass
@@ -0,0 +1,276 @@
+import hashlib
+import io
+import os
+import queue
+import re
+import stat
+import tarfile
+import threading
+import time
+import uuid
+import zipfile
+from urllib.parse import quote
+
+try:
+    import zstandard
+except ImportError:  # optional: only needed for tar.zst exports
+    zstandard = None
+
+ARCHIVE_FORMATS = {
+    'zip': 'application/zip',
+    'tar.gz': 'application/gzip',
+    'tar.zst': 'application/zstd',
+}
+
+# Already-compressed files are stored as-is in zip archives instead of being
+# deflated a second time.
+COMPRESSED_SUFFIXES = {
+    '.png', '.jpg', '.jpeg', '.gif', '.webp', '.ico', '.woff', '.woff2',
+    '.gz', '.tgz', '.zip', '.zst', '.br', '.mp4', '.mp3', '.pdf',
+}
+
+CHUNK_SIZE = 64 * 1024
+_DONE = object()
+
+
+class ArchiveError(Exception):
+    pass
+
+
+class _Cancelled(Exception):
+    pass
+
+
+def collect_files(directories, include_node_modules=False):
+    """List (path, arcname, stat) for every regular file under directories, sorted by arcname."""
+    files = []
+    for directory in directories:
+        base = os.path.dirname(directory)
+        for dirpath, dirnames, filenames in os.walk(directory):
+            if not include_node_modules and 'node_modules' in dirnames:
+                dirnames.remove('node_modules')
+            dirnames.sort()
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                st = os.lstat(path)
+                if stat.S_ISREG(st.st_mode):
+                    files.append((path, os.path.relpath(path, base), st))
+    files.sort(key=lambda f: f[1])
+    return files
+
+
+def fingerprint(files, archive_format):
+    """Hash of the file list with sizes, mtimes and modes; changes whenever any file does."""
+    h = hashlib.sha256(archive_format.encode('utf-8'))
+    for _, arcname, st in files:
+        h.update(f'{arcname}\0{st.st_size}\0{st.st_mtime_ns}\0{st.st_mode}\n'.encode('utf-8'))
+    return h.hexdigest()
+
+
+def content_disposition(filename):
+    """Attachment header for filename: a sanitized ASCII fallback plus the RFC 5987 UTF-8 form."""
+    fallback = re.sub(r'[^A-Za-z0-9._-]', '_', filename)
+    return f"attachment; filename=\"{fallback}\"; filename*=UTF-8''{quote(filename, safe='')}"
+
+
+class _QueueWriter:
+    """File-like sink that hands fixed-size chunks to the HTTP response and the cache file."""
+
+    def __init__(self, chunks, tee=None):
+        self.chunks = chunks
+        self.tee = tee
+        self.cancelled = threading.Event()
+        self._buffer = bytearray()
+
+    def write(self, data):
+        self._buffer += data
+        if len(self._buffer) >= CHUNK_SIZE:
+            self._emit()
+        return len(data)
+
+    def flush(self):
+        if self._buffer:
+            self._emit()
+
+    def _emit(self):
+        chunk = bytes(self._buffer)
+        self._buffer.clear()
+        if self.tee:
+            self.tee.write(chunk)
+        while True:
+            if self.cancelled.is_set():
+                raise _Cancelled()
+            try:
+                self.chunks.put(chunk, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+
+def _write_zip(files, writer):
+    with zipfile.ZipFile(writer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for path, arcname, st in files:
+            info = zipfile.ZipInfo.from_file(path, arcname)
+            if os.path.splitext(arcname)[1].lower() in COMPRESSED_SUFFIXES:
+                info.compress_type = zipfile.ZIP_STORED
+            else:
+                info.compress_type = zipfile.ZIP_DEFLATED
+            with open(path, 'rb') as src, archive.open(info, 'w', force_zip64=st.st_size > 2**31) as dst:
+                for chunk in iter(lambda: src.read(CHUNK_SIZE), b''):
+                    dst.write(chunk)
+
+
+def _write_tar(files, fileobj, mode):
+    with tarfile.open(fileobj=fileobj, mode=mode, bufsize=CHUNK_SIZE) as archive:
+        for path, arcname, _ in files:
+            archive.add(path, arcname, recursive=False)
+
+
+def _write_archive(files, archive_format, writer):
+    if archive_format == 'zip':
+        _write_zip(files, writer)
+    elif archive_format == 'tar.gz':
+        _write_tar(files, writer, 'w|gz')
+    else:
+        compressor = zstandard.ZstdCompressor(threads=-1).stream_writer(writer, closefd=False)
+        _write_tar(files, compressor, 'w|')
+        compressor.close()
+    writer.flush()
+
+
+def _write_tree_archive(tree, archive_format, writer):
+    """Write an in-memory {arcname: content} tree as an archive."""
+    now = time.time()
+    if archive_format == 'zip':
+        with zipfile.ZipFile(writer, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for arcname in sorted(tree):
+                info = zipfile.ZipInfo(arcname, time.localtime(now)[:6])
+                info.compress_type = zipfile.ZIP_DEFLATED
+                info.external_attr = 0o644 << 16
+                archive.writestr(info, tree[arcname])
+        writer.flush()
+        return
+
+    def write_tar(fileobj, mode):
+        with tarfile.open(fileobj=fileobj, mode=mode, bufsize=CHUNK_SIZE) as archive:
+            for arcname in sorted(tree):
+                content = tree[arcname]
+                data = content.encode('utf-8') if isinstance(content, str) else content
+                info = tarfile.TarInfo(arcname)
+                info.size = len(data)
+                info.mtime = now
+                info.mode = 0o644
+                archive.addfile(info, io.BytesIO(data))
+
+    if archive_format == 'tar.gz':
+        write_tar(writer, 'w|gz')
+    else:
+        compressor = zstandard.ZstdCompressor(threads=-1).stream_writer(writer, closefd=False)
+        write_tar(compressor, 'w|')
+        compressor.close()
+    writer.flush()
+
+
+def check_format(archive_format):
+    """Raise ArchiveError unless archive_format can be produced here."""
+    if archive_format not in ARCHIVE_FORMATS:
+        raise ArchiveError(f"Unsupported archive format '{archive_format}'")
+    if archive_format == 'tar.zst' and zstandard is None:
+        raise ArchiveError("tar.zst export requires the 'zstandard' package")
+
+
+def stream_archive(files, archive_format, cache_path=None):
+    """Yield the archive in chunks as it is written, never holding it whole in memory.
+
+    The archive is built on a background thread behind a bounded queue, so a
+    slow client throttles compression. With cache_path the bytes are also
+    teed to that file, which is published only once the archive is complete.
+    """
+    check_format(archive_format)
+    return _stream(lambda writer: _write_archive(files, archive_format, writer), cache_path)
+
+
+def stream_tree(tree, archive_format):
+    """Yield an archive of an in-memory {arcname: content} tree in chunks."""
+    check_format(archive_format)
+    return _stream(lambda writer: _write_tree_archive(tree, archive_format, writer))
+
+
+def _stream(write, cache_path=None):
+    partial_path = None
+    tee = None
+    if cache_path:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        partial_path = f'{cache_path}.{uuid.uuid4().hex}.partial'
+        tee = open(partial_path, 'wb')
+
+    chunks = queue.Queue(maxsize=16)
+    writer = _QueueWriter(chunks, tee)
+
+    def produce():
+        try:
+            write(writer)
+            chunks.put(_DONE)
+        except _Cancelled:
+            pass
+        except BaseException as e:
+            chunks.put(e)
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    completed = False
+    try:
+        while True:
+            item = chunks.get()
+            if item is _DONE:
+                completed = True
+                break
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        writer.cancelled.set()
+        while thread.is_alive():
+            # Unblock a producer stuck on a full queue after the client went away
+            try:
+                chunks.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        if tee:
+            tee.close()
+            if completed:
+                os.replace(partial_path, cache_path)
+            else:
+                os.unlink(partial_path)
+
+
+class ArchiveCache:
+    """Completed archives keyed by project, format and file fingerprint."""
+
+    def __init__(self, root=None):
+        self.root = root or os.environ.get('ARCHIVE_CACHE_DIR') or os.path.join(
+            os.path.dirname(os.path.abspath(__file__)), '.archive_cache'
+        )
+
+    def project_dir(self, project_name):
+        """Cache directory of a project: its name made filename-safe plus a hash of it.
+
+        The hash suffix keeps names such as '..' from resolving outside root
+        and names that sanitize alike from sharing a directory.
+        """
+        safe = re.sub(r'[^A-Za-z0-9._-]', '_', project_name)[:64]
+        digest = hashlib.sha256(project_name.encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.root, f'{safe}-{digest}')
+
+    def path_for(self, project_name, archive_format, digest):
+        return os.path.join(self.project_dir(project_name), f'{digest[:32]}.{archive_format}')
+
+    def prune(self, project_name, archive_format, keep):
+        """Drop cached archives of earlier versions of this project."""
+        project_dir = self.project_dir(project_name)
+        if not os.path.isdir(project_dir):
+            return
+        for entry in os.listdir(project_dir):
+            path = os.path.join(project_dir, entry)
+            if entry.endswith(f'.{archive_format}') and path != keep:
+                os.unlink(path)
@@ -0,0 +1,50 @@
+import bisect
+import hashlib
+import os
+
+
+class ProjectIndex:
+    """In-memory, sorted index of generated projects under a root directory.
+
+    The index is rebuilt only when the root directory's mtime changes, which
+    happens whenever a generated_* directory is created, renamed or removed,
+    so serving a listing costs one stat() instead of a directory walk.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.names = []
+        self.etag = None
+        self._mtime = None
+
+    def refresh(self):
+        """Rebuild the index if the root directory changed since the last build."""
+        mtime = os.stat(self.root).st_mtime_ns
+        if mtime == self._mtime:
+            return False
+
+        with os.scandir(self.root) as entries:
+            names = sorted(
+                entry.name[len('generated_'):-len('_frontend')]
+                for entry in entries
+                if entry.name.startswith('generated_')
+                and entry.name.endswith('_frontend')
+                and entry.is_dir()
+            )
+        self.names = names
+        self.etag = '"' + hashlib.sha1('\n'.join(names).encode('utf-8')).hexdigest() + '"'
+        self._mtime = mtime
+        return True
+
+    def page(self, prefix='', cursor=None, limit=None):
+        """Return (names, next_cursor) for names starting with prefix, after cursor."""
+        names = self.names
+        start = bisect.bisect_left(names, prefix)
+        if cursor:
+            start = max(start, bisect.bisect_right(names, cursor))
+        end = bisect.bisect_left(names, prefix + '\uffff') if prefix else len(names)
+
+        if limit is not None and start + limit < end:
+            selected = names[start:start + limit]
+            return selected, selected[-1]
+        return names[start:end], None
@@ -0,0 +1,58 @@
+import asyncio
+import fcntl
+import os
+
+import project_paths
+
+LOCKS_DIR = os.environ.get('PROJECT_LOCKS_DIR') or os.path.join(project_paths.PROJECTS_ROOT, '.locks')
+
+
+class ProjectLock:
+    """Exclusive per-project lock shared by API threads and worker processes.
+
+    Runs against the same project serialize; different projects lock
+    different files and proceed in parallel. Use `with` from worker code and
+    `async with` from the event loop, which polls instead of blocking it.
+    """
+
+    def __init__(self, project_name, poll_interval=0.05):
+        self.path = os.path.join(LOCKS_DIR, f'{project_paths.sanitize_project_name(project_name)}.lock')
+        self.poll_interval = poll_interval
+        self._file = None
+
+    def _open(self):
+        os.makedirs(LOCKS_DIR, exist_ok=True)
+        return open(self.path, 'a')
+
+    def __enter__(self):
+        lock_file = self._open()
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        self._file = lock_file
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+    async def __aenter__(self):
+        lock_file = self._open()
+        try:
+            while True:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    await asyncio.sleep(self.poll_interval)
+        except BaseException:
+            lock_file.close()
+            raise
+        self._file = lock_file
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.release()
+
+    def release(self):
+        if self._file is not None:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
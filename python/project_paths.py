@@ -0,0 +1,17 @@
+import os
+
+# Directory that holds every generated_<name>_frontend / generated_<name>_backend tree.
+PROJECTS_ROOT = os.environ.get('PROJECTS_ROOT') or os.path.dirname(os.path.abspath(__file__))
+
+
+def sanitize_project_name(project_name):
+    """Strip path separators so a project name cannot escape PROJECTS_ROOT."""
+    return project_name.replace(':', '').replace('\\', '').replace('/', '')
+
+
+def frontend_dir(project_name):
+    return os.path.join(PROJECTS_ROOT, f"generated_{sanitize_project_name(project_name)}_frontend")
+
+
+def backend_dir(project_name):
+    return os.path.join(PROJECTS_ROOT, f"generated_{sanitize_project_name(project_name)}_backend")
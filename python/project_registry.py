@@ -0,0 +1,107 @@
+import os
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import JSON, String, create_engine, event, select
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, sessionmaker
+
+DATABASE_URL = os.environ.get('DATABASE_URL') or 'sqlite:///' + os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'projects.db'
+)
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class ProjectRecord(Base):
+    __tablename__ = 'projects'
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str] = mapped_column(String(255), unique=True, index=True)
+    description: Mapped[Optional[str]]
+    framework: Mapped[str] = mapped_column(String(64))
+    language: Mapped[str] = mapped_column(String(64))
+    backend_type: Mapped[str] = mapped_column(String(64))
+    layout_type: Mapped[str] = mapped_column(String(64))
+    structure: Mapped[dict] = mapped_column(JSON)
+    frontend_path: Mapped[Optional[str]]
+    backend_path: Mapped[Optional[str]]
+    template_version: Mapped[Optional[str]] = mapped_column(String(64))
+    config_hash: Mapped[Optional[str]] = mapped_column(String(64))
+    generation_timings: Mapped[Optional[dict]] = mapped_column(JSON)
+    created_at: Mapped[datetime] = mapped_column(index=True)
+    updated_at: Mapped[datetime]
+
+
+class ProjectRegistry:
+    """SQLite-backed store of generated project metadata."""
+
+    def __init__(self, url=None):
+        url = url or DATABASE_URL
+        connect_args = {'check_same_thread': False} if url.startswith('sqlite') else {}
+        self.engine = create_engine(url, connect_args=connect_args)
+        if url.startswith('sqlite'):
+            event.listen(self.engine, 'connect', self._sqlite_pragmas)
+        Base.metadata.create_all(self.engine)
+        self.Session = sessionmaker(self.engine, expire_on_commit=False)
+
+    @staticmethod
+    def _sqlite_pragmas(dbapi_connection, _):
+        # WAL lets list queries run while a generation records its result
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('PRAGMA synchronous=NORMAL')
+        cursor.close()
+
+    def upsert(self, values: dict) -> ProjectRecord:
+        """Insert a project, or refresh the record of a project regenerated under the same name."""
+        now = datetime.now()
+        with self.Session.begin() as session:
+            record = session.scalar(select(ProjectRecord).where(ProjectRecord.name == values['name']))
+            if record is None:
+                record = ProjectRecord(created_at=now)
+                session.add(record)
+            for key, value in values.items():
+                setattr(record, key, value)
+            record.updated_at = now
+        return record
+
+    def get(self, project_id: int) -> Optional[ProjectRecord]:
+        with self.Session() as session:
+            return session.get(ProjectRecord, project_id)
+
+    def list(self, skip: int = 0, limit: int = 100) -> List[ProjectRecord]:
+        with self.Session() as session:
+            query = select(ProjectRecord).order_by(ProjectRecord.created_at.desc()).offset(skip).limit(limit)
+            return list(session.scalars(query))
+
+    def update(self, project_id: int, values: dict) -> Optional[ProjectRecord]:
+        with self.Session.begin() as session:
+            record = session.get(ProjectRecord, project_id)
+            if record is None:
+                return None
+            for key, value in values.items():
+                setattr(record, key, value)
+            record.updated_at = datetime.now()
+        return record
+
+    def delete(self, project_id: int) -> bool:
+        """Remove the registry entry; the generated directories are left on disk."""
+        with self.Session.begin() as session:
+            record = session.get(ProjectRecord, project_id)
+            if record is None:
+                return False
+            session.delete(record)
+        return True
+
+
+_registry = None
+
+
+def get_registry() -> ProjectRegistry:
+    """Return the process-wide registry, opening the database on first use."""
+    global _registry
+    if _registry is None:
+        _registry = ProjectRegistry()
+    return _registry
@@ -0,0 +1,130 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# Every RenderCache of this process, for take_cache_deltas()
+_caches = []
+_reported = {}
+_reported_lock = threading.Lock()
+
+
+def config_key(*parts):
+    """Canonical hash of config values: key order and whitespace do not change it."""
+    canonical = json.dumps(parts, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class RenderCache:
+    """Bounded LRU cache of rendered generator output.
+
+    Keys come from config_key() over the config subset a generator actually
+    renders plus the template version, so editing a template invalidates its
+    entries. ttl (seconds) is optional; 0 keeps entries until evicted.
+    """
+
+    def __init__(self, name, max_entries=None, ttl=None):
+        self.name = name
+        self.max_entries = max_entries or int(os.environ.get('RENDER_CACHE_SIZE', 256))
+        self.ttl = float(os.environ.get('RENDER_CACHE_TTL', 0)) if ttl is None else ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        _caches.append(self)
+
+    def get_or_render(self, key, render):
+        """Return the cached output for key, calling render() only on a miss."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (not entry[0] or entry[0] > now):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        value = render()
+        expires_at = now + self.ttl if self.ttl else 0
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def metrics(self):
+        return {
+            'name': self.name,
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'ttl': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+
+def take_cache_deltas():
+    """Return {cache name: (hits, misses, evictions)} gained since the previous call in this process."""
+    deltas = {}
+    with _reported_lock:
+        for cache in _caches:
+            current = (cache.hits, cache.misses, cache.evictions)
+            previous = _reported.get(cache, (0, 0, 0))
+            _reported[cache] = current
+            change = tuple(now - before for now, before in zip(current, previous))
+            if any(change):
+                total = deltas.get(cache.name, (0, 0, 0))
+                deltas[cache.name] = tuple(a + b for a, b in zip(total, change))
+    return deltas
+
+
+_written = OrderedDict()
+_written_lock = threading.Lock()
+_WRITTEN_LIMIT = 4096
+
+
+def write_if_changed(path, content):
+    """Write content to path unless the file already holds exactly that; return True if written.
+
+    Files this process wrote are recognised from their stat alone; anything
+    else is compared byte for byte before deciding to rewrite it.
+    """
+    data = content.encode('utf-8')
+    digest = hashlib.sha1(data).digest()
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        st = None
+
+    if st is not None and st.st_size == len(data):
+        with _written_lock:
+            recorded = _written.get(path)
+        if recorded == (st.st_mtime_ns, st.st_size, digest):
+            return False
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                _remember(path, st, digest)
+                return False
+
+    with open(path, 'wb') as f:
+        f.write(data)
+    _remember(path, os.stat(path), digest)
+    return True
+
+
+def _remember(path, st, digest):
+    with _written_lock:
+        _written[path] = (st.st_mtime_ns, st.st_size, digest)
+        _written.move_to_end(path)
+        while len(_written) > _WRITTEN_LIMIT:
+            _written.popitem(last=False)
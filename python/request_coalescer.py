@@ -0,0 +1,78 @@
+import asyncio
+import os
+import time
+from collections import OrderedDict
+
+
+class IdempotencyMismatch(Exception):
+    """An Idempotency-Key was reused with a different request body."""
+
+
+class RequestCoalescer:
+    """Runs identical requests once.
+
+    A request whose key matches one still in flight awaits that execution
+    instead of starting its own. Finished results are only replayed for
+    client-chosen keys (an Idempotency-Key header, passed with the body's
+    fingerprint): a retry within ttl seconds gets the stored result back, and
+    a reuse of the key with another body raises IdempotencyMismatch. A body
+    hash alone is not replayed once the run finished, since a later request
+    may have rewritten the same files in between. Failures are not stored, so
+    a retry after an error runs again.
+    """
+
+    def __init__(self, ttl=None, max_entries=None):
+        self.ttl = ttl or float(os.environ.get('IDEMPOTENCY_TTL', 300))
+        self.max_entries = max_entries or int(os.environ.get('IDEMPOTENCY_MAX_ENTRIES', 1024))
+        self.stats = {'executed': 0, 'coalesced': 0, 'replayed': 0}
+        self._in_flight = {}
+        self._results = OrderedDict()
+
+    async def run(self, key, compute, fingerprint=None):
+        """Return the result of compute() for key, sharing it between identical requests.
+
+        fingerprint is the request body's hash when key comes from an
+        Idempotency-Key header, None when key already is the body hash.
+        """
+        stored = self._results.get(key)
+        if stored is not None:
+            expires_at, stored_fingerprint, result = stored
+            if expires_at > time.monotonic():
+                check_fingerprint(stored_fingerprint, fingerprint)
+                self.stats['replayed'] += 1
+                return result
+            del self._results[key]
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            future, running_fingerprint = in_flight
+            check_fingerprint(running_fingerprint, fingerprint)
+            self.stats['coalesced'] += 1
+        else:
+            self.stats['executed'] += 1
+            future = asyncio.ensure_future(compute())
+            self._in_flight[key] = (future, fingerprint)
+            future.add_done_callback(lambda done: self._finish(key, fingerprint, done))
+        # A waiter that goes away must not cancel the run the others share
+        return await asyncio.shield(future)
+
+    def _finish(self, key, fingerprint, future):
+        self._in_flight.pop(key, None)
+        if fingerprint is None or future.cancelled() or future.exception() is not None:
+            return
+        self._results[key] = (time.monotonic() + self.ttl, fingerprint, future.result())
+        while len(self._results) > self.max_entries:
+            self._results.popitem(last=False)
+
+    def metrics(self):
+        return {
+            'in_flight': len(self._in_flight),
+            'stored': len(self._results),
+            'ttl': self.ttl,
+            **self.stats,
+        }
+
+
+def check_fingerprint(expected, actual):
+    if expected != actual:
+        raise IdempotencyMismatch("Idempotency-Key was already used with a different request body")
@@ -1,9 +1,10 @@
 import json
 import os
+import project_paths
+from template_engine import templates
+from output_backend import write_output
 
-class RouteGenerator:
-    def __init__(self):
-        self.template = '''
+templates.register('routes.index', '''
 // routes/index.js
 import express from 'express';
 import { {controllers} } from '../controllers';
@@ -14,13 +15,11 @@ const router = express.Router();
 {routes}
 
 export default router;
-'''
-
-        self.route_template = '''
+''')
+templates.register('routes.block', '''
 // {controller} Routes
-{routes_block}'''
-
-        self.controller_template = '''
+{routes_block}''')
+templates.register('routes.controller', '''
 // controllers/{name}Controller.js
 import { {name}Model } from '../models';
 
@@ -110,9 +109,8 @@ export const {name}Controller = {{
         }}
     }}
 }};
-'''
-
-        self.model_template = '''
+''')
+templates.register('routes.model', '''
 // models/{name}Model.js
 import mongoose from 'mongoose';
 
@@ -128,8 +126,9 @@ const {name}Schema = new mongoose.Schema({{
 }});
 
 export const {name}Model = mongoose.model('{name}', {name}Schema);
-'''
+''')
 
+class RouteGenerator:
     def generate_route(self, route):
         """Generate a single route based on the configuration."""
         method = route['method'].lower()
@@ -149,7 +148,7 @@ export const {name}Model = mongoose.model('{name}', {name}Schema);
         routes_code = []
         for controller, routes in controllers.items():
             routes_block = ''.join(self.generate_route(route) for route in routes)
-            routes_code.append(self.route_template.format(
+            routes_code.append(templates.get('routes.block').render(
                 controller=controller,
                 routes_block=routes_block
             ))
@@ -159,7 +158,7 @@ export const {name}Model = mongoose.model('{name}', {name}Schema);
         controllers_import = ', '.join(controller_names)
 
         # Generate the final code
-        code = self.template.format(
+        code = templates.get('routes.index').render(
             controllers=controllers_import,
             routes='\n'.join(routes_code)
         )
@@ -170,45 +169,18 @@ export const {name}Model = mongoose.model('{name}', {name}Schema);
         """Generate a controller file."""
         # Remove 'Controller' suffix if present
         base_name = name.replace('Controller', '')
-        return self.controller_template.format(name=base_name)
+        return templates.get('routes.controller').render(name=base_name)
 
     def generate_model(self, name):
         """Generate a model file."""
         # Remove 'Controller' suffix if present
         base_name = name.replace('Controller', '')
-        return self.model_template.format(name=base_name)
-
-    def save_files(self, project_path, routes_code, controller_names):
-        """Save all generated files."""
-        # Create necessary directories
-        dirs = ['routes', 'controllers', 'models', 'middleware']
-        for dir_name in dirs:
-            os.makedirs(os.path.join(project_path, 'src', dir_name), exist_ok=True)
+        return templates.get('routes.model').render(name=base_name)
 
-        # Save routes file
+    def save_routes(self, project_path, routes_code, output=None):
+        """Save the routes file and the validator middleware it imports."""
         routes_path = os.path.join(project_path, 'src', 'routes', 'index.js')
-        with open(routes_path, 'w', encoding='utf-8') as f:
-            f.write(routes_code)
-
-        # Save controllers and models
-        for controller_name in controller_names:
-            # Generate and save controller
-            controller_code = self.generate_controller(controller_name)
-            controller_path = os.path.join(
-                project_path, 'src', 'controllers',
-                f'{controller_name}.js'
-            )
-            with open(controller_path, 'w', encoding='utf-8') as f:
-                f.write(controller_code)
-
-            # Generate and save model
-            model_code = self.generate_model(controller_name)
-            model_path = os.path.join(
-                project_path, 'src', 'models',
-                f'{controller_name.replace("Controller", "Model")}.js'
-            )
-            with open(model_path, 'w', encoding='utf-8') as f:
-                f.write(model_code)
+        write_output(routes_path, routes_code, output)
 
         # Create validator middleware
         validator_code = '''
@@ -225,8 +197,34 @@ export const validateRequest = (schema) => {
 };
 '''
         validator_path = os.path.join(project_path, 'src', 'middleware', 'validator.js')
-        with open(validator_path, 'w', encoding='utf-8') as f:
-            f.write(validator_code)
+        write_output(validator_path, validator_code, output)
+        return routes_path
+
+    def save_controllers(self, project_path, controller_names, output=None):
+        """Generate and save one controller per controller name."""
+        for controller_name in controller_names:
+            controller_code = self.generate_controller(controller_name)
+            controller_path = os.path.join(
+                project_path, 'src', 'controllers',
+                f'{controller_name}.js'
+            )
+            write_output(controller_path, controller_code, output)
+
+    def save_models(self, project_path, controller_names, output=None):
+        """Generate and save the model each controller uses."""
+        for controller_name in controller_names:
+            model_code = self.generate_model(controller_name)
+            model_path = os.path.join(
+                project_path, 'src', 'models',
+                f'{controller_name.replace("Controller", "Model")}.js'
+            )
+            write_output(model_path, model_code, output)
+
+    def save_files(self, project_path, routes_code, controller_names, output=None):
+        """Save all generated files."""
+        routes_path = self.save_routes(project_path, routes_code, output)
+        self.save_controllers(project_path, controller_names, output)
+        self.save_models(project_path, controller_names, output)
 
         return {
             'routes_file': routes_path,
@@ -235,7 +233,7 @@ export const validateRequest = (schema) => {
             'middleware': ['validator.js']
         }
 
-def main(config_json):
+def main(config_json, project_path):
     """Main function to generate the routes and related files."""
     try:
         config = json.loads(config_json) if isinstance(config_json, str) else config_json
@@ -246,7 +244,7 @@ def main(config_json):
         
         # Save all files
         files = generator.save_files(
-            'c:/Users/usuario/Downloads/project-bolt-sb1-rqbh4gta/project',
+            project_path,
             routes_code,
             controller_names
         )
@@ -275,5 +273,5 @@ if __name__ == '__main__':
         ]
     }
     
-    result = main(example_config)
+    result = main(example_config, project_paths.backend_dir('example'))
     print(json.dumps(result, indent=2))
\ No newline at end of file
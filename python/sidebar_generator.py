@@ -1,9 +1,11 @@
 import json
 import os
+import project_paths
+from template_engine import templates
+from render_cache import RenderCache, config_key
+from output_backend import write_output
 
-class SidebarGenerator:
-    def __init__(self):
-        self.template = '''
+templates.register('sidebar', '''
 import React, { useState } from 'react';
 import { {icons} } from 'lucide-react';
 
@@ -76,7 +78,7 @@ const Sidebar: React.FC<SidebarProps> = ({{
     if (!enabled) return null;
 
     return (
-        <aside style={sidebarStyles}>
+        <aside style={{sidebarStyles}}>
             {/* Header Section */}
             <div className="p-4 border-b border-gray-200">
                 {features.collapsible && (
@@ -124,7 +126,7 @@ const Sidebar: React.FC<SidebarProps> = ({{
             {/* Navigation Tabs */}
             <nav className="flex-1 overflow-y-auto p-2">
                 {tabs.map((tab) => {{
-                    const Icon = {icons}[tab.icon];
+                    const Icon = ({{ {icons} }} as any)[tab.icon];
                     const isActive = activeTab === tab.id;
 
                     return (
@@ -176,8 +178,11 @@ const Sidebar: React.FC<SidebarProps> = ({{
 }};
 
 export default Sidebar;
-'''
+''')
+
+render_cache = RenderCache('sidebar')
 
+class SidebarGenerator:
     def generate_sidebar_component(self, config):
         """Generate the sidebar component based on the configuration."""
         # Extract unique icons from tabs
@@ -185,22 +190,23 @@ export default Sidebar;
         icons.update(['ChevronLeft', 'ChevronRight', 'Search', 'Bell'])  # Add default icons
         icons_import = ', '.join(sorted(icons))
 
-        # Generate the component code
-        code = self.template.replace('{icons}', icons_import)
-        return code
+        # Generate the component code, reusing the output for an identical icon set
+        template = templates.get('sidebar')
+        return render_cache.get_or_render(
+            config_key(template.version, icons_import),
+            lambda: template.render(icons=icons_import)
+        )
 
-    def save_component(self, project_path, code):
+    def save_component(self, project_path, code, output=None):
         """Save the generated sidebar component."""
         components_dir = os.path.join(project_path, 'src', 'components', 'sidebar')
-        os.makedirs(components_dir, exist_ok=True)
 
         file_path = os.path.join(components_dir, 'Sidebar.tsx')
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(code)
+        write_output(file_path, code, output)
 
         return file_path
 
-def main(config_json):
+def main(config_json, project_path):
     """Main function to generate the sidebar component."""
     try:
         config = json.loads(config_json) if isinstance(config_json, str) else config_json
@@ -208,10 +214,7 @@ def main(config_json):
         code = generator.generate_sidebar_component(config)
         
         # Save the component
-        file_path = generator.save_component(
-            'c:/Users/usuario/Downloads/project-bolt-sb1-rqbh4gta/project',
-            code
-        )
+        file_path = generator.save_component(project_path, code)
         
         return {
             'status': 'success',
@@ -262,5 +265,5 @@ if __name__ == '__main__':
         ]
     }
     
-    result = main(example_config)
+    result = main(example_config, project_paths.frontend_dir('example'))
     print(json.dumps(result, indent=2))
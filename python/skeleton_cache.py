@@ -0,0 +1,208 @@
+import asyncio
+import errno
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+from io_executor import io_executor
+from offline_install import LockfileInstaller
+from package_store import PackageStore
+
+# Bump when the layout of a cached skeleton changes in a way the dependency
+# sets alone do not capture (e.g. a different scaffold command).
+SKELETON_FORMAT = 1
+
+# One build per skeleton path at a time within this process; concurrent
+# generations of a new template version wait for the first build.
+_build_locks = {}
+
+# Linux FICLONE ioctl: copy-on-write clone on btrfs/xfs/overlayfs.
+FICLONE = 0x40049409
+
+
+def _reflink(src, dst):
+    """Clone src into dst sharing extents. Raises OSError if unsupported."""
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        try:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+        except OSError:
+            fdst.close()
+            os.unlink(dst)
+            raise
+    shutil.copystat(src, dst)
+
+
+def _copy_file(src, dst):
+    try:
+        _reflink(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def _clone_file(src, dst):
+    """Materialize one file from the cache as cheaply as the filesystem allows.
+
+    Installed packages under node_modules are hardlinked, which keeps them
+    pointing at the shared package store: npm replaces files by rename, so the
+    shared inode is never written through. Project files are reflinked when
+    possible and copied otherwise, since users edit them. An existing dst may
+    be such a hardlink, so it is only ever replaced by rename, never opened.
+    """
+    tmp_path = f'{dst}.skeleton-tmp'
+    if f'{os.sep}node_modules{os.sep}' in src:
+        try:
+            try:
+                os.link(src, dst)
+            except FileExistsError:
+                # Regenerating over an existing project
+                _remove_stale(tmp_path)
+                os.link(src, tmp_path)
+                os.replace(tmp_path, dst)
+            return dst
+        except OSError as e:
+            if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP):
+                raise
+    if os.path.lexists(dst):
+        _remove_stale(tmp_path)
+        _copy_file(src, tmp_path)
+        os.replace(tmp_path, dst)
+    else:
+        _copy_file(src, dst)
+    return dst
+
+
+def _clone_tree(source, dest):
+    """Materialize source over dest, which may hold a previous copy of it.
+
+    Like copytree(dirs_exist_ok=True), but symlinks (npm's node_modules/.bin)
+    that already exist are replaced by rename instead of failing.
+    """
+    for dirpath, dirnames, filenames in os.walk(source):
+        target_dir = os.path.join(dest, os.path.relpath(dirpath, source))
+        os.makedirs(target_dir, exist_ok=True)
+        for name in dirnames + filenames:
+            path = os.path.join(dirpath, name)
+            target = os.path.join(target_dir, name)
+            if os.path.islink(path):
+                tmp_path = f'{target}.skeleton-tmp'
+                _remove_stale(tmp_path)
+                os.symlink(os.readlink(path), tmp_path)
+                os.replace(tmp_path, target)
+            elif name in filenames:
+                _clone_file(path, target)
+        shutil.copystat(dirpath, target_dir)
+
+
+def _remove_stale(path):
+    """Drop a temp file left by an interrupted run; it may link into the store."""
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+class SkeletonCache:
+    """Versioned cache of installed frontend/backend base trees.
+
+    Each skeleton is built once per dependency set (package.json, lockfile and
+    node_modules) and new projects are materialized from it by linking/copying
+    instead of running npm.
+    """
+
+    def __init__(self, root=None, package_store=None, installer=None):
+        self.root = root or os.environ.get('SKELETON_CACHE_DIR') or os.path.join(
+            os.path.dirname(os.path.abspath(__file__)), '.skeleton_cache'
+        )
+        self.package_store = package_store or PackageStore()
+        self.installer = installer or LockfileInstaller()
+
+    def template_version(self, kind, package_json):
+        """Hash the dependency sets so a change in them yields a new skeleton."""
+        key = json.dumps({
+            'kind': kind,
+            'format': SKELETON_FORMAT,
+            'dependencies': package_json.get('dependencies', {}),
+            'devDependencies': package_json.get('devDependencies', {}),
+        }, sort_keys=True)
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()[:16]
+
+    def skeleton_path(self, kind, version):
+        return os.path.join(self.root, kind, version)
+
+    async def ensure(self, kind, package_json, scaffold=None, progress=None):
+        """Return the path of the skeleton for package_json, building it if missing.
+
+        progress, if given, is called as progress('install', status, kind=kind); jobs
+        time each kind on its own (install_frontend, install_backend).
+        """
+        progress = progress or (lambda stage, status, **detail: None)
+        version = self.template_version(kind, package_json)
+        path = self.skeleton_path(kind, version)
+        if os.path.isdir(path):
+            progress('install', 'cached', kind=kind)
+            return path
+
+        async with _build_locks.setdefault(path, asyncio.Lock()):
+            if os.path.isdir(path):
+                progress('install', 'cached', kind=kind)
+                return path
+            progress('install', 'running', kind=kind)
+            await self._build(kind, version, path, package_json, scaffold)
+            progress('install', 'done', kind=kind)
+            return path
+
+    def _make_build_dir(self, version, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return tempfile.mkdtemp(prefix=f'.build-{version}-', dir=os.path.dirname(path))
+
+    def _write_package_json(self, kind, tree, package_json):
+        os.makedirs(tree, exist_ok=True)
+        with open(os.path.join(tree, 'package.json'), 'w') as f:
+            json.dump(dict(package_json, name=f'skeleton-{kind}'), f, indent=2)
+
+    async def _build(self, kind, version, path, package_json, scaffold):
+        build_dir = await io_executor.run(self._make_build_dir, version, path)
+        try:
+            tree = os.path.join(build_dir, 'tree')
+            if scaffold:
+                await scaffold(tree)
+            await io_executor.run(self._write_package_json, kind, tree, package_json)
+            await self.installer.install(kind, version, tree)
+            await io_executor.run(self.package_store.import_tree, os.path.join(tree, 'node_modules'))
+
+            try:
+                os.rename(tree, path)
+            except OSError:
+                # Another process published the same version first.
+                if not os.path.isdir(path):
+                    raise
+        finally:
+            await io_executor.run(shutil.rmtree, build_dir, ignore_errors=True)
+
+        print(f"Built {kind} skeleton {version} at: {path}")
+        await io_executor.run(self.prune, kind, version)
+        return path
+
+    async def materialize(self, kind, package_json, dest, scaffold=None, progress=None):
+        """Populate dest from the cached skeleton for package_json.
+
+        dest is normally a staging copy of the project (see
+        staged_writes.stage_directory), swapped in by the caller once complete.
+        """
+        source = await self.ensure(kind, package_json, scaffold, progress)
+        await io_executor.run(_clone_tree, source, dest)
+        return dest
+
+    def prune(self, kind, keep):
+        """Remove skeletons of kind built for dependency sets no longer in use."""
+        kind_dir = os.path.join(self.root, kind)
+        pruned = False
+        for entry in os.listdir(kind_dir):
+            if entry != keep and not entry.startswith('.build-'):
+                shutil.rmtree(os.path.join(kind_dir, entry), ignore_errors=True)
+                pruned = True
+        if pruned:
+            self.package_store.gc()
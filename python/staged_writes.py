@@ -0,0 +1,204 @@
+import ctypes
+import ctypes.util
+import errno
+import os
+import shutil
+import uuid
+
+AT_FDCWD = -100
+RENAME_EXCHANGE = 2
+
+FSYNC = os.environ.get('GENERATOR_FSYNC', '1') == '1'
+
+_libc = None
+
+
+def _renameat2():
+    global _libc
+    if _libc is None:
+        _libc = ctypes.CDLL(ctypes.util.find_library('c') or None, use_errno=True)
+    return getattr(_libc, 'renameat2', None)
+
+
+def exchange(a, b):
+    """Atomically swap two paths with renameat2(RENAME_EXCHANGE); False where unsupported."""
+    renameat2 = _renameat2()
+    if renameat2 is None:
+        return False
+    if renameat2(AT_FDCWD, os.fsencode(a), AT_FDCWD, os.fsencode(b), RENAME_EXCHANGE) == 0:
+        return True
+    error = ctypes.get_errno()
+    if error in (errno.ENOSYS, errno.EINVAL, errno.EXDEV, errno.ENOTSUP):
+        # Old kernel or a filesystem without exchange support
+        return False
+    raise OSError(error, os.strerror(error), a)
+
+
+def _fsync_path(path, directory=False):
+    fd = os.open(path, os.O_RDONLY | (os.O_DIRECTORY if directory else 0))
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _link_tree(source, dest):
+    """Mirror source into dest with hard links, so only changed files cost a copy."""
+    for dirpath, dirnames, filenames in os.walk(source):
+        target_dir = os.path.join(dest, os.path.relpath(dirpath, source))
+        os.makedirs(target_dir, exist_ok=True)
+        for name in dirnames:
+            path = os.path.join(dirpath, name)
+            if os.path.islink(path):
+                os.symlink(os.readlink(path), os.path.join(target_dir, name))
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            target = os.path.join(target_dir, name)
+            if os.path.islink(path):
+                os.symlink(os.readlink(path), target)
+                continue
+            try:
+                os.link(path, target)
+            except OSError:
+                shutil.copy2(path, target)
+
+
+def replace_file(path, data):
+    """Write data to path through a new inode, so a hard-linked file is never written into."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f'{path}.{uuid.uuid4().hex}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return path
+
+
+def stage_directory(live):
+    """Start a staging copy of the directory live next to it and return its path.
+
+    An existing live tree is mirrored with hard links, so files must be
+    replaced (replace_file, rename) rather than written into.
+    """
+    staging = os.path.join(os.path.dirname(live), f'.{os.path.basename(live)}.staging-{uuid.uuid4().hex[:8]}')
+    if os.path.isdir(live):
+        _link_tree(live, staging)
+    else:
+        os.makedirs(staging)
+    return staging
+
+
+def publish_directory(staging, live):
+    """Swap a fully staged directory in for live and remove the tree it replaced.
+
+    A new live path is a plain rename and an existing one is exchanged
+    atomically. Where the exchange is unsupported the old tree is renamed
+    aside first: live is briefly missing, but never half-written.
+    """
+    if FSYNC:
+        _fsync_path(staging, directory=True)
+    if not os.path.isdir(live):
+        os.rename(staging, live)
+    elif exchange(staging, live):
+        shutil.rmtree(staging, ignore_errors=True)
+    else:
+        previous = f'{staging}.previous'
+        os.rename(live, previous)
+        os.rename(staging, live)
+        shutil.rmtree(previous, ignore_errors=True)
+    if FSYNC:
+        _fsync_path(os.path.dirname(live), directory=True)
+
+
+class StagedTree:
+    """A batch of file writes and removals under root, applied all at once.
+
+    Changes to each top-level directory are staged in a hard-linked sibling
+    copy of it, flushed with one fsync pass, and swapped into place with
+    renameat2(RENAME_EXCHANGE), so readers such as Vite's watcher see either
+    the old tree or the new one. Where the exchange is unsupported every
+    staged file is moved in with its own atomic rename instead.
+    """
+
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+        self.writes = {}
+        self.removals = set()
+
+    def write(self, rel, data):
+        self.writes[rel] = data
+        self.removals.discard(rel)
+
+    def remove(self, rel):
+        self.removals.add(rel)
+        self.writes.pop(rel, None)
+
+    def commit(self):
+        """Apply every staged change; return the relative paths that were written."""
+        groups = {}
+        for rel in list(self.writes) + list(self.removals):
+            top, _, rest = rel.replace(os.sep, '/').partition('/')
+            groups.setdefault(top if rest else '', set()).add(rel)
+
+        os.makedirs(self.root, exist_ok=True)
+        for top, rels in groups.items():
+            if top:
+                self._commit_directory(top, rels)
+            else:
+                self._commit_root_files(rels)
+        if FSYNC and groups:
+            _fsync_path(self.root, directory=True)
+        return list(self.writes)
+
+    def _write_files(self, base, rels, strip):
+        written = []
+        for rel in rels:
+            if rel not in self.writes:
+                continue
+            path = os.path.join(base, rel[strip:])
+            written.append(replace_file(path, self.writes[rel]))
+        if FSYNC:
+            for path in written:
+                _fsync_path(path)
+            for directory in {os.path.dirname(path) for path in written}:
+                _fsync_path(directory, directory=True)
+        return written
+
+    def _commit_directory(self, top, rels):
+        live = os.path.join(self.root, top)
+        staging = os.path.join(self.root, f'.{top}.staging-{uuid.uuid4().hex[:8]}')
+        strip = len(top) + 1
+        try:
+            if os.path.isdir(live):
+                _link_tree(live, staging)
+            else:
+                os.makedirs(staging)
+            self._write_files(staging, rels, strip)
+            for rel in rels & self.removals:
+                path = os.path.join(staging, rel[strip:])
+                if os.path.lexists(path):
+                    os.unlink(path)
+
+            if not os.path.isdir(live):
+                os.rename(staging, live)
+                return
+            if exchange(staging, live):
+                return
+            # No atomic exchange here: move each staged file in on its own
+            for rel in rels:
+                source = os.path.join(staging, rel[strip:])
+                target = os.path.join(live, rel[strip:])
+                if rel in self.writes:
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    os.replace(source, target)
+                elif os.path.lexists(target):
+                    os.unlink(target)
+        finally:
+            # After an exchange this is the previous tree
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def _commit_root_files(self, rels):
+        self._write_files(self.root, rels, 0)
+        for rel in rels & self.removals:
+            path = os.path.join(self.root, rel)
+            if os.path.lexists(path):
+                os.unlink(path)
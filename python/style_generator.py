@@ -1,5 +1,7 @@
 import json
 import os
+import project_paths
+from output_backend import write_output
 
 def generate_css_variables(style_config, project_name):
     try:
@@ -46,19 +48,13 @@ def generate_css_variables(style_config, project_name):
     except Exception as e:
         raise Exception(f"Error generating CSS variables for project {project_name}: {str(e)}")
 
-def save_css_file(css_content, project_name):
+def save_css_file(css_content, project_name, output=None):
     try:
-        # Sanitize project name to ensure valid path
-        project_name = project_name.replace(':', '').replace('\\', '').replace('/', '')
-        
         # Define the output path using the project name
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        frontend_dir = os.path.join(current_dir, f"generated_{project_name}_frontend")
+        frontend_dir = project_paths.frontend_dir(project_name)
         output_path = os.path.join(frontend_dir, "src", "styles", "variables.css")
         
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(css_content)
+        write_output(output_path, css_content, output)
         print(f"CSS file generated successfully at: {output_path}")
         return output_path
     except Exception as e:
@@ -0,0 +1,186 @@
+import hashlib
+import os
+import re
+import threading
+import timeit
+
+# `{{` and `}}` are escaped braces, `{identifier}` is a placeholder. Any other
+# brace (JSX expressions such as `{config.title}` or `{ a, b }`) is literal text.
+TOKEN_PATTERN = re.compile(r'\{\{|\}\}|\{([A-Za-z_][A-Za-z0-9_]*)\}')
+
+
+class TemplateError(Exception):
+    pass
+
+
+class Template:
+    """A template tokenized once into literal and placeholder segments.
+
+    render() fills the placeholder slots and joins the segments in a single
+    pass, instead of copying the whole string once per str.replace call.
+    """
+
+    def __init__(self, source, name='<template>'):
+        self.name = name
+        self.source = source
+        # Changes whenever the source does; render caches key on it
+        self.version = hashlib.sha1(source.encode('utf-8')).hexdigest()[:16]
+        self._parts, self._slots = self._compile(source)
+        self.placeholders = frozenset(placeholder for _, placeholder in self._slots)
+
+    @staticmethod
+    def _compile(source):
+        parts = []
+        slots = []
+        literal = []
+        position = 0
+        for match in TOKEN_PATTERN.finditer(source):
+            literal.append(source[position:match.start()])
+            token = match.group(0)
+            if match.group(1) is None:
+                literal.append(token[0])
+            else:
+                parts.append(''.join(literal))
+                literal = []
+                slots.append((len(parts), match.group(1)))
+                parts.append(None)
+            position = match.end()
+        literal.append(source[position:])
+        parts.append(''.join(literal))
+        return parts, slots
+
+    def render(self, **values):
+        """Render with values for every placeholder; unknown or missing names raise TemplateError."""
+        if values.keys() != self.placeholders:
+            missing = self.placeholders - values.keys()
+            unknown = values.keys() - self.placeholders
+            problems = []
+            if missing:
+                problems.append(f"missing {', '.join(sorted(missing))}")
+            if unknown:
+                problems.append(f"unknown {', '.join(sorted(unknown))}")
+            raise TemplateError(f"Template {self.name}: {'; '.join(problems)}")
+
+        parts = self._parts.copy()
+        for index, placeholder in self._slots:
+            parts[index] = str(values[placeholder])
+        return ''.join(parts)
+
+
+class TemplateRegistry:
+    """Process-wide store of compiled templates and static catalogs.
+
+    Generator modules register their built-in template sources and catalog
+    builders at import; nothing is compiled or built until first use, and every
+    handler instance then shares the same objects. A file named
+    `<template name>.tpl` in templates_dir overrides the built-in source, and
+    with reload enabled it is recompiled whenever its mtime changes.
+    """
+
+    def __init__(self, templates_dir=None, reload=None):
+        self.templates_dir = templates_dir or os.environ.get('TEMPLATES_DIR') or os.path.join(
+            os.path.dirname(os.path.abspath(__file__)), 'templates'
+        )
+        self.reload = os.environ.get('TEMPLATE_RELOAD', '0') == '1' if reload is None else reload
+        self._sources = {}
+        self._compiled = {}
+        self._catalog_builders = {}
+        self._catalogs = {}
+        self._lock = threading.Lock()
+
+    def register(self, name, source):
+        """Register the built-in source of a template; it is compiled on first get()."""
+        self._sources[name] = source
+        self._compiled.pop(name, None)
+
+    def register_catalog(self, name, builder):
+        """Register a function that builds a static catalog on first use."""
+        self._catalog_builders[name] = builder
+        self._catalogs.pop(name, None)
+
+    def _override_path(self, name):
+        return os.path.join(self.templates_dir, f'{name}.tpl')
+
+    def _override_mtime(self, name):
+        try:
+            return os.stat(self._override_path(name)).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def get(self, name):
+        """Return the compiled template, preferring an on-disk override."""
+        entry = self._compiled.get(name)
+        if entry is not None and not self.reload:
+            return entry[1]
+
+        mtime = self._override_mtime(name)
+        if entry is not None and entry[0] == mtime:
+            return entry[1]
+
+        with self._lock:
+            entry = self._compiled.get(name)
+            if entry is not None and entry[0] == mtime:
+                return entry[1]
+            if mtime is not None:
+                with open(self._override_path(name), encoding='utf-8') as f:
+                    source = f.read()
+            elif name in self._sources:
+                source = self._sources[name]
+            else:
+                raise TemplateError(f"Unknown template '{name}'")
+            template = Template(source, name)
+            self._compiled[name] = (mtime, template)
+            return template
+
+    def catalog(self, name):
+        """Return a shared catalog; callers must treat it as read-only."""
+        catalog = self._catalogs.get(name)
+        if catalog is None:
+            with self._lock:
+                catalog = self._catalogs.get(name)
+                if catalog is None:
+                    catalog = self._catalog_builders[name]()
+                    self._catalogs[name] = catalog
+        return catalog
+
+    def clear(self):
+        """Drop compiled templates and built catalogs so they load again on next use."""
+        with self._lock:
+            self._compiled.clear()
+            self._catalogs.clear()
+
+
+templates = TemplateRegistry()
+
+
+if __name__ == '__main__':
+    # Compare against the chained str.replace rendering the generators used to do
+    source = '''
+import React from 'react';
+import {{ {imports} }} from '../components/reusable';
+
+const {name}: React.FC = () => {{
+    return (
+        <div className="grid grid-cols-{columns} gap-{gap} p-{padding} m-{margin} max-w-{maxWidth}">
+            {components}
+        </div>
+    );
+}};
+''' * 20
+    values = {
+        'name': 'Dashboard', 'imports': 'Navbar, Card', 'columns': '12', 'gap': '4',
+        'padding': '4', 'margin': '4', 'maxWidth': '1200', 'components': '<Card />',
+    }
+    template = Template(source, 'benchmark')
+
+    def chained_replace():
+        code = source
+        for key, value in values.items():
+            code = code.replace('{' + key + '}', value)
+        return code
+
+    runs = 10000
+    engine_time = timeit.timeit(lambda: template.render(**values), number=runs)
+    replace_time = timeit.timeit(chained_replace, number=runs)
+    print(f"Template.render:     {engine_time:.3f}s for {runs} components")
+    print(f"chained str.replace: {replace_time:.3f}s for {runs} components")
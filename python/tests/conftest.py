@@ -0,0 +1,29 @@
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+# The generator modules are flat files in python/, imported by name
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def generation_env(tmp_path, monkeypatch):
+    """Point every state directory at tmp_path and put load_test's fake npm on PATH."""
+    import offline_install
+    import project_lock
+    import project_paths
+    import project_registry
+    from load_test import prepare_environment
+
+    settings = SimpleNamespace(scaffold_ms=50, install_ms=50, npm_fail_rate=0, worker_pool_size=0, io_threads=None)
+    env = prepare_environment(str(tmp_path), settings)
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    # Read once at import time by these modules
+    monkeypatch.setattr(project_paths, 'PROJECTS_ROOT', env['PROJECTS_ROOT'])
+    monkeypatch.setattr(project_lock, 'LOCKS_DIR', os.path.join(env['PROJECTS_ROOT'], '.locks'))
+    monkeypatch.setattr(offline_install, 'LOCKFILES_DIR', env['LOCKFILES_DIR'])
+    monkeypatch.setattr(project_registry, '_registry', project_registry.ProjectRegistry(env['DATABASE_URL']))
+    return env
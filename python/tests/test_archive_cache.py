@@ -0,0 +1,28 @@
+import os
+
+from project_archive import ArchiveCache
+
+
+def test_cache_paths_stay_under_the_root(tmp_path):
+    cache = ArchiveCache(str(tmp_path / 'cache'))
+    root = os.path.realpath(cache.root)
+    for name in ('..', '.', '../..', 'a/../../b', 'demo'):
+        path = os.path.realpath(cache.path_for(name, 'zip', 'f' * 64))
+        assert os.path.dirname(os.path.dirname(path)) == root
+
+
+def test_prune_only_touches_the_project_directory(tmp_path):
+    cache = ArchiveCache(str(tmp_path / 'cache'))
+    outside = tmp_path / 'keep-me.zip'
+    outside.write_bytes(b'not a cache entry')
+    keep = cache.path_for('..', 'zip', 'a' * 64)
+    old = cache.path_for('..', 'zip', 'b' * 64)
+    os.makedirs(os.path.dirname(keep))
+    for path in (keep, old):
+        with open(path, 'wb') as f:
+            f.write(b'zip')
+
+    cache.prune('..', 'zip', keep=keep)
+
+    assert os.path.exists(keep) and not os.path.exists(old)
+    assert outside.exists()
@@ -0,0 +1,44 @@
+import asyncio
+import json
+import os
+
+import project_registry
+from creacionproyecto import ProjectService, convert_simple_config
+
+PROJECTS = 12
+
+
+def test_parallel_generations_build_separate_trees(generation_env):
+    env = generation_env
+    names = [f'parallel{n}' for n in range(PROJECTS)]
+    cwd = os.getcwd()
+
+    async def generate_all():
+        return await asyncio.gather(*(
+            ProjectService.create_project(convert_simple_config({
+                'projectName': name,
+                'description': f'Project {name}',
+                'framework': 'Vite + React',
+                'language': 'TypeScript',
+                'backend': 'Node + Express',
+            }))
+            for name in names
+        ))
+
+    projects = asyncio.run(generate_all())
+
+    assert os.getcwd() == cwd
+    assert [project.name for project in projects] == names
+    for name in names:
+        for side in ('frontend', 'backend'):
+            tree = os.path.join(env['PROJECTS_ROOT'], f'generated_{name}_{side}')
+            with open(os.path.join(tree, 'package.json'), encoding='utf-8') as f:
+                assert json.load(f)['name'] == f'{name}-{side}'
+            assert os.path.isdir(os.path.join(tree, 'node_modules'))
+        frontend = os.path.join(env['PROJECTS_ROOT'], f'generated_{name}_frontend')
+        assert os.path.isfile(os.path.join(frontend, 'src', 'App.tsx'))
+        assert os.path.isdir(os.path.join(frontend, 'src', 'components'))
+        backend = os.path.join(env['PROJECTS_ROOT'], f'generated_{name}_backend')
+        assert os.path.isfile(os.path.join(backend, 'src', 'index.js'))
+        assert os.path.isdir(os.path.join(backend, 'src', 'controllers'))
+    assert len(project_registry.get_registry().list(0, 100)) == PROJECTS
@@ -0,0 +1,66 @@
+import os
+
+from component_handler import ComponentHandler
+from generation_manifest import GenerationManifest
+from output_backend import DiskOutput
+
+
+def components_config(names):
+    return {'pages': {'home': {'components': [
+        {
+            'id': name,
+            'name': name,
+            'componentType': 'reusable',
+            'features': {'reusableComponents': ['card']},
+            'layoutComponente': {'lg': [{'i': f'item-card-{n}', 'x': 0, 'y': n, 'w': 3, 'h': 2} for n in range(2)]},
+        }
+        for name in names
+    ]}}}
+
+
+def generate(root, names):
+    output = DiskOutput(root, 'structure')
+    components = ComponentHandler().process_components_config(components_config(names), root, output)
+    return components, output.finish()
+
+
+def test_rerun_with_the_same_config_writes_nothing(tmp_path):
+    root = str(tmp_path)
+    _, first = generate(root, ['Header', 'Footer'])
+    assert first['written'] == 2 and first['unchanged'] == 0
+
+    paths = [os.path.join(dirpath, name) for dirpath, _, names in os.walk(root) for name in names]
+    mtimes = {path: os.stat(path).st_mtime_ns for path in paths if not path.endswith('.json')}
+    _, second = generate(root, ['Header', 'Footer'])
+    assert second == {'written': 0, 'unchanged': 2, 'removed': 0, 'bytes': 0}
+    assert {path: os.stat(path).st_mtime_ns for path in mtimes} == mtimes
+
+
+def test_files_an_earlier_run_produced_are_removed(tmp_path):
+    root = str(tmp_path)
+    components, _ = generate(root, ['Header', 'Footer'])
+    footer = components[1]['component_path']
+    assert os.path.isfile(footer)
+
+    _, counts = generate(root, ['Header'])
+    assert counts == {'written': 0, 'unchanged': 1, 'removed': 1, 'bytes': 0}
+    assert not os.path.exists(footer)
+    assert os.path.isfile(components[0]['component_path'])
+
+
+def test_hand_edited_orphans_and_other_producers_are_kept(tmp_path):
+    root = str(tmp_path)
+    styles = GenerationManifest(root, 'styles')
+    styles.write(os.path.join(root, 'src', 'styles', 'variables.css'), ':root {}\n')
+    styles.finish()
+
+    components, _ = generate(root, ['Header', 'Footer'])
+    footer = components[1]['component_path']
+    with open(footer, 'a', encoding='utf-8') as f:
+        f.write('// edited by hand\n')
+
+    _, counts = generate(root, [])
+    assert counts['removed'] == 1
+    assert os.path.isfile(footer)
+    assert not os.path.exists(components[0]['component_path'])
+    assert os.path.isfile(os.path.join(root, 'src', 'styles', 'variables.css'))
@@ -0,0 +1,59 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+import api
+from command_runner import CommandError, CommandTimeout
+from job_queue import JobQueue
+from pipeline import Pipeline
+
+
+def run_job(run):
+    async def main():
+        job = JobQueue().submit('generate-project', run)
+        await job.task
+        return job
+
+    return asyncio.run(main())
+
+
+def test_step_timeouts_are_a_distinct_job_error():
+    async def time_out(job):
+        raise CommandTimeout("'npm ci' timed out after 900s in step install")
+
+    async def fail(job):
+        raise CommandError("'npm ci' exited with status 1 in step install")
+
+    job = run_job(time_out)
+    assert (job.status, job.error_type) == ('failed', 'timeout')
+    assert job.to_dict()['error_type'] == 'timeout'
+    assert run_job(fail).error_type == 'error'
+
+
+def test_pipeline_node_timeouts_count_as_timeouts():
+    async def scaffold(deps):
+        raise CommandTimeout("'npm create' timed out after 300s in step scaffold")
+
+    async def run(job):
+        pipeline = Pipeline()
+        pipeline.add('scaffold', scaffold)
+        return await pipeline.run()
+
+    assert run_job(run).error_type == 'timeout'
+
+
+def test_wait_mode_maps_step_timeouts_to_504(monkeypatch):
+    async def time_out(job, project_request):
+        raise CommandTimeout("'npm ci' timed out after 900s in step install")
+
+    monkeypatch.setattr(api, 'run_project_job', time_out)
+    with TestClient(api.app) as client:
+        response = client.post('/generate-project?wait=true', json={
+            'projectName': 'slow',
+            'description': 'Times out',
+            'framework': 'Vite + React',
+            'language': 'TypeScript',
+            'backend': 'Node + Express',
+        })
+    assert response.status_code == 504
+    assert 'timed out' in response.json()['detail']
@@ -0,0 +1,44 @@
+import errno
+import os
+
+import package_store
+import project_paths
+from package_store import PackageStore
+
+
+def make_project(root, name):
+    module = os.path.join(root, f'generated_{name}_frontend', 'node_modules', 'react')
+    os.makedirs(module)
+    with open(os.path.join(module, 'index.js'), 'w') as f:
+        f.write('module.exports = React\n')
+    return os.path.join(module, 'index.js')
+
+
+def test_link_dedups_projects_under_projects_root(tmp_path, monkeypatch):
+    projects = tmp_path / 'projects'
+    first = make_project(str(projects), 'one')
+    second = make_project(str(projects), 'two')
+    monkeypatch.setattr(project_paths, 'PROJECTS_ROOT', str(projects))
+    monkeypatch.setenv('PACKAGE_STORE_DIR', str(tmp_path / 'store'))
+
+    result = package_store.main(['link'])
+
+    assert result['generated_two_frontend']['deduplicated'] == 1
+    assert os.path.samefile(first, second)
+
+
+def test_cross_device_store_leaves_files_alone(tmp_path, monkeypatch):
+    path = make_project(str(tmp_path / 'projects'), 'far')
+    store = PackageStore(str(tmp_path / 'store'))
+
+    def link(source, target):
+        raise OSError(errno.EXDEV, os.strerror(errno.EXDEV))
+
+    monkeypatch.setattr(package_store.os, 'link', link)
+    assert store.import_file(path) is False
+    with open(path) as f:
+        assert f.read() == 'module.exports = React\n'
+
+    monkeypatch.setattr(PackageStore, 'same_filesystem', lambda self, path: False)
+    stats = store.import_tree(os.path.dirname(os.path.dirname(path)))
+    assert stats == {'files': 0, 'deduplicated': 0, 'skipped': True}
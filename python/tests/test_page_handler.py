@@ -0,0 +1,32 @@
+import json
+
+from page_handler import PageHandler
+
+
+def page(layout):
+    return {'components': [{
+        'name': 'dashboard',
+        'componentType': 'reusable',
+        'features': {'reusableComponents': ['card']},
+        'layout': {},
+        'layoutComponente': layout,
+    }]}
+
+
+def grid(count):
+    return [{'i': f'item-card-{n}', 'x': n % 12, 'y': n // 12, 'w': 1, 'h': 1, 'opts': {'static': True, 'tags': ['a']}}
+            for n in range(count)]
+
+
+def test_rerender_reflects_edited_items():
+    handler = PageHandler()
+    layout = {'lg': grid(3), 'md': grid(2)}
+    handler.generate_react_component(page(layout))
+
+    layout['lg'][1]['opts']['static'] = 1
+    layout['lg'][2]['opts']['tags'].append('b')
+    layout['md'][0]['x'] = 11
+    code = handler.generate_react_component(page(layout))
+
+    assert f'const layout = {json.dumps(layout)};' in code
+    assert code.count('<div key="item-card-') == 3
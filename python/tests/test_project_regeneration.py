@@ -0,0 +1,55 @@
+import asyncio
+import glob
+import json
+import os
+
+import pytest
+
+from creacionproyecto import ProjectGenerator, ProjectService, convert_simple_config
+
+
+def generate(name):
+    return asyncio.run(ProjectService.create_project(convert_simple_config({
+        'projectName': name,
+        'description': f'Project {name}',
+        'framework': 'Vite + React',
+        'language': 'TypeScript',
+        'backend': 'Node + Express',
+    })))
+
+
+def test_regeneration_keeps_user_files_and_replaces_symlinks(generation_env):
+    project = generate('regen')
+    frontend = project.frontend_path
+    with open(os.path.join(frontend, 'src', 'custom.ts'), 'w') as f:
+        f.write('export const custom = 1\n')
+    # npm links package binaries into node_modules/.bin
+    skeleton = glob.glob(os.path.join(generation_env['SKELETON_CACHE_DIR'], 'frontend', '*'))[0]
+    os.makedirs(os.path.join(skeleton, 'node_modules', '.bin'))
+    os.symlink('../vite/index.js', os.path.join(skeleton, 'node_modules', '.bin', 'vite'))
+
+    generate('regen')
+    generate('regen')
+
+    assert os.readlink(os.path.join(frontend, 'node_modules', '.bin', 'vite')) == '../vite/index.js'
+    with open(os.path.join(frontend, 'src', 'custom.ts')) as f:
+        assert f.read() == 'export const custom = 1\n'
+    assert not [name for name in os.listdir(generation_env['PROJECTS_ROOT']) if 'staging' in name]
+
+
+def test_failed_regeneration_leaves_the_project_untouched(generation_env, monkeypatch):
+    project = generate('crash')
+    package_json = os.path.join(project.frontend_path, 'package.json')
+    with open(package_json, 'w') as f:
+        json.dump({'name': 'edited'}, f)
+
+    def fail(self, tree_dir):
+        raise RuntimeError('crashed while writing configs')
+
+    monkeypatch.setattr(ProjectGenerator, 'create_backend_config', fail)
+    with pytest.raises(RuntimeError):
+        generate('crash')
+
+    with open(package_json) as f:
+        assert json.load(f) == {'name': 'edited'}
+    assert not [name for name in os.listdir(generation_env['PROJECTS_ROOT']) if 'staging' in name]
@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+from job_queue import JobQueue
+from request_coalescer import IdempotencyMismatch, RequestCoalescer
+
+
+def test_finished_body_keyed_requests_run_again():
+    # styles A, then B, then A again: the third request must rewrite A's files
+    written = []
+    coalescer = RequestCoalescer()
+
+    async def write(config):
+        written.append(config)
+        return {'files': 1}
+
+    async def main():
+        for config in ('A', 'B', 'A'):
+            await coalescer.run(config, lambda: write(config))
+
+    asyncio.run(main())
+    assert written == ['A', 'B', 'A']
+    assert coalescer.stats['replayed'] == 0
+
+
+def test_duplicates_in_flight_share_one_run():
+    calls = []
+    coalescer = RequestCoalescer()
+
+    async def write():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {'files': 1}
+
+    async def main():
+        return await asyncio.gather(*(coalescer.run('A', write) for _ in range(5)))
+
+    assert asyncio.run(main()) == [{'files': 1}] * 5
+    assert calls == [1]
+    assert coalescer.stats['coalesced'] == 4
+
+
+def test_idempotency_key_replays_and_rejects_other_bodies():
+    calls = []
+    coalescer = RequestCoalescer()
+
+    async def write():
+        calls.append(1)
+        return {'files': 1}
+
+    async def main():
+        await coalescer.run('key', write, 'body-A')
+        await coalescer.run('key', write, 'body-A')
+        with pytest.raises(IdempotencyMismatch):
+            await coalescer.run('key', write, 'body-B')
+
+    asyncio.run(main())
+    assert calls == [1]
+    assert coalescer.stats['replayed'] == 1
+
+
+def test_job_queue_reruns_finished_body_keyed_jobs():
+    async def main():
+        queue = JobQueue()
+
+        async def generate(job):
+            return {'name': 'demo'}
+
+        first = queue.submit('generate-project', generate, key='body')
+        assert queue.submit('generate-project', generate, key='body') is first
+        await first.task
+        rerun = queue.submit('generate-project', generate, key='body')
+        assert rerun is not first
+        await rerun.task
+
+        keyed = queue.submit('generate-project', generate, key='header', fingerprint='body-A')
+        await keyed.task
+        assert queue.submit('generate-project', generate, key='header', fingerprint='body-A') is keyed
+        with pytest.raises(IdempotencyMismatch):
+            queue.submit('generate-project', generate, key='header', fingerprint='body-B')
+
+    asyncio.run(main())
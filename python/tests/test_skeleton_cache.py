@@ -0,0 +1,44 @@
+import errno
+import os
+
+import pytest
+
+import skeleton_cache
+
+
+@pytest.mark.parametrize('link_errno', [errno.EMLINK, errno.EPERM, errno.ENOTSUP])
+def test_relinking_fallback_keeps_the_shared_inode(tmp_path, monkeypatch, link_errno):
+    # src lives in the skeleton and dst in a project, both hardlinked to one store blob
+    src = tmp_path / 'skeleton' / 'node_modules' / 'pkg' / 'index.js'
+    dst = tmp_path / 'project' / 'node_modules' / 'pkg' / 'index.js'
+    src.parent.mkdir(parents=True)
+    dst.parent.mkdir(parents=True)
+    src.write_text('module.exports = 42\n')
+    os.link(src, dst)
+
+    def link(source, target):
+        raise OSError(link_errno, os.strerror(link_errno))
+
+    monkeypatch.setattr(skeleton_cache.os, 'link', link)
+    skeleton_cache._clone_file(str(src), str(dst))
+
+    assert src.read_text() == 'module.exports = 42\n'
+    assert dst.read_text() == 'module.exports = 42\n'
+    assert not os.path.samefile(src, dst)
+    assert not os.path.exists(f'{dst}.skeleton-tmp')
+
+
+def test_stale_temp_link_is_not_written_through(tmp_path):
+    src = tmp_path / 'skeleton' / 'src' / 'App.tsx'
+    dst = tmp_path / 'project' / 'src' / 'App.tsx'
+    src.parent.mkdir(parents=True)
+    dst.parent.mkdir(parents=True)
+    src.write_text('export default App\n')
+    dst.write_text('edited\n')
+    # Left by a run interrupted between link and rename
+    os.link(src, f'{dst}.skeleton-tmp')
+
+    skeleton_cache._clone_file(str(src), str(dst))
+
+    assert src.read_text() == 'export default App\n'
+    assert dst.read_text() == 'export default App\n'
@@ -0,0 +1,43 @@
+import time
+
+import generation_tasks
+import metrics
+from job_queue import Job
+
+
+def observations(stage):
+    series = metrics.stage_seconds._series.get((stage,))
+    return (sum(series[0]), series[1]) if series else (0, 0.0)
+
+
+def test_install_is_timed_per_kind(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(time, 'time', lambda: now[0])
+    before = {stage: observations(stage) for stage in ('install', 'install_frontend', 'install_backend')}
+
+    job = Job('generate-project', ['scaffold', 'install', 'configs'])
+    for at, status, kind in ((100, 'running', 'frontend'), (101, 'done', 'frontend'),
+                             (102, 'running', 'backend'), (105, 'done', 'backend')):
+        now[0] = float(at)
+        job.report('install', status, kind=kind)
+
+    assert observations('install') == before['install']
+    count, total = observations('install_frontend')
+    assert (count - before['install_frontend'][0], total - before['install_frontend'][1]) == (1, 1.0)
+    count, total = observations('install_backend')
+    assert (count - before['install_backend'][0], total - before['install_backend'][1]) == (1, 3.0)
+
+
+def test_structure_steps_report_their_timings(tmp_path, monkeypatch):
+    monkeypatch.setattr(generation_tasks.project_paths, 'PROJECTS_ROOT', str(tmp_path))
+    output = generation_tasks.MemoryOutput(str(tmp_path))
+    timings = {}
+    generation_tasks.generate_structure({
+        'projectName': 'timed',
+        'loginConfig': {'enabled': True, 'fields': [{'name': 'email', 'icon': 'Mail'}], 'socialProviders': []},
+        'sidebarConfig': {'enabled': False, 'tabs': []},
+        'projectConfig': {},
+        'layoutType': 'Dashboard Layout',
+    }, output, timings)
+    assert set(timings) == {'login', 'components', 'pages'}
+    assert all(seconds >= 0 for seconds in timings.values())
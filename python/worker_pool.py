@@ -0,0 +1,140 @@
+import asyncio
+import multiprocessing
+import os
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import profiling
+from io_executor import io_executor
+from render_cache import take_cache_deltas
+
+
+class PoolSaturated(Exception):
+    pass
+
+
+def _init_worker(memory_limit_mb):
+    """Cap the worker's address space so a runaway config cannot take the host down."""
+    if memory_limit_mb:
+        limit = memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _run_task(func, args, kwargs):
+    started_at = time.time()
+    result = func(*args, **kwargs)
+    # Render caches live in the worker; ship their counters back with each result
+    return result, started_at, time.time(), os.getpid(), take_cache_deltas()
+
+
+class WorkerPool:
+    """Process pool that runs generator tasks outside the API process.
+
+    Workers are recycled after max_tasks jobs and run under a memory ceiling.
+    run() raises PoolSaturated once queue_limit tasks are in flight, and the
+    pool tracks queue wait time separately from execution time, and sums the
+    render cache counters the workers report back.
+    """
+
+    def __init__(self, size=None, max_tasks=None, memory_limit_mb=None, queue_limit=None):
+        self.size = int(os.environ.get('WORKER_POOL_SIZE', os.cpu_count() or 1)) if size is None else size
+        self.max_tasks = max_tasks or int(os.environ.get('WORKER_MAX_TASKS', 50))
+        self.memory_limit_mb = int(os.environ.get('WORKER_MEMORY_MB', 512)) if memory_limit_mb is None else memory_limit_mb
+        self.queue_limit = queue_limit or int(os.environ.get('WORKER_QUEUE_LIMIT', max(self.size, 1) * 4))
+        self.in_flight = 0
+        self.stats = {
+            'completed': 0,
+            'failed': 0,
+            'rejected': 0,
+            'queue_wait_total': 0.0,
+            'queue_wait_max': 0.0,
+            'execution_total': 0.0,
+            'execution_max': 0.0,
+        }
+        # cache name -> [hits, misses, evictions] across all workers
+        self.cache_stats = {}
+        self._executor = None
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.size,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(self.memory_limit_mb,),
+                max_tasks_per_child=self.max_tasks,
+            )
+        return self._executor
+
+    async def run(self, func, *args, **kwargs):
+        """Run func(*args, **kwargs) in a worker and return its result."""
+        if self.in_flight >= self.queue_limit:
+            self.stats['rejected'] += 1
+            raise PoolSaturated(f"Worker pool saturated ({self.in_flight} tasks in flight)")
+
+        session = profiling.current_session()
+        if session is not None:
+            # A profiled request: profile the task inside the worker too
+            func, args, kwargs = profiling.profile_call, (func, args, kwargs, session.top_n), {}
+
+        self.in_flight += 1
+        submitted_at = time.time()
+        try:
+            if self.size == 0:
+                # Inline mode for development: run on the API process's I/O threads
+                outcome = await io_executor.run(_run_task, func, args, kwargs)
+            else:
+                loop = asyncio.get_running_loop()
+                executor = self._get_executor()
+                try:
+                    outcome = await loop.run_in_executor(executor, _run_task, func, args, kwargs)
+                except BrokenProcessPool:
+                    # A worker died (e.g. killed for memory); start a fresh pool for later tasks.
+                    # Other tasks of the same broken pool may get here after it was replaced.
+                    if self._executor is executor:
+                        executor.shutdown(wait=False, cancel_futures=True)
+                        self._executor = None
+                    raise
+        except Exception:
+            self.stats['failed'] += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+        result, started_at, finished_at, _, cache_deltas = outcome
+        if session is not None:
+            result = session.add_worker_profile(result)
+        self._record(started_at - submitted_at, finished_at - started_at)
+        for name, change in cache_deltas.items():
+            totals = self.cache_stats.setdefault(name, [0, 0, 0])
+            for i, amount in enumerate(change):
+                totals[i] += amount
+        return result
+
+    def _record(self, queue_wait, execution):
+        stats = self.stats
+        stats['completed'] += 1
+        stats['queue_wait_total'] += queue_wait
+        stats['queue_wait_max'] = max(stats['queue_wait_max'], queue_wait)
+        stats['execution_total'] += execution
+        stats['execution_max'] = max(stats['execution_max'], execution)
+
+    def metrics(self):
+        completed = self.stats['completed'] or 1
+        return {
+            'size': self.size,
+            'max_tasks_per_worker': self.max_tasks,
+            'memory_limit_mb': self.memory_limit_mb,
+            'queue_limit': self.queue_limit,
+            'in_flight': self.in_flight,
+            **self.stats,
+            'queue_wait_avg': self.stats['queue_wait_total'] / completed,
+            'execution_avg': self.stats['execution_total'] / completed,
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -18,6 +18,7 @@ const ProjectConfig = () => {
     language: 'TypeScript',
     backend: 'Node.js + Express'
   });
+  const [progress, setProgress] = useState<string | null>(null);
 
   const handleInputChange = (e: React.ChangeEvent<HTMLInputElement | HTMLTextAreaElement | HTMLSelectElement>) => {
     const { name, value } = e.target;
@@ -44,10 +45,31 @@ const ProjectConfig = () => {
       }
 
       const result = await response.json();
-      console.log('Project generated:', result);
-      
-      // Navigate after successful API call
-      window.location.href = '/styling';
+      setProgress('En cola...');
+
+      // Follow the generation job and navigate once it finishes
+      const events = new EventSource(`http://localhost:8000${result.events_url}`);
+      events.addEventListener('stage', (event) => {
+        const data = JSON.parse((event as MessageEvent).data);
+        setProgress(`${data.stage}: ${data.status}`);
+      });
+      events.addEventListener('status', (event) => {
+        const data = JSON.parse((event as MessageEvent).data);
+        if (data.status === 'succeeded') {
+          events.close();
+          window.location.href = '/styling';
+        } else if (data.status === 'failed' || data.status === 'cancelled') {
+          events.close();
+          setProgress(null);
+          alert(`Error generating project: ${data.error ?? data.status}`);
+        }
+      });
+      // Dropped stream or unknown job: stop the browser's reconnect loop and re-enable the button
+      events.onerror = () => {
+        events.close();
+        setProgress(null);
+        alert('Lost connection to the project generation progress. Please try again.');
+      };
       
     } catch (error) {
       console.error('Error generating project:', error);
@@ -138,10 +160,14 @@ const ProjectConfig = () => {
               <option>Python + FastAPI</option>
             </select>
           </div>
-          <div className="mt-8 flex justify-end">
+          <div className="mt-8 flex items-center justify-end gap-4">
+          {progress && (
+            <span className="text-sm text-gray-600">{progress}</span>
+          )}
           <button
             onClick={handleNextStep}
-            className="flex items-center px-6 py-3 bg-blue-600 text-white rounded-lg hover:bg-blue-700 transition-colors"
+            disabled={progress !== null}
+            className="flex items-center px-6 py-3 bg-blue-600 text-white rounded-lg hover:bg-blue-700 transition-colors disabled:opacity-50"
           >
             Generar Proyecto y Continuar
           </button>